@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 import os
 
 from .models import db
+from .services import dependency_services, digest_services, event_bus, invalidation_bus, response_cache, single_flight, task_stats_services, user_index, user_resolver
 from .routes.auth import auth_bp
 from .routes.user import user_bp
 from .routes.task import task_bp
@@ -17,6 +18,7 @@ from .routes.calendar import calendar_bp
 from .routes.notifications import notifications_bp
 from .routes.team import team_bp
 from .routes.comments import comments_bp
+from .routes.search import search_bp
 
 migrate = Migrate()
 bcrypt = Bcrypt()
@@ -35,17 +37,27 @@ def create_app():
         app,
         resources={r"/*": {"origins": ALLOWED_ORIGINS}},
         supports_credentials=True,
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", "If-Match", "If-None-Match"],
+        expose_headers=["ETag"],
         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
     )
 
     # JWT config
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-key")
     jwt.init_app(app)
+    user_resolver.register_user_lookup(jwt)
 
     # DB + Migrations
     db.init_app(app)
     migrate.init_app(app, db)
+    event_bus.init_app(app)
+    invalidation_bus.init_app(app)
+    response_cache.init_app(app)
+    single_flight.init_app(app)
+    user_index.init_app(app)
+    dependency_services.init_app(app)
+    task_stats_services.init_app(app)
+    digest_services.init_app(app)
 
     app.config['POWER_AUTOMATE_WEBHOOK_URL'] = os.getenv('POWER_AUTOMATE_WEBHOOK_URL')
 
@@ -59,4 +71,5 @@ def create_app():
     app.register_blueprint(notifications_bp, url_prefix="/api/notifications")
     app.register_blueprint(team_bp, url_prefix="/api/team")
     app.register_blueprint(comments_bp, url_prefix="/api/comments")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
     return app
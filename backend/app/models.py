@@ -5,11 +5,31 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import enum
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime, date
-from sqlalchemy import UniqueConstraint, Index
+from sqlalchemy import DDL, UniqueConstraint, Index, event, literal_column
 from sqlalchemy.dialects.postgresql import ENUM
 
 db = SQLAlchemy()
 
+def search_document(title, *body):
+    """Weighted tsvector of a row's searchable text; title words rank above body words.
+
+    The GIN indexes below are built on this exact expression, so queries must
+    use it too for Postgres to pick them. Only immutable functions are allowed.
+    """
+    config = literal_column("'english'::regconfig")
+    parts = []
+    if title is not None:
+        parts.append(func.setweight(func.to_tsvector(config, func.coalesce(title, literal_column("''"))), literal_column("'A'")))
+    if body:
+        text = func.coalesce(body[0], literal_column("''"))
+        for column in body[1:]:
+            text = text.op("||")(literal_column("' '")).op("||")(func.coalesce(column, literal_column("''")))
+        parts.append(func.setweight(func.to_tsvector(config, text), literal_column("'B'")))
+    document = parts[0]
+    for part in parts[1:]:
+        document = document.op("||")(part)
+    return document
+
 class UserRole(enum.Enum):
     STAFF = "STAFF"
     MANAGER = "MANAGER"
@@ -86,6 +106,10 @@ class Comment(db.Model):
     user = relationship("User")
     notifications = relationship("Notification", back_populates="comment")
 
+    __table_args__ = (
+        Index("ix_comments_search", search_document(None, content), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 class Task(db.Model):
     __tablename__ = "tasks"
 
@@ -120,9 +144,17 @@ class Task(db.Model):
 
     comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan")
 
-    parent_id = db.Column(db.Integer, db.ForeignKey("tasks.id"), nullable=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey("tasks.id"), nullable=True, index=True)
     subtasks = relationship("Task", backref=db.backref("parent", remote_side=[id]), cascade="all, delete-orphan")
 
+    # Bumped by every UPDATE; a flush against a stale version raises StaleDataError
+    version = db.Column(db.Integer, nullable=False, server_default='1', default=1)
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        Index("ix_tasks_search", search_document(title, description, notes), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -142,9 +174,39 @@ class Task(db.Model):
             "attachments": [
                 {"id": att.id, "filename": att.filename}
                 for att in self.attachments
-            ]
+            ],
+            "version": self.version,
         }
     
+class TaskDependency(db.Model):
+    """`task_id` cannot finish before `depends_on_id` does; both tasks are in the same project."""
+    __tablename__ = "task_dependencies"
+
+    task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_task_dependencies_depends_on_id", "depends_on_id"),
+    )
+
+class TaskStatusTransition(db.Model):
+    """One change of a task's status, for cycle-time analytics; rows are only ever appended."""
+    __tablename__ = "task_status_transitions"
+
+    # SQLite only autoincrements INTEGER PRIMARY KEY
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    from_status = db.Column(db.Enum(TaskStatus, native_enum=False), nullable=True)  # None when the task was created
+    to_status = db.Column(db.Enum(TaskStatus, native_enum=False), nullable=False)
+    changed_by = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_task_status_transitions_task_id_at", "task_id", "at"),
+        Index("ix_task_status_transitions_to_status_at", "to_status", "at"),
+    )
+
 class Attachment(db.Model):
     __tablename__ = "attachments"
 
@@ -182,6 +244,12 @@ class Project(db.Model):
 
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
+    version = db.Column(db.Integer, nullable=False, server_default='1', default=1)
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        Index("ix_projects_search", search_document(name, description, notes), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
    
     def to_dict(self):
         return {
@@ -198,8 +266,116 @@ class Project(db.Model):
             
             
             "collaborators": [{"id": c.id, "email": c.email} for c in self.collaborators],
+            "version": self.version,
         }
 
+class ProjectTaskStats(db.Model):
+    """Task counts of one project, kept current by the triggers on `tasks` below.
+
+    `overdue` counts the open tasks due before `overdue_as_of`; as days pass
+    it is recounted for the new date (see task_stats_services).
+    """
+    __tablename__ = "project_task_stats"
+
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    unassigned = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    ongoing = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    pending_review = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    completed = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    total = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    overdue = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+    overdue_as_of = db.Column(db.Date, nullable=False, server_default=func.current_date())
+    # Bumped by every change, so ETags over a user's projects move with their progress
+    version = db.Column(db.Integer, nullable=False, server_default='0', default=0)
+
+    def to_dict(self):
+        counts = {status.value: getattr(self, status.name.lower()) for status in TaskStatus}
+        return {
+            "status_counts": counts,
+            "total": self.total,
+            "overdue": self.overdue,
+            "overdue_as_of": self.overdue_as_of.isoformat() if self.overdue_as_of else None,
+            "completion_rate": round(100 * self.completed / self.total, 1) if self.total else 0.0,
+        }
+
+class ProjectProgressSnapshot(db.Model):
+    """A project's task counts at the end of one day, written by the daily snapshot job.
+
+    Only the counters are stored; total and remaining are derived on read.
+    """
+    __tablename__ = "project_progress_snapshots"
+
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    unassigned = db.Column(db.Integer, nullable=False, default=0)
+    ongoing = db.Column(db.Integer, nullable=False, default=0)
+    pending_review = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    overdue = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        counts = {status.value: getattr(self, status.name.lower()) for status in TaskStatus}
+        total = sum(counts.values())
+        return {
+            "date": self.day.isoformat(),
+            "status_counts": counts,
+            "total": total,
+            "remaining": total - self.completed,
+            "overdue": self.overdue,
+        }
+
+# Every insert, delete, and change of project, status, or due date on `tasks`
+# (ORM flushes and bulk UPDATEs alike) moves the counters of the projects
+# involved, in the same transaction. Status columns hold TaskStatus names.
+# The statements are idempotent: create_all runs them on a new database and
+# `flask install-task-stats` (task_stats_services) installs them on an existing one.
+_status_counters = ",\n        ".join(
+    f"{status.name.lower()} = {status.name.lower()} + CASE WHEN p_status = '{status.name}' THEN p_sign ELSE 0 END"
+    for status in TaskStatus
+)
+
+TASK_STATS_TRIGGERS_SQL = f"""
+CREATE OR REPLACE FUNCTION project_task_stats_apply(p_project_id integer, p_status varchar, p_duedate date, p_sign integer)
+RETURNS void AS $$
+BEGIN
+    IF p_project_id IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_sign > 0 THEN
+        INSERT INTO project_task_stats (project_id) VALUES (p_project_id) ON CONFLICT (project_id) DO NOTHING;
+    END IF;
+    UPDATE project_task_stats SET
+        {_status_counters},
+        total = total + p_sign,
+        overdue = overdue + CASE WHEN p_status <> '{TaskStatus.COMPLETED.name}' AND p_duedate < overdue_as_of THEN p_sign ELSE 0 END,
+        version = version + 1
+    WHERE project_id = p_project_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_task_stats_track() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (OLD.project_id, OLD.status, OLD.duedate) IS NOT DISTINCT FROM (NEW.project_id, NEW.status, NEW.duedate) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM project_task_stats_apply(OLD.project_id, OLD.status, OLD.duedate, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM project_task_stats_apply(NEW.project_id, NEW.status, NEW.duedate, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_project_task_stats ON tasks;
+CREATE TRIGGER tasks_project_task_stats
+    AFTER INSERT OR DELETE OR UPDATE OF project_id, status, duedate ON tasks
+    FOR EACH ROW EXECUTE FUNCTION project_task_stats_track();
+"""
+
+event.listen(db.metadata, "after_create", DDL(TASK_STATS_TRIGGERS_SQL).execute_if(dialect="postgresql"))
+
 class Notification(db.Model):
     __tablename__ = "notifications"
 
@@ -282,4 +458,45 @@ class Notification(db.Model):
                 changes.append(f"{field} from {old_val} to {new_val}")
             changes_str = ', '.join(changes)
             return f"{updated_by} updated '{tt}' in {pn}: {changes_str}"
-        return "New notification"
\ No newline at end of file
+        return "New notification"
+
+class EmailCooldown(db.Model):
+    __tablename__ = "email_cooldowns"
+
+    key = db.Column(db.String(255), primary_key=True)
+    sent_at = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_email_cooldowns_sent_at", "sent_at"),
+    )
+
+class NotificationDigestEntry(db.Model):
+    """One task's pending changes for one recipient, waiting for their digest email.
+
+    Shared by every worker, so a digest survives restarts and is sent once.
+    `opened_at` (epoch seconds) is when the first of these changes was buffered.
+    """
+    __tablename__ = "notification_digest_entries"
+
+    recipient = db.Column(db.String(255), primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    updated_by = db.Column(db.String(255), nullable=False)
+    fields = db.Column(JSONB, nullable=False, default=list)
+    opened_at = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_notification_digest_entries_opened_at", "opened_at"),
+    )
+
+class CacheInvalidation(db.Model):
+    """One committed write to `table_name`, read back by every worker to drop stale cache entries."""
+    __tablename__ = "cache_invalidations"
+
+    # SQLite only autoincrements INTEGER PRIMARY KEY
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    table_name = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_cache_invalidations_created_at", "created_at"),
+    )
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, Comment, Task
 from app.services import notification_services
+from app.services.event_bus import unit_of_work
 
 comments_bp = Blueprint("comments", __name__)
 
@@ -18,15 +19,16 @@ def create_comment(task_id):
     if not task:
         return jsonify({"error": "Task not found"}), 404
 
-    comment = Comment(
-        task_id=task_id,
-        user_id=user_id,
-        content=content
-    )
-    db.session.add(comment)
-    db.session.commit()
+    with unit_of_work():
+        comment = Comment(
+            task_id=task_id,
+            user_id=user_id,
+            content=content
+        )
+        db.session.add(comment)
+        db.session.flush()
 
-    notification_services.create_comment_notification(comment)
+        notification_services.create_comment_notification(comment)
 
     return jsonify({
         "success": True,
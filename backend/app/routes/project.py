@@ -1,7 +1,17 @@
 from flask import Blueprint, jsonify, request
-from app.services import project_services
+from app.services import dependency_services, project_services, report_services, task_stats_services, task_tree_services
+from app.services.http_cache import (
+    PreconditionFailed,
+    if_match_version,
+    is_fresh,
+    not_modified,
+    precondition_failed,
+    revalidate,
+    with_etag,
+)
+from app.services.response_cache import cached_response
 from app.models import ProjectStatus, User # Make sure User is imported
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy.exc import SQLAlchemyError
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import traceback # Helpful for debugging
@@ -58,11 +68,17 @@ def get_all_projects_route():
         if not user_id:
             return jsonify({"error": "User not found or not logged in"}), 401
 
-        # 2. Pass the user's ID to the service function to get only their projects.
+        # 2. Nothing changed since the client's copy: skip loading the projects.
+        tag = project_services.get_all_projects_etag(user_id)
+        if is_fresh(tag):
+            return not_modified(tag)
+
+        # 3. Pass the user's ID to the service function to get only their projects.
         projects = project_services.get_all_projects(user_id) or []
         
-        data = [p.to_dict() for p in projects]
-        return jsonify(data), 200
+        stats = task_stats_services.get_task_stats(p.id for p in projects)
+        data = [{**p.to_dict(), "task_stats": stats[p.id]} for p in projects]
+        return revalidate((jsonify(data), 200), tag)
     except Exception as e:
         print(f"Error in get_all_projects_route: {e}")
         traceback.print_exc()
@@ -72,15 +88,74 @@ def get_all_projects_route():
 @jwt_required()
 def get_project_route(project_id):
     try:
+        tag = project_services.get_project_etag(project_id)
+        if is_fresh(tag):
+            return not_modified(tag)
+
         project = project_services.get_project_by_id(project_id)
-        return jsonify(project.to_dict()), 200
+        return with_etag((jsonify(project.to_dict()), 200), "project", project)
     except Exception as e:
         print(f"Error in get_project_route for ID {project_id}: {e}")
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
     
+@project_bp.route("/get-project-task-tree/<int:project_id>", methods=["GET"])
+@jwt_required()
+def get_project_task_tree_route(project_id):
+    """The project's top-level tasks with their subtasks nested and rolled up; ?depth=N limits the levels"""
+    try:
+        trees = task_tree_services.get_project_task_trees(project_id, request.args.get("depth", type=int))
+        return jsonify(trees), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except Exception as e:
+        print(f"Error in get_project_task_tree_route for ID {project_id}: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@project_bp.route("/<int:project_id>/critical-path", methods=["GET"])
+@jwt_required()
+def get_critical_path_route(project_id):
+    """Slack of every task, the critical path and whether the project deadline holds
+
+    Not response-cached: slack is relative to today, and the service keeps its
+    own per-day schedule memo.
+    """
+    try:
+        return jsonify(dependency_services.get_critical_path(project_id)), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except Exception as e:
+        print(f"Error in get_critical_path_route for ID {project_id}: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@project_bp.route("/<int:project_id>/progress", methods=["GET"])
+@jwt_required()
+def get_project_progress_route(project_id):
+    """Daily task counts for burndown charts; ?from=YYYY-MM-DD&to=YYYY-MM-DD, the last 30 days by default"""
+    try:
+        start, end = (request.args.get(name) for name in ("from", "to"))
+        start, end = report_services.progress_range(
+            date.fromisoformat(start) if start else None,
+            date.fromisoformat(end) if end else None,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    try:
+        return jsonify(report_services.get_progress_history(project_id, get_jwt_identity(), start, end)), 200
+    except PermissionError as e:
+        return jsonify({"success": False, "error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except Exception as e:
+        print(f"Error in get_project_progress_route for ID {project_id}: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @project_bp.route("/get-project-users/<int:project_id>", methods=["GET"])
 @jwt_required()
+@cached_response("projects", "project_collaborators", "users")
 def get_project_users_route(project_id):
     try:
         users = project_services.get_project_users(project_id)
@@ -97,13 +172,18 @@ def update_project_route(project_id):
         data = request.form
         new_files = request.files.getlist("attachments")
         collaborator_emails = data.getlist("collaborators")
-        project = project_services.update_project(project_id, dict(data), new_files, collaborator_emails)
+        expected_version = if_match_version("project", project_id, data.get("version"))
+        project = project_services.update_project(
+            project_id, dict(data), new_files, collaborator_emails, expected_version
+        )
 
-        return jsonify({
+        return with_etag((jsonify({
             "success": True, 
             "project": project.to_dict(),
             "message": "Project updated successfully."
-        }), 200
+        }), 200), "project", project)
+    except PreconditionFailed as e:
+        return precondition_failed(e, "project", project_id)
     except Exception as e:
         print(f"Error in update_project_route for ID {project_id}: {e}")
         traceback.print_exc()
@@ -130,4 +210,21 @@ def get_project_report_route(project_id):
     except Exception as e:
         print(f"Error in get_project_report_route for ID {project_id}: {e}")
         traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@project_bp.route("/get-report/<int:project_id>", methods=["GET"])
+@jwt_required()
+def get_full_project_report_route(project_id):
+    """Status counts, overdue and due-this-week counts, member breakdown, priority mix and creation trend"""
+    try:
+        report = report_services.get_project_report(project_id, get_jwt_identity())
+        return jsonify(report.to_dict()), 200
+
+    except PermissionError as e:
+        return jsonify({"success": False, "error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except Exception as e:
+        print(f"Error in get_full_project_report_route for ID {project_id}: {e}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -0,0 +1,27 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import search_services
+
+search_bp = Blueprint("search", __name__)
+
+@search_bp.route("", methods=["GET"])
+@jwt_required()
+def search_route():
+    """Search tasks, projects and comments: ?q=...&types=task,project&limit=20&cursor=..."""
+    try:
+        user_id = int(get_jwt_identity())
+        types = request.args.get("types")
+        page = search_services.search(
+            user_id,
+            request.args.get("q"),
+            kinds=[t.strip() for t in types.split(",") if t.strip()] if types else None,
+            limit=request.args.get("limit"),
+            cursor=request.args.get("cursor"),
+        )
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        print(f"DEBUG: Search failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -1,5 +1,15 @@
 from flask import Blueprint, jsonify, request, session
-from app.services import task_services
+from app.services import dependency_services, task_services, task_import_services, task_batch_services, task_tree_services
+from app.services.http_cache import (
+    PreconditionFailed,
+    if_match_version,
+    is_fresh,
+    not_modified,
+    precondition_failed,
+    revalidate,
+    with_etag,
+)
+from app.services.response_cache import cached_response
 from app.models import TaskStatus
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
@@ -68,21 +78,131 @@ def create_task_route():
         print("--------------------------")
         return jsonify({"error": "An internal error occurred"}), 500
 
+@task_bp.route("/import", methods=["POST"])
+@jwt_required()
+def import_tasks_route():
+    """Create many tasks from an uploaded CSV or JSON file (or a raw CSV/JSON body)"""
+    try:
+        if request.mimetype == "multipart/form-data":
+            upload = request.files.get("file")
+            if not upload:
+                return jsonify({"success": False, "error": "No file uploaded"}), 400
+            stream, mimetype, filename = upload.stream, upload.mimetype, upload.filename or ""
+            project_id = request.form.get("project_id") or request.args.get("project_id")
+        else:
+            stream, mimetype, filename = request.stream, request.mimetype, ""
+            project_id = request.args.get("project_id")
+
+        fmt = (request.args.get("format") or "").lower()
+        if not fmt:
+            if "json" in mimetype or filename.lower().endswith(".json"):
+                fmt = "json"
+            elif "csv" in mimetype or filename.lower().endswith(".csv"):
+                fmt = "csv"
+            else:
+                return jsonify({"success": False, "error": "Unable to tell whether the import is CSV or JSON"}), 400
+
+        rows = task_import_services.parse_import(stream, fmt)
+        task_ids = task_import_services.import_tasks(rows, get_jwt_identity(), project_id)
+
+        return jsonify({"success": True, "created": len(task_ids), "task_ids": task_ids}), 201
+
+    except task_import_services.TaskImportError as e:
+        return jsonify({"success": False, "error": str(e), "errors": e.errors}), 400
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@task_bp.route("/batch-update", methods=["POST"])
+@jwt_required()
+def batch_update_tasks_route():
+    """Apply status, owner, due date and project changes to many tasks in one request"""
+    try:
+        data = request.get_json(silent=True) or {}
+        results = task_batch_services.apply_task_batch(data.get("operations"), get_jwt_identity())
+        updated = sum(1 for result in results if result["status"] == "updated")
+        return jsonify({"success": True, "updated": updated, "results": results}), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @task_bp.route("/get-task/<int:task_id>", methods=["GET"])
 @jwt_required()
 def get_task_route(task_id):
     try:
+        # Answer revalidations from the version alone, before loading the task
+        tag = task_services.get_task_etag(task_id)
+        if is_fresh(tag):
+            return not_modified(tag)
+
         task = task_services.get_task(task_id)
         if not task:
             return jsonify({"error": "Task not found."}), 404
         
-        return jsonify(task.to_dict()), 200
+        return with_etag((jsonify(task.to_dict()), 200), "task", task)
     
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
     
+@task_bp.route("/get-task-tree/<int:task_id>", methods=["GET"])
+@jwt_required()
+def get_task_tree_route(task_id):
+    """The task's subtasks as a nested tree with roll-ups; ?depth=N limits the levels"""
+    try:
+        tree = task_tree_services.get_task_tree(task_id, request.args.get("depth", type=int))
+        return jsonify(tree), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@task_bp.route("/get-dependencies/<int:task_id>", methods=["GET"])
+@jwt_required()
+def get_task_dependencies_route(task_id):
+    try:
+        return jsonify(dependency_services.get_task_dependencies(task_id)), 200
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@task_bp.route("/add-dependency/<int:task_id>", methods=["POST"])
+@jwt_required()
+def add_task_dependency_route(task_id):
+    """Make the task wait for another task of its project: {"depends_on_id": <id>}"""
+    try:
+        depends_on_id = (request.get_json(silent=True) or {}).get("depends_on_id")
+        if not isinstance(depends_on_id, int):
+            return jsonify({"success": False, "error": "depends_on_id must be a task ID"}), 400
+        created = dependency_services.add_dependency(task_id, depends_on_id)
+        return jsonify({"success": True, "created": created}), 201 if created else 200
+
+    except dependency_services.DependencyCycleError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@task_bp.route("/remove-dependency/<int:task_id>/<int:depends_on_id>", methods=["DELETE"])
+@jwt_required()
+def remove_task_dependency_route(task_id, depends_on_id):
+    try:
+        if not dependency_services.remove_dependency(task_id, depends_on_id):
+            return jsonify({"success": False, "error": "Dependency not found."}), 404
+        return jsonify({"success": True}), 200
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @task_bp.route("/get-user-tasks", methods=["GET"])
 @jwt_required()
 def get_user_tasks_route():
@@ -91,9 +211,13 @@ def get_user_tasks_route():
         if not user_id:
             return jsonify({"error": "Not logged in"}), 401
         
+        tag = task_services.get_user_tasks_etag(user_id)
+        if is_fresh(tag):
+            return not_modified(tag)
+
         tasks = task_services.get_user_tasks(user_id) or []
         data = [task.to_dict() for task in tasks]
-        return jsonify(data), 200
+        return revalidate((jsonify(data), 200), tag)
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -111,6 +235,7 @@ def get_project_tasks_route(project_id):
     
 @task_bp.route("/get-project-users-for-task/<int:task_id>", methods=["GET"])
 @jwt_required()
+@cached_response("tasks", "projects", "project_collaborators", "users")
 def get_project_users_for_task_route(task_id):
     try:
         users = task_services.get_project_users_for_tasks(task_id)
@@ -160,12 +285,17 @@ def update_task_route(task_id):
         data = dict(request.form)
         new_files = request.files.getlist("attachments")
 
+        # If-Match (or a "version" form field) makes the save conditional
+        expected_version = if_match_version("task", task_id, data.pop("version", None))
+
         print("Calling update_task service...")
-        task = task_services.update_task(task_id, data, new_files)
+        task = task_services.update_task(task_id, data, new_files, expected_version)
         
         print("Update successful")
-        return jsonify({"success": True, "task": task.to_dict()}), 200
+        return with_etag((jsonify({"success": True, "task": task.to_dict()}), 200), "task", task)
     
+    except PreconditionFailed as e:
+        return precondition_failed(e, "task", task_id)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
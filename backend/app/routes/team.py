@@ -1,14 +1,20 @@
 # routes/team.py
-from flask import Blueprint, jsonify
+from datetime import date
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, User
+from app.services import task_analytics_services
+from app.services.user_services import get_users_info
 
 team_bp = Blueprint("team", __name__)
 
 @team_bp.route("/members", methods=["GET"])
 @jwt_required()
 def get_team_members():
-    """Get all team members for team calendar"""
+    """Get all team members for team calendar
+
+    Only the member list is cached (get_users_info), so the caller is checked on every request.
+    """
     try:
         user_id_str = get_jwt_identity()
         user_id = int(user_id_str)
@@ -18,18 +24,30 @@ def get_team_members():
             return jsonify({"error": "User not found"}), 404
 
         # Get all users (or filter by organization if needed)
-        all_users = User.query.all()
-        
-        team_members = []
-        for user in all_users:
-            team_members.append({
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "role": user.role.value
-            })
+        team_members = get_users_info()
 
         return jsonify({"members": team_members}), 200
 
     except Exception as e:
-        return jsonify({"error": f"An unexpected server error occurred: {e}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"An unexpected server error occurred: {e}"}), 500
+
+@team_bp.route("/cycle-time", methods=["GET"])
+@jwt_required()
+def get_cycle_time():
+    """Cycle-time percentiles and weekly throughput: ?group=user|project&from=YYYY-MM-DD&to=YYYY-MM-DD"""
+    try:
+        start, end = (request.args.get(name) for name in ("from", "to"))
+        analytics = task_analytics_services.get_cycle_time_analytics(
+            int(get_jwt_identity()),
+            request.args.get("group", "user"),
+            date.fromisoformat(start) if start else None,
+            date.fromisoformat(end) if end else None,
+        )
+        return jsonify(analytics), 200
+
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"An unexpected server error occurred: {e}"}), 500
@@ -1,13 +1,60 @@
-from flask import Blueprint, jsonify
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
 from app.services.user_services import *
+from app.services.response_cache import cached_response
+from app.services.user_index import search_users
 
 user_bp = Blueprint("user", __name__)
 
 @user_bp.route("/get-all-users", methods=["GET"])
+@cached_response("users")
 def get_all_users_route():
     try:
         user_data = get_users_info() or []
         return jsonify(user_data)
     
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@user_bp.route("/search", methods=["GET"])
+@jwt_required()
+def search_users_route():
+    """Typeahead: ?q=<prefix of an email or name>&limit=10"""
+    try:
+        return jsonify(search_users(request.args.get("q"), request.args.get("limit"))), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@user_bp.route("/directory", methods=["GET"])
+@jwt_required()
+def get_user_directory_route():
+    """A page of users: ?role=staff,manager&after=<last id seen>&limit=100"""
+    try:
+        page = get_user_directory(request.args.get("role"), request.args.get("after"), request.args.get("limit"))
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@user_bp.route("/directory/export", methods=["GET"])
+@jwt_required()
+def export_user_directory_route():
+    """Every user (optionally ?role=...) as one JSON array, streamed as it is read"""
+    try:
+        entries = iter_user_directory(request.args.get("role"))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    def generate():
+        yield "["
+        for i, entry in enumerate(entries):
+            yield ("," if i else "") + json.dumps(entry)
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
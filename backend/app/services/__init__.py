@@ -5,6 +5,7 @@ from . import task_services as task_service
 from . import project_services as project_service
 from . import user_services as user_service
 from . import attachment_services as attachment_service
+from . import event_handlers  # registers after-commit handlers
 
 __all__ = [
     "notification_service",
@@ -0,0 +1,246 @@
+import os
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy import SmallInteger, Integer, case, cast, func, literal_column, select, union, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, User, Project, Task, ProjectStatus, TaskStatus, project_collaborators, task_collaborators
+from app.services.response_cache import cached_query
+from app.services.single_flight import single_flight
+from app.services.workload_heatmap import WorkloadHeatmap
+from app.services.user_resolver import get_resolver
+
+def get_team_calendar_events(user_id):
+    """Calendar events of everyone the user shares a project or task with."""
+    resolver = get_resolver()
+    user_projects = Project.query.filter(
+        (Project.owner_id == user_id) | (Project.collaborators.any(User.id == user_id))
+    ).all()
+
+    team_member_ids = set()
+    
+    for project in user_projects:
+        team_member_ids.add(project.owner_id)
+        for collaborator in project.collaborators:
+            team_member_ids.add(collaborator.id)
+    
+    user_tasks = Task.query.filter(
+        (Task.owner_id == user_id) | (Task.collaborators.any(User.id == user_id))
+    ).all()
+    
+    for task in user_tasks:
+        team_member_ids.add(task.owner_id)
+        for collaborator in task.collaborators:
+            team_member_ids.add(collaborator.id)
+
+    # Get all team members for reference
+    all_team_members = User.query.filter(User.id.in_(list(team_member_ids))).all()
+    resolver.prime(all_team_members)
+    team_member_emails = {member.id: member.email for member in all_team_members}
+
+    team_tasks = Task.query.filter(
+        (Task.owner_id.in_(list(team_member_ids))) | 
+        (Task.collaborators.any(User.id.in_(list(team_member_ids))))
+    ).all()
+
+    team_projects = Project.query.filter(
+        (Project.owner_id.in_(list(team_member_ids))) | 
+        (Project.collaborators.any(User.id.in_(list(team_member_ids))))
+    ).all()
+
+    # Owners outside the team are fetched in one go rather than per event
+    owners = resolver.by_ids(
+        {project.owner_id for project in team_projects} | {task.owner_id for task in team_tasks}
+    )
+
+    events = []
+    now = date.today()
+
+    for project in team_projects:
+        if project.deadline:
+            if project.deadline < now and project.status != ProjectStatus.COMPLETED:
+                status = "overdue"
+            elif project.status == ProjectStatus.COMPLETED:
+                status = "completed"
+            elif project.status == ProjectStatus.IN_PROGRESS:
+                status = "ongoing"
+            else:
+                status = "upcoming"
+            
+            owner = owners.get(project.owner_id)
+            owner_email = owner.email if owner else "Unknown"
+            
+
+            project_collaborator_emails = [collab.email for collab in project.collaborators]
+            
+            events.append({
+                "id": f"project-{project.id}",
+                "title": project.name,
+                "description": project.description,
+                "start": project.deadline.isoformat(),
+                "end": project.deadline.isoformat(),
+                "type": "project",
+                "status": status,
+                "assignee": owner.name if owner else "Unknown",
+                "assigneeEmail": owner_email,
+                "collaborators": project_collaborator_emails
+            })
+
+    for task in team_tasks:
+        if task.duedate:
+            if task.duedate < now and task.status != TaskStatus.COMPLETED:
+                status = "overdue"
+            elif task.status == TaskStatus.COMPLETED:
+                status = "completed"
+            elif task.status in [TaskStatus.ONGOING, TaskStatus.PENDING_REVIEW]:
+                status = "ongoing"
+            else:
+                status = "upcoming"
+            
+            owner = owners.get(task.owner_id)
+            owner_email = owner.email if owner else "Unknown"
+            
+            collaborator_emails = [collab.email for collab in task.collaborators]
+            
+            events.append({
+                "id": f"task-{task.id}",
+                "title": task.title,
+                "description": task.description,
+                "start": task.duedate.isoformat(),
+                "end": task.duedate.isoformat(),
+                "type": "task",
+                "status": status,
+                "assignee": owner.name if owner else "Unknown",
+                "assigneeEmail": owner_email,
+                "collaborators": collaborator_emails  
+            })
+
+    return events
+
+# Every open schedule page polls this every 30 seconds and the answer is the
+# same for everyone, so concurrent calls share one computation
+@single_flight()
+def get_workload():
+    """Active calendar items per user: tasks, projects and overdue tasks.
+
+    One grouped query for tasks and one for projects, whatever the number of
+    users. A user who both owns and collaborates on an item counts it once.
+    """
+    now = date.today()
+    open_task = (Task.duedate.isnot(None), Task.status != TaskStatus.COMPLETED)
+    task_members = union(
+        select(Task.owner_id.label("user_id"), Task.id.label("item_id"), Task.duedate).where(*open_task),
+        select(task_collaborators.c.user_id, Task.id, Task.duedate)
+        .join(Task, Task.id == task_collaborators.c.task_id)
+        .where(*open_task),
+    ).subquery("task_members")
+    task_counts = {
+        row.user_id: row
+        for row in db.session.execute(
+            select(
+                task_members.c.user_id,
+                func.count().label("tasks"),
+                func.count().filter(task_members.c.duedate < now).label("overdue"),
+            ).group_by(task_members.c.user_id)
+        )
+    }
+
+    open_project = (Project.deadline.isnot(None), Project.status != ProjectStatus.COMPLETED)
+    project_members = union(
+        select(Project.owner_id.label("user_id"), Project.id.label("item_id")).where(*open_project),
+        select(project_collaborators.c.user_id, Project.id)
+        .join(Project, Project.id == project_collaborators.c.project_id)
+        .where(*open_project),
+    ).subquery("project_members")
+    project_counts = dict(db.session.execute(
+        select(project_members.c.user_id, func.count()).group_by(project_members.c.user_id)
+    ).all())
+
+    workload_data = []
+    for user in db.session.execute(select(User.id, User.name, User.email, User.role).order_by(User.id)):
+        counts = task_counts.get(user.id)
+        calendar_tasks_count = counts.tasks if counts else 0
+        calendar_projects_count = project_counts.get(user.id, 0)
+        workload_data.append({
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role.value,
+            "workload": calendar_tasks_count + calendar_projects_count,
+            "task_count": calendar_tasks_count,
+            "project_count": calendar_projects_count,
+            "overdue_count": counts.overdue if counts else 0,
+        })
+
+    return workload_data
+
+HEATMAP_DEFAULT_DAYS = int(os.getenv("HEATMAP_DEFAULT_DAYS", 28))
+HEATMAP_MAX_DAYS = int(os.getenv("HEATMAP_MAX_DAYS", 92))
+_OPEN_STATUSES = [status for status in TaskStatus if status != TaskStatus.COMPLETED]
+
+def heatmap_range(start=None, end=None):
+    """The (start, end) days of the heatmap, defaulting to the next HEATMAP_DEFAULT_DAYS days."""
+    start = start or date.today()
+    end = end or start + timedelta(days=HEATMAP_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("The start date must not be after the end date")
+    if (end - start).days >= HEATMAP_MAX_DAYS:
+        raise ValueError(f"The heatmap covers at most {HEATMAP_MAX_DAYS} days")
+    return start, end
+
+def _load_assignments(start, end):
+    """Open tasks due by `end`, one row per owner or collaborator, as NumPy arrays.
+
+    Postgres packs each column into a single bytea of big-endian integers,
+    so a million assignments arrive as four buffers instead of a million
+    row tuples. Aggregates of one query see the rows in the same order,
+    which keeps the arrays aligned.
+    """
+    where = (Task.status != TaskStatus.COMPLETED, Task.duedate <= end)
+    def columns(user_id):
+        return (
+            user_id.label("user_id"),
+            func.greatest(Task.duedate - start, -1).label("day"),
+            Task.priority.label("priority"),
+            case(*[(Task.status == status, i) for i, status in enumerate(_OPEN_STATUSES)]).label("status"),
+        )
+
+    assignments = union_all(
+        select(*columns(Task.owner_id)).where(*where),
+        select(*columns(task_collaborators.c.user_id))
+        .join(Task, Task.id == task_collaborators.c.task_id)
+        .where(*where, task_collaborators.c.user_id != Task.owner_id),
+    ).subquery("assignments")
+
+    def packed(value, send, sql_type):
+        return func.string_agg(getattr(func, send)(cast(value, sql_type)), literal_column("''::bytea"))
+
+    row = db.session.execute(select(
+        packed(assignments.c.user_id, "int4send", Integer),
+        packed(assignments.c.day, "int2send", SmallInteger),
+        packed(assignments.c.priority, "int2send", SmallInteger),
+        packed(assignments.c.status, "int2send", SmallInteger),
+    )).one()
+    return [
+        np.frombuffer(buffer or b"", dtype=dtype).astype(np.int64)
+        for buffer, dtype in zip(row, (">i4", ">i2", ">i2", ">i2"))
+    ]
+
+@cached_query("tasks", "task_collaborators")
+def _workload_heatmap_data(start_iso, end_iso):
+    start, end = date.fromisoformat(start_iso), date.fromisoformat(end_iso)
+    user_ids, days, priorities, statuses = _load_assignments(start, end)
+    heatmap = WorkloadHeatmap(user_ids, days, priorities, statuses, start, (end - start).days + 1, len(_OPEN_STATUSES))
+    return heatmap.to_dict([status.value for status in _OPEN_STATUSES])
+
+def get_workload_heatmap(start=None, end=None):
+    """Per-user daily and weekly load matrices and an overload forecast for [start, end].
+
+    The range is resolved before the cache lookup, so a default range that
+    starts today is never served from yesterday's entry.
+    """
+    start, end = heatmap_range(start, end)
+    try:
+        return _workload_heatmap_data(start.isoformat(), end.isoformat())
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while building the workload heatmap: {e}")
@@ -0,0 +1,105 @@
+import enum
+from contextlib import nullcontext
+from datetime import date, datetime
+from sqlalchemy import inspect
+from sqlalchemy.orm import object_session
+
+# Attribute -> label used in notifications and emails
+TASK_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "duedate": "due date",
+    "status": "status",
+    "priority": "priority",
+    "notes": "notes",
+    "owner": "assignee",
+    "project": "project",
+}
+
+PROJECT_FIELDS = {
+    "name": "Name",
+    "description": "Description",
+    "notes": "Notes",
+    "status": "Status",
+    "deadline": "Deadline",
+    "owner": "Owner",
+}
+
+def normalize(value):
+    """Turn a column or relationship value into the plain value shown in diffs."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "email"):
+        return value.email
+    if hasattr(value, "name"):
+        return value.name
+    if isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+def apply_changes(instance, values, fields):
+    """Assign `values` to `instance`, skipping no-ops, and return the resulting diffs.
+
+    Values equal to the current one after normalisation (e.g. '' vs None, or
+    a date vs the same date as datetime) are not assigned at all, so they
+    neither dirty the row nor show up as changes. Autoflush is held off so a
+    lazy load partway through cannot flush (and so forget) earlier assignments.
+    """
+    session = object_session(instance)
+    with session.no_autoflush if session is not None else nullcontext():
+        for attr, value in values.items():
+            if normalize(getattr(instance, attr)) == normalize(value):
+                continue
+            setattr(instance, attr, value)
+        return get_changes(instance, {a: fields[a] for a in values if a in fields})
+
+def diff_values(instance, values, fields):
+    """Compare `values` with `instance` without assigning anything.
+
+    Returns the values that differ and their {"field", "old_value",
+    "new_value"} diffs, for callers that write with a set-based UPDATE.
+    """
+    changed = {}
+    changes = []
+    for attr, value in values.items():
+        old_value = normalize(getattr(instance, attr))
+        new_value = normalize(value)
+        if old_value == new_value:
+            continue
+        changed[attr] = value
+        changes.append({"field": fields.get(attr, attr), "old_value": old_value, "new_value": new_value})
+    return changed, changes
+
+def get_changes(instance, fields):
+    """Per-field diffs for pending changes on `instance`, from SQLAlchemy attribute history.
+
+    Returns a list of {"field", "old_value", "new_value"} dicts in `fields` order.
+    """
+    state = inspect(instance)
+    changes = []
+    for attr, label in fields.items():
+        history = state.attrs[attr].history
+        if not history.has_changes():
+            continue
+        old_value = normalize(history.deleted[0]) if history.deleted else None
+        new_value = normalize(history.added[0]) if history.added else None
+        if old_value == new_value:
+            continue
+        changes.append({"field": label, "old_value": old_value, "new_value": new_value})
+    return changes
+
+def touch(instance):
+    """Bump the row version of `instance` for a change that lives in other tables.
+
+    Collaborator links and attachments are rows of their own, so changing
+    them would not otherwise move the version clients compare against.
+    Bumping twice in one flush still counts as a single new version.
+    """
+    if not inspect(instance).attrs.version.history.has_changes():
+        instance.version = instance.version + 1
@@ -0,0 +1,58 @@
+from collections import namedtuple
+from sqlalchemy import select, delete, insert
+from app.models import db, User, Task, Project, task_collaborators, project_collaborators
+from app.services.change_tracking import touch
+from app.services.user_resolver import get_resolver
+
+# Owning model -> (association table, foreign key column on it)
+_ASSOCIATIONS = {
+    Task: (task_collaborators, "task_id"),
+    Project: (project_collaborators, "project_id"),
+}
+
+CollaboratorChanges = namedtuple("CollaboratorChanges", ["added", "removed", "before", "after"])
+
+def resolve_users_by_email(emails):
+    """Map each known email to its User with at most one IN query; unknown emails are left out."""
+    return get_resolver().by_emails(emails)
+
+def sync_collaborators(instance, emails):
+    """Make the collaborators of a task or project exactly `emails`, touching only the rows that differ.
+
+    Issues at most one bulk DELETE and one bulk INSERT on the association
+    table, then expires the relationship so it reloads on next access and
+    bumps the owner's row version.
+    Returns CollaboratorChanges: the added Users, the removed user ids and the
+    email lists before and after (in request order), for notifications.
+    """
+    table, fk = _ASSOCIATIONS[type(instance)]
+    owner_col = table.c[fk]
+    if instance.id is None:
+        db.session.flush()
+
+    current = dict(db.session.execute(
+        select(User.id, User.email)
+        .join(table, table.c.user_id == User.id)
+        .where(owner_col == instance.id)
+    ).all())
+
+    wanted = resolve_users_by_email(emails)
+    wanted_ids = {u.id for u in wanted.values()}
+
+    removed = set(current) - wanted_ids
+    added = [wanted[e] for e in dict.fromkeys(emails) if e in wanted and wanted[e].id not in current]
+
+    if removed:
+        db.session.execute(
+            delete(table).where(owner_col == instance.id, table.c.user_id.in_(removed))
+        )
+    if added:
+        db.session.execute(
+            insert(table), [{fk: instance.id, "user_id": u.id} for u in added]
+        )
+    if added or removed:
+        db.session.expire(instance, ["collaborators"])
+        touch(instance)
+
+    after = [e for e in dict.fromkeys(emails) if e in wanted]
+    return CollaboratorChanges(added, removed, list(current.values()), after)
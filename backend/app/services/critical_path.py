@@ -0,0 +1,188 @@
+import heapq
+import os
+from collections import deque
+from datetime import date
+
+TASK_DURATION_DAYS = int(os.getenv("CRITICAL_PATH_TASK_DAYS", 1))
+
+def _iso(day):
+    return date.fromordinal(day).isoformat() if day is not None else None
+
+class CriticalPath:
+    """Earliest and latest finish, slack and critical path of a project's task dependency DAG.
+
+    Tasks have no durations, so every open task is assumed to take
+    `duration` days and a completed one none. A task can start once every
+    task it depends on has finished, and not before `today`. It must
+    finish by its own due date, by the project deadline, and early enough
+    for each dependent task to finish in time. Slack is the number of days
+    between the two finishes: zero or less means the task holds up the
+    schedule, and negative means it is already expected to be late.
+
+    Days are kept as date ordinals. `update()` changes one task and
+    recomputes only what depends on it. That is the earliest finishes
+    downstream and the latest finishes upstream, walked in topological
+    order, stopping wherever a value does not change.
+    """
+
+    def __init__(self, tasks, edges, deadline=None, today=None, duration=TASK_DURATION_DAYS):
+        """`tasks` maps id -> (duedate, completed); `edges` are (task_id, depends_on_id) pairs."""
+        self.today = (today or date.today()).toordinal()
+        self.deadline = deadline.toordinal() if deadline else None
+        self.duration = duration
+        self.due, self.dur, self.completed = {}, {}, set()
+        for task_id, (duedate, completed) in tasks.items():
+            self._set(task_id, duedate, completed)
+
+        self.preds = {task_id: [] for task_id in tasks}
+        self.succs = {task_id: [] for task_id in tasks}
+        for task_id, depends_on in edges:
+            if task_id in self.preds and depends_on in self.preds:
+                self.preds[task_id].append(depends_on)
+                self.succs[depends_on].append(task_id)
+
+        self.order = self._topological_order()
+        self.position = {task_id: i for i, task_id in enumerate(self.order)}
+        self.ef, self.lf = {}, {}
+        for task_id in self.order:
+            self.ef[task_id] = self._earliest_finish(task_id)
+        for task_id in reversed(self.order):
+            self.lf[task_id] = self._latest_finish(task_id)
+        self.recomputed = len(self.order)
+        self._result = None
+
+    def _set(self, task_id, duedate, completed):
+        self.due[task_id] = duedate.toordinal()
+        self.dur[task_id] = 0 if completed else self.duration
+        if completed:
+            self.completed.add(task_id)
+        else:
+            self.completed.discard(task_id)
+
+    def _topological_order(self):
+        waiting = {task_id: len(preds) for task_id, preds in self.preds.items()}
+        ready = deque(sorted(task_id for task_id, count in waiting.items() if count == 0))
+        order = []
+        while ready:
+            task_id = ready.popleft()
+            order.append(task_id)
+            for succ in self.succs[task_id]:
+                waiting[succ] -= 1
+                if waiting[succ] == 0:
+                    ready.append(succ)
+        if len(order) != len(self.preds):
+            raise ValueError("Task dependencies contain a cycle")
+        return order
+
+    def _earliest_finish(self, task_id):
+        start = max([self.today] + [self.ef[pred] for pred in self.preds[task_id]])
+        return start + self.dur[task_id]
+
+    def _latest_finish(self, task_id):
+        # A finished task's own due date no longer constrains anything
+        limits = [self.lf[succ] - self.dur[succ] for succ in self.succs[task_id]]
+        if task_id not in self.completed:
+            limits.append(self.due[task_id])
+        if self.deadline is not None:
+            limits.append(self.deadline)
+        return min(limits) if limits else self.ef[task_id]
+
+    def slack(self, task_id):
+        return self.lf[task_id] - self.ef[task_id]
+
+    def update(self, task_id, duedate, completed):
+        """Apply a new due date or completion state; returns how many tasks were recomputed."""
+        old_dur = self.dur[task_id]
+        old_due = self.due[task_id]
+        was_completed = task_id in self.completed
+        self._set(task_id, duedate, completed)
+        if (self.dur[task_id], self.due[task_id], completed) == (old_dur, old_due, was_completed):
+            return 0
+
+        touched = 0
+        # Earliest finishes flow downstream...
+        heap, queued = [(self.position[task_id], task_id)], {task_id}
+        while heap:
+            _, node = heapq.heappop(heap)
+            queued.discard(node)
+            touched += 1
+            finish = self._earliest_finish(node)
+            if finish == self.ef[node]:
+                continue
+            self.ef[node] = finish
+            for succ in self.succs[node]:
+                if succ not in queued:
+                    queued.add(succ)
+                    heapq.heappush(heap, (self.position[succ], succ))
+
+        # ...and latest finishes upstream. The task's predecessors also depend
+        # on its duration, so they are revisited even if its own value holds.
+        heap, queued = [(-self.position[task_id], task_id)], {task_id}
+        while heap:
+            _, node = heapq.heappop(heap)
+            queued.discard(node)
+            touched += 1
+            finish = self._latest_finish(node)
+            if finish == self.lf[node] and not (node == task_id and self.dur[node] != old_dur):
+                continue
+            self.lf[node] = finish
+            for pred in self.preds[node]:
+                if pred not in queued:
+                    queued.add(pred)
+                    heapq.heappush(heap, (-self.position[pred], pred))
+
+        self.recomputed = touched
+        self._result = None
+        return touched
+
+    def critical_path(self):
+        """The chain through the open task with the least slack, from what drives it to what it constrains."""
+        open_tasks = [task_id for task_id in self.order if task_id not in self.completed]
+        if not open_tasks:
+            return []
+        worst = min(open_tasks, key=lambda t: (self.slack(t), -self.ef[t], t))
+
+        path = [worst]
+        node = worst
+        while True:
+            start = self.ef[node] - self.dur[node]
+            drivers = [p for p in self.preds[node] if self.ef[p] == start and p not in self.completed]
+            if not drivers:
+                break
+            node = min(drivers, key=lambda t: (self.slack(t), t))
+            path.append(node)
+        path.reverse()
+
+        node = worst
+        while True:
+            bound = [s for s in self.succs[node] if self.lf[s] - self.dur[s] == self.lf[node] and s not in self.completed]
+            if not bound:
+                break
+            node = min(bound, key=lambda t: (self.slack(t), t))
+            path.append(node)
+        return path
+
+    def result(self):
+        """JSON-ready summary; built once per change and shared, so treat it as read-only."""
+        if self._result is None:
+            finish = max(self.ef.values(), default=None)
+            tasks = []
+            for task_id in self.order:
+                slack = self.slack(task_id)
+                is_open = task_id not in self.completed
+                tasks.append({
+                    "id": task_id,
+                    "earliest_finish": _iso(self.ef[task_id]),
+                    "latest_finish": _iso(self.lf[task_id]),
+                    "slack": slack,
+                    "critical": is_open and slack <= 0,
+                })
+            self._result = {
+                "deadline": _iso(self.deadline),
+                "projected_finish": _iso(finish),
+                "at_risk": self.deadline is not None and finish is not None and finish > self.deadline,
+                "late_tasks": sum(1 for task in tasks if task["critical"] and task["slack"] < 0),
+                "critical_path": self.critical_path(),
+                "tasks": tasks,
+            }
+        return self._result
@@ -0,0 +1,191 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, Project, Task, TaskDependency, TaskStatus
+from app.services.critical_path import CriticalPath
+from app.services.event_bus import commit
+from app.services.response_cache import response_cache
+from app.services.single_flight import SingleFlight
+
+CRITICAL_PATH_CACHE_SIZE = int(os.getenv("CRITICAL_PATH_CACHE_SIZE", 64))
+
+class DependencyCycleError(ValueError):
+    """Raised when a new dependency would make a task (indirectly) wait for itself."""
+
+def _upstream_of(task_id):
+    """Ids of every task `task_id` depends on, directly or not, from one recursive query."""
+    upstream = (
+        select(TaskDependency.depends_on_id.label("id"))
+        .where(TaskDependency.task_id == task_id)
+        .cte("upstream", recursive=True)
+    )
+    upstream = upstream.union(
+        select(TaskDependency.depends_on_id).where(TaskDependency.task_id == upstream.c.id)
+    )
+    return upstream
+
+def add_dependency(task_id, depends_on_id):
+    """Make `task_id` wait for `depends_on_id`. Returns False if it already did."""
+    if task_id == depends_on_id:
+        raise DependencyCycleError("A task cannot depend on itself")
+    try:
+        tasks = {t.id: t for t in Task.query.filter(Task.id.in_([task_id, depends_on_id])).all()}
+        for missing in (task_id, depends_on_id):
+            if missing not in tasks:
+                raise ValueError(f"Task with ID {missing} not found.")
+        project_id = tasks[task_id].project_id
+        if project_id is None or tasks[depends_on_id].project_id != project_id:
+            raise ValueError("Dependencies can only link tasks of the same project")
+
+        # Dependency edits of one project take turns, so two concurrent
+        # inserts cannot each pass the cycle check and close a loop together
+        db.session.execute(select(Project.id).where(Project.id == project_id).with_for_update())
+        if db.session.get(TaskDependency, (task_id, depends_on_id)) is not None:
+            db.session.rollback()
+            return False
+        upstream = _upstream_of(depends_on_id)
+        if db.session.execute(select(upstream.c.id).where(upstream.c.id == task_id).limit(1)).first():
+            raise DependencyCycleError(f"Task {depends_on_id} already depends on task {task_id}")
+
+        db.session.add(TaskDependency(task_id=task_id, depends_on_id=depends_on_id))
+        commit()
+        return True
+
+    except ValueError:
+        db.session.rollback()
+        raise
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while adding a dependency to task {task_id}: {e}")
+
+def remove_dependency(task_id, depends_on_id):
+    """Returns False if there was no such dependency."""
+    try:
+        deleted = db.session.execute(
+            delete(TaskDependency).where(
+                TaskDependency.task_id == task_id,
+                TaskDependency.depends_on_id == depends_on_id,
+            )
+        ).rowcount
+        commit()
+        return bool(deleted)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while removing a dependency of task {task_id}: {e}")
+
+def get_task_dependencies(task_id):
+    """Ids of the tasks this task waits for and of the tasks waiting for it."""
+    try:
+        rows = db.session.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_id).where(
+                (TaskDependency.task_id == task_id) | (TaskDependency.depends_on_id == task_id)
+            )
+        ).all()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while retrieving dependencies of task {task_id}: {e}")
+    return {
+        "depends_on": sorted(row.depends_on_id for row in rows if row.task_id == task_id),
+        "blocks": sorted(row.task_id for row in rows if row.depends_on_id == task_id),
+    }
+
+# --- Critical path -----------------------------------------------------------
+# One CriticalPath per recently viewed project, checked against the table
+# versions on every request. When only tasks changed, the project's due
+# dates and statuses are re-read (one narrow query) and just the changed
+# tasks are fed to update(); new edges, added or removed tasks, a new
+# deadline or a new day rebuild the schedule.
+
+# Project id -> last schedule. The lock only guards the dict; queries and
+# rebuilds run outside it, one at a time per project.
+_schedules = OrderedDict()
+_schedules_lock = threading.Lock()
+_builds = SingleFlight("critical_path", ttl=0)
+
+def _load_edges(project_id):
+    return frozenset(db.session.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_id)
+        .join(Task, Task.id == TaskDependency.task_id)
+        .where(Task.project_id == project_id)
+    ).tuples())
+
+def _build_schedule(project_id, today):
+    """Bring the project's schedule up to date and store it; returns (result, tasks recomputed)."""
+    versions = response_cache.versions(("tasks", "task_dependencies", "projects"))
+    with _schedules_lock:
+        cached = _schedules.get(project_id)
+        # Take the engine out so it is only ever updated by this build
+        engine = cached.pop("engine", None) if cached else None
+
+    project = db.session.execute(select(Project.deadline).where(Project.id == project_id)).first()
+    if project is None:
+        raise ValueError(f"Project with ID {project_id} not found.")
+    tasks = {
+        row.id: (row.duedate, row.status == TaskStatus.COMPLETED)
+        for row in db.session.execute(
+            select(Task.id, Task.duedate, Task.status).where(Task.project_id == project_id)
+        )
+    }
+    edges = cached["edges"] if cached and cached["versions"][1] == versions[1] else _load_edges(project_id)
+
+    if (
+        engine is not None
+        and cached["today"] == today
+        and cached["deadline"] == project.deadline
+        and cached["edges"] == edges
+        and cached["tasks"].keys() == tasks.keys()
+    ):
+        recomputed = 0
+        for task_id, (duedate, completed) in tasks.items():
+            if cached["tasks"][task_id] != (duedate, completed):
+                recomputed += engine.update(task_id, duedate, completed)
+        engine.recomputed = recomputed
+    else:
+        engine = CriticalPath(tasks, edges, deadline=project.deadline, today=today)
+
+    result = engine.result()
+    with _schedules_lock:
+        # Only replace the entry this build started from; a newer one wins
+        if _schedules.get(project_id) is cached:
+            _schedules[project_id] = {
+                "versions": versions,
+                "today": today,
+                "deadline": project.deadline,
+                "edges": edges,
+                "tasks": tasks,
+                "engine": engine,
+                "result": result,
+            }
+            _schedules.move_to_end(project_id)
+            while len(_schedules) > CRITICAL_PATH_CACHE_SIZE:
+                _schedules.popitem(last=False)
+    return result, engine.recomputed
+
+def get_critical_path(project_id):
+    """Schedule summary of a project: slack per task, critical path and whether the deadline holds.
+
+    A current schedule is returned without touching the database. Otherwise
+    concurrent callers for the same project share one rebuild, and other
+    projects are not held up by it.
+    """
+    versions = response_cache.versions(("tasks", "task_dependencies", "projects"))
+    today = date.today()
+    with _schedules_lock:
+        cached = _schedules.get(project_id)
+        if cached and cached["versions"] == versions and cached["today"] == today:
+            _schedules.move_to_end(project_id)
+            return {"project_id": project_id, "recomputed": 0, **cached["result"]}
+    try:
+        result, recomputed = _builds.do(project_id, lambda: _build_schedule(project_id, today))
+        return {"project_id": project_id, "recomputed": recomputed, **result}
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while computing the critical path of project {project_id}: {e}")
+
+def init_app(app):
+    """Start without schedules computed against another app's database."""
+    with _schedules_lock:
+        _schedules.clear()
@@ -0,0 +1,302 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from sqlalchemy import bindparam, delete, distinct, func, select, true, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import db, Notification, NotificationDigestEntry, NotificationType, Task
+from app.services.email_services import (
+    get_notification_recipients,
+    send_task_update_digest_email,
+)
+
+DIGEST_WINDOW_SECONDS = float(os.getenv("NOTIFICATION_DIGEST_WINDOW", 300))
+COLLAPSE_IN_APP = os.getenv("NOTIFICATION_DIGEST_COLLAPSE_IN_APP", "true").lower() == "true"
+
+def merge_updated_fields(existing, new):
+    """Merge two `updated_fields` lists into one diff per field.
+
+    The first `old_value` and the latest `new_value` win; fields that ended
+    up back where they started are dropped.
+    """
+    merged = {}
+    for change in list(existing or []) + list(new or []):
+        field = change.get("field")
+        if field in merged:
+            merged[field]["new_value"] = change.get("new_value")
+        else:
+            merged[field] = dict(change)
+    return [c for c in merged.values() if c.get("old_value") != c.get("new_value")]
+
+def _insert(conn):
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(NotificationDigestEntry)
+    return sqlite.insert(NotificationDigestEntry)
+
+class NotificationDigest:
+    """Buffers task update emails per recipient and sends one email per window.
+
+    The window opens with the first update buffered for a recipient. Updates
+    to the same task inside the window are merged into a single diff. When
+    the window closes the recipient gets one email covering every task that
+    changed. With `window <= 0` updates are sent straight away.
+
+    The buffer is the notification_digest_entries table, so all workers share
+    it and a restart loses nothing. Each worker arms one timer for the
+    earliest open window; `flask flush-notification-digests` (run from cron)
+    sends whatever no running worker has a timer for.
+    """
+
+    def __init__(self, window=DIGEST_WINDOW_SECONDS, auto_flush=True, clock=time.time):
+        self.window = window
+        self.auto_flush = auto_flush
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._timer = None
+        self.counters = {"events": 0, "emails": 0, "failed": 0}
+
+    def add_task_update(self, task, updated_by, updated_fields):
+        """Buffer one task update for every recipient except the user who made it."""
+        self.add_task_updates([(task, updated_fields)], updated_by)
+
+    def add_task_updates(self, updates, updated_by):
+        """Buffer several (task, updated_fields) pairs at once.
+
+        With a zero window the recipients still get one email for the whole
+        batch rather than one per task.
+        """
+        entries = {}
+        events = 0
+        for task, updated_fields in updates:
+            if not updated_fields:
+                continue
+            recipients = get_notification_recipients(task, updated_by.id)
+            if not recipients:
+                continue
+            events += 1
+            for recipient in recipients:
+                entry = entries.setdefault((recipient, task.id), {"updated_by": updated_by.email, "fields": []})
+                entry["fields"] = merge_updated_fields(entry["fields"], updated_fields)
+        if not entries:
+            return
+
+        with self._lock:
+            self.counters["events"] += events
+        if self.window <= 0:
+            self._send(entries)
+            return
+        self._store(entries, self.clock())
+        if self.auto_flush:
+            self._schedule()
+
+    def pending_count(self):
+        """Recipients with a digest waiting."""
+        with db.engine.connect() as conn:
+            return conn.execute(select(func.count(distinct(NotificationDigestEntry.recipient)))).scalar()
+
+    def flush_due(self):
+        """Send digests whose window has closed. Returns the number of emails sent."""
+        E = NotificationDigestEntry
+        due = select(E.recipient).group_by(E.recipient).having(func.min(E.opened_at) <= self.clock() - self.window)
+        return self._send(self._claim(E.recipient.in_(due)))
+
+    def flush(self, recipients=None):
+        """Send digests now, for the given recipients or for everyone pending."""
+        if recipients is None:
+            return self._send(self._claim(true()))
+        recipients = list(recipients)
+        return self._send(self._claim(NotificationDigestEntry.recipient.in_(recipients))) if recipients else 0
+
+    def _store(self, entries, opened_at, earlier=False):
+        """Merge {(recipient, task_id): {"updated_by", "fields"}} into the buffer.
+
+        Rows are locked while they are merged, so two workers adding to the
+        same digest do not lose each other's changes. With `earlier`, the
+        entries are older than what is buffered (a send being put back).
+        """
+        E = NotificationDigestEntry
+        keys = list(entries)
+        with db.engine.begin() as conn:
+            conn.execute(
+                _insert(conn)
+                .values([
+                    {"recipient": r, "task_id": t, "updated_by": entries[(r, t)]["updated_by"], "fields": [], "opened_at": opened_at}
+                    for r, t in keys
+                ])
+                .on_conflict_do_nothing(index_elements=[E.recipient, E.task_id])
+            )
+            current = {
+                (row.recipient, row.task_id): row
+                for row in conn.execute(
+                    select(E.recipient, E.task_id, E.updated_by, E.fields)
+                    .where(tuple_(E.recipient, E.task_id).in_(keys))
+                    .with_for_update()
+                )
+            }
+            rows = []
+            for key, entry in entries.items():
+                row = current[key]
+                if earlier and row.fields:
+                    updated_by, fields = row.updated_by, merge_updated_fields(entry["fields"], row.fields)
+                else:
+                    updated_by, fields = entry["updated_by"], merge_updated_fields(row.fields, entry["fields"])
+                rows.append({"b_recipient": key[0], "b_task_id": key[1], "b_updated_by": updated_by, "b_fields": fields})
+            conn.execute(
+                update(E)
+                .where(E.recipient == bindparam("b_recipient"), E.task_id == bindparam("b_task_id"))
+                .values(updated_by=bindparam("b_updated_by"), fields=bindparam("b_fields")),
+                rows,
+            )
+
+    def _claim(self, condition):
+        """Remove matching entries from the buffer and return them; a digest is claimed by one worker only."""
+        E = NotificationDigestEntry
+        with db.engine.begin() as conn:
+            rows = conn.execute(
+                delete(E).where(condition).returning(E.recipient, E.task_id, E.updated_by, E.fields)
+            ).all()
+        return {(row.recipient, row.task_id): {"updated_by": row.updated_by, "fields": row.fields} for row in rows}
+
+    def _send(self, entries):
+        """Email each recipient their buffered tasks. Returns the number of emails sent.
+
+        A recipient whose email fails is put back in the buffer and retried
+        one window later, so one bad send neither loses nor blocks the rest.
+        """
+        if not entries:
+            return 0
+        batch = {}
+        for (recipient, task_id), update in entries.items():
+            batch.setdefault(recipient, {})[task_id] = update
+
+        failed = {}
+        sent = 0
+        try:
+            tasks = {t.id: t for t in Task.query.filter(Task.id.in_({t for _, t in entries})).all()}
+        except Exception:
+            self._put_back(entries)
+            raise
+        for recipient, updates_by_task in batch.items():
+            updates = [
+                (tasks[task_id], update["updated_by"], update["fields"])
+                for task_id, update in updates_by_task.items()
+                if task_id in tasks and update["fields"]
+            ]
+            if not updates:
+                continue
+            try:
+                send_task_update_digest_email(recipient, updates)
+                sent += 1
+            except Exception as e:
+                print(f"DEBUG: Digest email to {recipient} failed: {e}")
+                failed.update({(recipient, task_id): update for task_id, update in updates_by_task.items()})
+        self._put_back(failed)
+        with self._lock:
+            self.counters["emails"] += sent
+            self.counters["failed"] += len({recipient for recipient, _ in failed})
+        return sent
+
+    def _put_back(self, entries):
+        # With no window there is no buffer to return to
+        if entries and self.window > 0:
+            self._store(entries, self.clock(), earlier=True)
+
+    def _schedule(self, min_delay=0.0):
+        """Arm a single timer for the earliest window still open."""
+        try:
+            app = current_app._get_current_object()
+        except RuntimeError:
+            return
+        if self._timer is not None:
+            return
+
+        with db.engine.connect() as conn:
+            earliest = conn.execute(select(func.min(NotificationDigestEntry.opened_at))).scalar()
+        if earliest is None:
+            return
+        delay = max(min_delay, earliest + self.window - self.clock())
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(delay, self._on_timer, args=(app,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self, app):
+        with self._lock:
+            self._timer = None
+        with app.app_context():
+            retry = 0.0
+            try:
+                self.flush_due()
+            except Exception as e:
+                print(f"DEBUG: Digest flush failed, retrying in {self.window}s: {e}")
+                retry = self.window
+            finally:
+                try:
+                    self._schedule(min_delay=retry)
+                finally:
+                    db.session.remove()
+
+def find_collapsible_updates(task_ids, user_ids):
+    """{(task_id, user_id): notification} for the newest unread TASK_UPDATED rows still inside the window."""
+    if not COLLAPSE_IN_APP or not task_ids or not user_ids:
+        return {}
+
+    cutoff = datetime.utcnow() - timedelta(seconds=DIGEST_WINDOW_SECONDS)
+    existing = (
+        Notification.query
+        .filter(
+            Notification.task_id.in_(task_ids),
+            Notification.user_id.in_(user_ids),
+            Notification.type == NotificationType.TASK_UPDATED,
+            Notification.is_read.is_(False),
+            Notification.created_at >= cutoff,
+        )
+        .order_by(Notification.created_at.desc())
+        .all()
+    )
+
+    collapsible = {}
+    for notif in existing:
+        key = (notif.task_id, notif.user_id)
+        if key in collapsible or "updated_fields" not in (notif.payload or {}):
+            continue
+        collapsible[key] = notif
+    return collapsible
+
+def fold_task_update(notif, updated_fields, payload):
+    """Merge an update into an existing row, deleting it if the changes cancel out."""
+    merged = merge_updated_fields(notif.payload.get("updated_fields"), updated_fields)
+    if not merged:
+        db.session.delete(notif)
+        return
+    notif.payload = {**payload, "updated_fields": merged}
+    notif.created_at = datetime.utcnow()
+
+def collapse_task_update_notifications(task, updated_fields, users, payload):
+    """Fold an update into each user's unread TASK_UPDATED row for this task.
+
+    Rows created inside the digest window are merged in place; users without
+    such a row are returned so the caller can insert a fresh notification.
+    """
+    if not COLLAPSE_IN_APP or not users:
+        return set(users)
+
+    collapsible = find_collapsible_updates([task.id], [u.id for u in users])
+    for notif in collapsible.values():
+        fold_task_update(notif, updated_fields, payload)
+
+    return {u for u in users if (task.id, u.id) not in collapsible}
+
+# Global instance
+notification_digest = NotificationDigest()
+
+def init_app(app):
+    """Register `flask flush-notification-digests`, run from cron to send digests no worker is timing."""
+    @app.cli.command("flush-notification-digests")
+    def flush_notification_digests_command():
+        """Send every digest whose window has closed."""
+        click.echo(f"{notification_digest.flush_due()} digest email(s) sent")
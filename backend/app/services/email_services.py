@@ -1,26 +1,118 @@
 ﻿import os
+import threading
+import time
+from collections import deque
 import requests
 import json
 from datetime import datetime
 from flask import current_app
 from app.models import db, User, Task
+from app.services.throttle_store import build_throttle_store
+from app.services.email_templates import render_email, task_context, project_context
+
+class CircuitBreaker:
+    """Fail fast on the email webhook while it is down or slow.
+
+    CLOSED lets every call through. After `failure_threshold` consecutive
+    failures (errors, non-2xx responses, or calls slower than
+    `slow_call_threshold` seconds) the breaker OPENs and rejects calls
+    without touching the network. Once `reset_timeout` seconds have passed
+    a single HALF_OPEN probe is allowed; success closes the breaker, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=60, slow_call_threshold=5.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "slow_calls": 0,
+            "rejected": 0,
+            "opened": 0,
+        }
+
+    def allow_request(self):
+        """Return True if a call may go out now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def record_success(self, elapsed):
+        if elapsed > self.slow_call_threshold:
+            with self._lock:
+                self.counters["slow_calls"] += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self.counters["calls"] += 1
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.counters["opened"] += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                **self.counters,
+            }
 
 class EmailService:
     def __init__(self):
         self.power_automate_webhook_url = os.getenv('POWER_AUTOMATE_WEBHOOK_URL')
         self.enabled = bool(self.power_automate_webhook_url)
-        self.last_sent = {}
         self.cooldown = 300  # 5 minutes between emails for same task
+        self.throttle = build_throttle_store(self.cooldown)
+        self.timeout = float(os.getenv('EMAIL_WEBHOOK_TIMEOUT', 10))
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('EMAIL_BREAKER_FAILURES', 3)),
+            reset_timeout=float(os.getenv('EMAIL_BREAKER_RESET_SECONDS', 60)),
+            slow_call_threshold=float(os.getenv('EMAIL_BREAKER_SLOW_SECONDS', 5)),
+        )
+        # Payloads rejected while the breaker is open; replayed once it closes
+        self.suppressed = deque(maxlen=int(os.getenv('EMAIL_SUPPRESSED_BUFFER', 200)))
+        self.dropped = 0
+        self._replay_lock = threading.Lock()
+        self._replay_timer = None
     
     def can_send_email(self, task_id, recipient):
-        key = f"{task_id}_{recipient}"
-        now = datetime.now().timestamp()
-        if key in self.last_sent and now - self.last_sent[key] < self.cooldown:
-            return False
-        self.last_sent[key] = now
-        return True
+        return self.throttle.hit(f"{task_id}_{recipient}")
     
-    def send_notification_email(self, recipient_emails, subject, message, task_title, task_id, notification_type):
+    def send_notification_email(self, recipient_emails, subject, message, task_title, task_id, notification_type, throttle=True):
         """Send email notification via Power Automate webhook"""
         if not self.enabled or not recipient_emails:
             print(f"DEBUG: Email service disabled or no recipients. Enabled: {self.enabled}, Recipients: {recipient_emails}")
@@ -29,41 +121,105 @@ class EmailService:
         # Filter recipients to avoid spamming the same person
         filtered_recipients = []
         for recipient in (recipient_emails if isinstance(recipient_emails, list) else [recipient_emails]):
-            if self.can_send_email(task_id, recipient):
+            if not throttle or self.can_send_email(task_id, recipient):
                 filtered_recipients.append(recipient)
         
         if not filtered_recipients:
             print("DEBUG: All recipients are in cooldown period")
             return False
         
+        payload = {
+            "recipients": filtered_recipients,
+            "subject": subject,
+            "message": message,
+            "task_title": task_title,
+            "task_id": task_id,
+            "notification_type": notification_type,
+            "app_url": f"http://localhost:5173/tasks/{task_id}"
+        }
+        
+        print(f"DEBUG: Sending email to {filtered_recipients}")
+        print(f"DEBUG: Subject: {subject}")
+        
+        success = self._deliver(payload)
+        if success and self.suppressed:
+            self._schedule_replay()
+        return success
+
+    def _deliver(self, payload):
+        """POST one payload through the circuit breaker; buffer it if the breaker is open"""
+        if not self.breaker.allow_request():
+            self._suppress(payload)
+            print("DEBUG: Email circuit open, send suppressed")
+            return False
+        
+        started = time.monotonic()
         try:
-            payload = {
-                "recipients": filtered_recipients,
-                "subject": subject,
-                "message": message,
-                "task_title": task_title,
-                "task_id": task_id,
-                "notification_type": notification_type,
-                "app_url": f"http://localhost:5173/tasks/{task_id}"
-            }
-            
-            print(f"DEBUG: Sending email to {filtered_recipients}")
-            print(f"DEBUG: Subject: {subject}")
-            
             response = requests.post(
                 self.power_automate_webhook_url,
                 json=payload,
                 headers={'Content-Type': 'application/json'},
-                timeout=10
+                timeout=self.timeout
             )
-            
-            success = response.status_code in [200, 202]
-            print(f"DEBUG: Email sent successfully: {success}, Status: {response.status_code}")
-            return success
-            
         except Exception as e:
             print(f"DEBUG: Email notification failed: {e}")
+            self.breaker.record_failure()
+            self._suppress(payload)
             return False
+        
+        success = 200 <= response.status_code < 300
+        if success:
+            self.breaker.record_success(time.monotonic() - started)
+        else:
+            self.breaker.record_failure()
+            self._suppress(payload)
+        print(f"DEBUG: Email sent successfully: {success}, Status: {response.status_code}")
+        return success
+
+    def _suppress(self, payload):
+        if len(self.suppressed) == self.suppressed.maxlen:
+            self.dropped += 1
+        self.suppressed.append(payload)
+
+    def _schedule_replay(self):
+        """Replay the buffer on a background thread so the request that noticed recovery does not wait on it"""
+        with self._replay_lock:
+            if self._replay_timer is not None:
+                return
+            self._replay_timer = threading.Timer(0, self._on_replay_timer)
+            self._replay_timer.daemon = True
+            self._replay_timer.start()
+
+    def _on_replay_timer(self):
+        try:
+            self.replay_suppressed()
+        finally:
+            with self._replay_lock:
+                self._replay_timer = None
+
+    def replay_suppressed(self, limit=20):
+        """Resend buffered payloads while the breaker stays closed. Returns how many went out.
+
+        A payload that fails again goes back into the buffer and stops the replay.
+        """
+        sent = 0
+        while self.suppressed and sent < limit and self.breaker.state == CircuitBreaker.CLOSED:
+            try:
+                payload = self.suppressed.popleft()
+            except IndexError:
+                break
+            if not self._deliver(payload):
+                break
+            sent += 1
+        return sent
+
+    def get_stats(self):
+        return {
+            **self.breaker.stats(),
+            "suppressed": len(self.suppressed),
+            "dropped": self.dropped,
+            "throttle": self.throttle.stats(),
+        }
 
 # Global instance
 email_service = EmailService()
@@ -91,18 +247,15 @@ def send_comment_email_notification(comment, task, excluded_user_id):
         return
     
     subject = f"💬 New comment on task: {task.title}"
-    
-    message = f"""
-    <strong>New comment by {comment.user.email}:</strong>
-    <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 4px solid #2563eb; margin: 10px 0;">
-    {comment.content}
-    </div>
-    
-    <strong>Task Details:</strong><br>
-    • Task: {task.title}<br>
-    • Project: {task.project.name if task.project else 'No Project'}<br>
-    • Commented: {comment.created_at.strftime('%Y-%m-%d %H:%M')}
-    """
+    message = render_email(
+        "comment",
+        task=task_context(task),
+        comment={
+            "author_email": comment.user.email,
+            "content": comment.content,
+            "created_at": comment.created_at.strftime('%Y-%m-%d %H:%M'),
+        },
+    )
     
     email_service.send_notification_email(
         recipients,
@@ -120,38 +273,14 @@ def send_task_update_email_notification(task, updated_by, updated_fields, exclud
         print(f"DEBUG: No recipients for task update email. Task: {task.title}, Updated by: {updated_by.email}")
         return
     
-    # Format changes in a more readable way
-    changes_html = ""
-    for change in updated_fields:
-        field_name = change['field'].title()
-        old_val = change['old_value'] or 'Empty'
-        new_val = change['new_value'] or 'Empty'
-        
-        changes_html += f"""
-        <div class="field-change">
-            <strong>🔧 {field_name}:</strong><br>
-            <span style="color: #dc2626;">➤ From: {old_val}</span><br>
-            <span style="color: #16a34a;">➤ To: {new_val}</span>
-        </div>
-        """
-    
     subject = f"✏️ Task updated: {task.title}"
-    message = f"""
-    <strong>Task '{task.title}' has been updated by {updated_by.email}:</strong>
-    
-    {changes_html}
-    
-    <div class="task-info">
-        <p><strong>Current Task Details:</strong></p>
-        <p>• Due Date: {task.duedate.strftime('%Y-%m-%d') if task.duedate else 'Not set'}</p>
-        <p>• Status: {task.status.value}</p>
-        <p>• Priority: {task.priority}</p>
-        <p>• Project: {task.project.name if task.project else 'No Project'}</p>
-        <p>• Updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
-    </div>
-    
-    <em>These changes affect your schedule and responsibilities.</em>
-    """
+    message = render_email(
+        "task_update",
+        task=task_context(task),
+        changes=updated_fields,
+        updated_by=updated_by.email,
+        updated_at=datetime.now().strftime('%Y-%m-%d %H:%M'),
+    )
     
     success = email_service.send_notification_email(
         recipients,
@@ -163,7 +292,40 @@ def send_task_update_email_notification(task, updated_by, updated_fields, exclud
     )
     
     print(f"DEBUG: Task update email sent to {len(recipients)} recipients. Success: {success}")
-    print(f"DEBUG: Recipients: {recipients}")
+
+def send_task_update_digest_email(recipient, updates):
+    """Send one email summarising every task update buffered for a recipient.
+
+    `updates` is a list of (task, updated_by_email, updated_fields) tuples with
+    the fields already merged per task.
+    """
+    if not updates:
+        return False
+    
+    first_task = updates[0][0]
+    if len(updates) == 1:
+        subject = f"✏️ Task updated: {first_task.title}"
+    else:
+        subject = f"✏️ {len(updates)} tasks updated"
+    
+    message = render_email(
+        "task_update_digest",
+        updates=[
+            {"task": task_context(task), "updated_by": updated_by, "changes": fields}
+            for task, updated_by, fields in updates
+        ],
+    )
+    
+    # The digest window already limits how often a recipient hears from us
+    return email_service.send_notification_email(
+        [recipient],
+        subject,
+        message,
+        first_task.title,
+        first_task.id,
+        "task_updated",
+        throttle=False
+    )
 
 def send_due_date_reminder_email(task, days_until_due):
     """Send due date reminder emails"""
@@ -176,17 +338,13 @@ def send_due_date_reminder_email(task, days_until_due):
     icon = "⚠️" if days_until_due < 0 else "📅"
     
     subject = f"{icon} Task {status}: {task.title}"
-    message = f"""
-    <strong>{icon} Task '{task.title}' is {status} ({days_text})</strong>
-    
-    <strong>Task Details:</strong><br>
-    • Due Date: {task.duedate.strftime('%Y-%m-%d')}<br>
-    • Project: {task.project.name if task.project else 'No Project'}<br>
-    • Current Status: {task.status.value}<br>
-    • Priority: {task.priority}
-    
-    <em>Please take appropriate action to complete this task.</em>
-    """
+    message = render_email(
+        "due_date_reminder",
+        task=task_context(task),
+        status=status,
+        days_text=days_text,
+        icon=icon,
+    )
     
     email_service.send_notification_email(
         recipients,
@@ -197,87 +355,51 @@ def send_due_date_reminder_email(task, days_until_due):
         "due_date_reminder"
     )
 
-def send_task_assignment_email_notification(task, assigned_by, assignee):
-    """Send email when a user is assigned to a task (as owner or collaborator)"""
-    
-    # Don't send email if the assignee is the same as the person assigning
-    if assigned_by.id == assignee.id:
-        return
-    
-    role = "owner" if task.owner_id == assignee.id else "collaborator"
+def send_task_assignment_emails(task, assigned_by, assignees, context=None):
+    """Send assignment emails, rendering one body per role rather than per assignee"""
+    context = context or task_context(task)
+    by_role = {}
+    for assignee in assignees:
+        # Don't send email if the assignee is the same as the person assigning
+        if assignee.id == assigned_by.id:
+            continue
+        role = "owner" if task.owner_id == assignee.id else "collaborator"
+        by_role.setdefault(role, []).append(assignee.email)
     
     subject = f"📋 New task assignment: {task.title}"
-    
-    message = f"""
-    <strong>You have been assigned as {role} to a new task:</strong>
-    
-    <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 4px solid #2563eb; margin: 10px 0;">
-        <p><strong>Task:</strong> {task.title}</p>
-        <p><strong>Description:</strong> {task.description or 'No description provided'}</p>
-        <p><strong>Due Date:</strong> {task.duedate.strftime('%Y-%m-%d') if task.duedate else 'Not set'}</p>
-        <p><strong>Priority:</strong> {task.priority}</p>
-        <p><strong>Status:</strong> {task.status.value}</p>
-        <p><strong>Assigned by:</strong> {assigned_by.email}</p>
-        <p><strong>Project:</strong> {task.project.name if task.project else 'No Project'}</p>
-    </div>
-    
-    <strong>Collaborators:</strong>
-    <ul>
-        <li>{task.owner.email} (Owner)</li>
-        {"".join([f"<li>{collab.email}</li>" for collab in task.collaborators])}
-    </ul>
-    
-    <em>Please review the task and update your progress accordingly.</em>
-    """
-    
-    email_service.send_notification_email(
-        [assignee.email],
-        subject,
-        message,
-        task.title,
-        task.id,
-        "task_assignment"
-    )
+    for role, emails in by_role.items():
+        message = render_email(
+            "task_assignment",
+            task=context,
+            role=role,
+            actor_email=assigned_by.email,
+        )
+        email_service.send_notification_email(
+            emails,
+            subject,
+            message,
+            task.title,
+            task.id,
+            "task_assignment"
+        )
 
-def send_task_creation_email_notification(task, created_by):
+def send_task_assignment_email_notification(task, assigned_by, assignee):
+    """Send email when a user is assigned to a task (as owner or collaborator)"""
+    send_task_assignment_emails(task, assigned_by, [assignee])
+
+def send_task_creation_email_notification(task, created_by, context=None):
     """Send email to all involved users when a task is created"""
     recipients = get_notification_recipients(task, created_by.id)
-    
-    print(f"DEBUG: Task creation email - Task: {task.title}")
-    print(f"DEBUG: Created by: {created_by.email}")
-    print(f"DEBUG: Recipients: {recipients}")
-    print(f"DEBUG: Owner: {task.owner.email}")
-    print(f"DEBUG: Collaborators: {[c.email for c in task.collaborators]}")
-    
     if not recipients:
         print("DEBUG: No recipients found for email notification")
         return
     
     subject = f"🆕 New task created: {task.title}"
-    
-    collaborator_list = "".join([f"<li>{collab.email} (Collaborator)</li>" for collab in task.collaborators])
-    
-    message = f"""
-    <strong>A new task has been created:</strong>
-    
-    <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; border-left: 4px solid #2563eb; margin: 10px 0;">
-        <p><strong>Task:</strong> {task.title}</p>
-        <p><strong>Description:</strong> {task.description or 'No description provided'}</p>
-        <p><strong>Due Date:</strong> {task.duedate.strftime('%Y-%m-%d') if task.duedate else 'Not set'}</p>
-        <p><strong>Priority:</strong> {task.priority}</p>
-        <p><strong>Status:</strong> {task.status.value}</p>
-        <p><strong>Created by:</strong> {created_by.email}</p>
-        <p><strong>Project:</strong> {task.project.name if task.project else 'No Project'}</p>
-    </div>
-    
-    <strong>Team:</strong>
-    <ul>
-        <li>{task.owner.email} (Owner)</li>
-        {collaborator_list}
-    </ul>
-    
-    <em>This task has been added to your schedule.</em>
-    """
+    message = render_email(
+        "task_creation",
+        task=context or task_context(task),
+        actor_email=created_by.email,
+    )
     
     success = email_service.send_notification_email(
         recipients,
@@ -290,40 +412,53 @@ def send_task_creation_email_notification(task, created_by):
     
     print(f"DEBUG: Email sent successfully: {success}")
 
+IMPORT_EMAIL_MAX_TASKS = 50
+
+def send_task_import_email(recipient, imported_by, tasks):
+    """Send one email listing every imported task a recipient owns or collaborates on.
+
+    `tasks` is a list of plain dicts (title, duedate, priority, status,
+    project_name, role); only the first IMPORT_EMAIL_MAX_TASKS are listed.
+    """
+    if not tasks:
+        return False
+    
+    if len(tasks) == 1:
+        subject = f"🆕 New task created: {tasks[0]['title']}"
+    else:
+        subject = f"🆕 {len(tasks)} tasks imported"
+    
+    message = render_email(
+        "task_import",
+        tasks=tasks[:IMPORT_EMAIL_MAX_TASKS],
+        total=len(tasks),
+        actor_email=imported_by.email,
+    )
+    
+    # One email per recipient per import, so the per-task cooldown does not apply
+    return email_service.send_notification_email(
+        [recipient],
+        subject,
+        message,
+        tasks[0]["title"],
+        tasks[0]["id"],
+        "task_import",
+        throttle=False
+    )
+
 def send_project_creation_email_notification(project, created_by):
     """Send email when a project is created"""
     recipients = get_project_notification_recipients(project, created_by.id)
-    
-    print(f"DEBUG: Project creation - Project: {project.name}")
-    print(f"DEBUG: Created by: {created_by.email}")
-    print(f"DEBUG: Recipients: {recipients}")
-    
     if not recipients:
         print("DEBUG: No recipients found for project creation email")
         return
     
     subject = f"📁 New project created: {project.name}"
-    
-    message = f"""
-    <strong>A new project has been created:</strong>
-    
-    <div class="project-info">
-        <p><strong>Project:</strong> {project.name}</p>
-        <p><strong>Description:</strong> {project.description or 'No description provided'}</p>
-        <p><strong>Deadline:</strong> {project.deadline.strftime('%Y-%m-%d') if project.deadline else 'Not set'}</p>
-        <p><strong>Status:</strong> {project.status.value}</p>
-        <p><strong>Created by:</strong> {created_by.email}</p>
-        <p><strong>Owner:</strong> {project.owner.email}</p>
-    </div>
-    
-    <strong>Team Members:</strong>
-    <ul>
-        <li>{project.owner.email} (Owner)</li>
-        {"".join([f"<li>{collab.email} (Collaborator)</li>" for collab in project.collaborators])}
-    </ul>
-    
-    <em>This project has been added to your schedule.</em>
-    """
+    message = render_email(
+        "project_creation",
+        project=project_context(project),
+        actor_email=created_by.email,
+    )
     
     success = email_service.send_notification_email(
         recipients,
@@ -339,49 +474,22 @@ def send_project_creation_email_notification(project, created_by):
 def send_project_update_email_notification(project, updated_by, updated_fields):
     """Send email when a project is updated"""
     recipients = get_project_notification_recipients(project, updated_by.id)
-    
-    print(f"DEBUG: Project update - Project: {project.name}")
-    print(f"DEBUG: Updated by: {updated_by.email}")
-    print(f"DEBUG: Updated fields: {updated_fields}")
-    
     if not recipients:
         print("DEBUG: No recipients found for project update email")
         return
     
-    # Format changes
-    changes_html = ""
-    if updated_fields:
-        for field, (old_value, new_value) in updated_fields.items():
-            changes_html += f"""
-            <div class="field-change">
-            <strong>{field}:</strong><br>
-            📍 From: {old_value}<br>
-            📍 To: {new_value}
-            </div>
-            """
+    changes = [
+        {"field": field, "old_value": old_value, "new_value": new_value}
+        for field, (old_value, new_value) in (updated_fields or {}).items()
+    ]
     
     subject = f"✏️ Project updated: {project.name}"
-    
-    message = f"""
-    <strong>Project '{project.name}' has been updated by {updated_by.email}:</strong>
-    
-    {changes_html if changes_html else "<p>Project details have been modified.</p>"}
-    
-    <strong>Current Project Details:</strong>
-    <div class="project-info">
-        <p><strong>Project:</strong> {project.name}</p>
-        <p><strong>Description:</strong> {project.description or 'No description provided'}</p>
-        <p><strong>Deadline:</strong> {project.deadline.strftime('%Y-%m-%d') if project.deadline else 'Not set'}</p>
-        <p><strong>Status:</strong> {project.status.value}</p>
-        <p><strong>Owner:</strong> {project.owner.email}</p>
-    </div>
-    
-    <strong>Team Members:</strong>
-    <ul>
-        <li>{project.owner.email} (Owner)</li>
-        {"".join([f"<li>{collab.email} (Collaborator)</li>" for collab in project.collaborators])}
-    </ul>
-    """
+    message = render_email(
+        "project_update",
+        project=project_context(project),
+        changes=changes,
+        actor_email=updated_by.email,
+    )
     
     success = email_service.send_notification_email(
         recipients,
@@ -396,45 +504,29 @@ def send_project_update_email_notification(project, updated_by, updated_fields):
 
 def send_project_collaborator_added_email_notification(project, added_by, new_collaborators):
     """Send email when collaborators are added to a project"""
-    if not new_collaborators:
+    # Don't send email to the person who added them
+    recipients = [c.email for c in new_collaborators or [] if c.id != added_by.id]
+    if not recipients:
         return
     
-    for collaborator in new_collaborators:
-        # Don't send email to the person who added them
-        if collaborator.id == added_by.id:
-            continue
-            
-        print(f"DEBUG: Adding collaborator {collaborator.email} to project {project.name}")
-        
-        subject = f"👥 You've been added to project: {project.name}"
-        
-        message = f"""
-        <strong>You have been added as a collaborator to a project:</strong>
-        
-        <div class="project-info">
-            <p><strong>Project:</strong> {project.name}</p>
-            <p><strong>Description:</strong> {project.description or 'No description provided'}</p>
-            <p><strong>Deadline:</strong> {project.deadline.strftime('%Y-%m-%d') if project.deadline else 'Not set'}</p>
-            <p><strong>Status:</strong> {project.status.value}</p>
-            <p><strong>Owner:</strong> {project.owner.email}</p>
-            <p><strong>Added by:</strong> {added_by.email}</p>
-        </div>
-        
-        <strong>Your Role:</strong> Collaborator
-        
-        <em>You can now view and contribute to this project.</em>
-        """
-        
-        success = email_service.send_notification_email(
-            [collaborator.email],
-            subject,
-            message,
-            project.name,
-            project.id,
-            "project_collaborator_added"
-        )
-        
-        print(f"DEBUG: Project collaborator email sent to {collaborator.email}: {success}")
+    subject = f"👥 You've been added to project: {project.name}"
+    message = render_email(
+        "project_collaborator_added",
+        project=project_context(project),
+        actor_label="Added by",
+        actor_email=added_by.email,
+    )
+    
+    success = email_service.send_notification_email(
+        recipients,
+        subject,
+        message,
+        project.name,
+        project.id,
+        "project_collaborator_added"
+    )
+    
+    print(f"DEBUG: Project collaborator email sent to {recipients}: {success}")
 
 def get_project_notification_recipients(project, excluded_user_id):
     """Get email recipients for project notifications, excluding the user who triggered the event"""
@@ -0,0 +1,56 @@
+import os
+from jinja2 import Environment, FileSystemLoader
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Templates never change while the app runs, so compile them once at import
+# and skip Jinja's per-render freshness checks.
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_templates = {name: _env.get_template(name) for name in _env.list_templates(extensions=["html"])}
+
+def render_email(name, **context):
+    """Render a compiled email template (e.g. "task_creation") with autoescaping."""
+    return _templates[f"{name}.html"].render(**context)
+
+def _format_date(value):
+    return value.strftime('%Y-%m-%d') if value else None
+
+def task_context(task):
+    """Snapshot everything the task templates need in one pass.
+
+    Relationships are walked here once per event, not once per recipient or
+    per template expression.
+    """
+    project = task.project
+    owner = task.owner
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "duedate": _format_date(task.duedate),
+        "priority": task.priority,
+        "status": task.status.value if task.status else None,
+        "project_name": project.name if project else "No Project",
+        "owner_email": owner.email if owner else None,
+        "collaborator_emails": [c.email for c in task.collaborators],
+    }
+
+def project_context(project):
+    """Snapshot everything the project templates need in one pass."""
+    owner = project.owner
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "deadline": _format_date(project.deadline),
+        "status": project.status.value if project.status else None,
+        "owner_email": owner.email if owner else None,
+        "collaborator_emails": [c.email for c in project.collaborators],
+    }
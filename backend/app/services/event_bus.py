@@ -0,0 +1,191 @@
+import os
+import queue
+import threading
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models import db
+
+# --- Domain events ---------------------------------------------------------
+# Events carry ids and plain values only, so handlers can run after the
+# request's session is gone (e.g. on the queue worker).
+
+@dataclass(frozen=True)
+class TaskCreated:
+    task_id: int
+    actor_id: int
+    assignee_ids: tuple = ()
+
+@dataclass(frozen=True)
+class TaskUpdated:
+    task_id: int
+    actor_id: int
+    updated_fields: tuple = ()
+
+@dataclass(frozen=True)
+class TaskAssigned:
+    task_id: int
+    actor_id: int
+    assignee_ids: tuple = ()
+
+@dataclass(frozen=True)
+class TasksUpdated:
+    actor_id: int
+    updates: tuple = ()  # (task_id, updated_fields) pairs
+
+@dataclass(frozen=True)
+class TasksImported:
+    actor_id: int
+    task_ids: tuple = ()
+
+@dataclass(frozen=True)
+class DueDateReminderDue:
+    task_id: int
+    days_until_due: int
+
+@dataclass(frozen=True)
+class CommentAdded:
+    comment_id: int
+    actor_id: int
+
+@dataclass(frozen=True)
+class ProjectCreated:
+    project_id: int
+    actor_id: int
+
+@dataclass(frozen=True)
+class ProjectUpdated:
+    project_id: int
+    actor_id: int
+    changes: dict = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class CollaboratorAdded:
+    project_id: int
+    actor_id: int
+    user_ids: tuple = ()
+
+# --- Handler registry ------------------------------------------------------
+
+_handlers = {}
+
+def subscribe(event_type):
+    """Register the decorated function to run after commit for `event_type`."""
+    def decorator(fn):
+        _handlers.setdefault(event_type, []).append(fn)
+        return fn
+    return decorator
+
+def publish(evt):
+    """Record a domain event; it is dispatched only if the current transaction commits."""
+    db.session.info.setdefault("pending_events", []).append(evt)
+
+# --- Unit of work ----------------------------------------------------------
+
+def in_unit_of_work():
+    return db.session.info.get("uow_depth", 0) > 0
+
+@contextmanager
+def unit_of_work():
+    """Run a block as one transaction and dispatch its events after the commit.
+
+    Nested blocks join the outermost one. Helpers that would normally commit
+    call `commit()` instead, which only flushes while a unit of work is open.
+    """
+    info = db.session.info
+    depth = info.get("uow_depth", 0)
+    info["uow_depth"] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            info.pop("pending_events", None)
+            db.session.rollback()
+        raise
+    finally:
+        info["uow_depth"] = depth
+
+    if depth == 0:
+        dispatch_committed()
+
+def commit():
+    """Commit now, or only flush when called inside `unit_of_work()`."""
+    if in_unit_of_work():
+        db.session.flush()
+        return
+    db.session.commit()
+    dispatch_committed()
+
+@event.listens_for(Session, "after_commit")
+def _promote_events(session):
+    pending = session.info.pop("pending_events", None)
+    if pending:
+        session.info.setdefault("committed_events", []).extend(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_events(session, previous_transaction):
+    # Rolling back a savepoint leaves the outer transaction (and its events) alive
+    if not previous_transaction.nested:
+        session.info.pop("pending_events", None)
+
+# --- Dispatch --------------------------------------------------------------
+
+DISPATCH_MODE = os.getenv("EVENT_DISPATCH_MODE", "sync").lower()
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+def dispatch_committed():
+    """Hand committed events to their handlers, inline or via the queue worker."""
+    events = db.session.info.pop("committed_events", None)
+    if not events:
+        return
+    if DISPATCH_MODE == "queue":
+        app = current_app._get_current_object()
+        _ensure_worker()
+        for evt in events:
+            _queue.put((app, evt))
+        return
+    for evt in events:
+        _run_handlers(evt)
+
+def _run_handlers(evt):
+    for handler in _handlers.get(type(evt), []):
+        try:
+            handler(evt)
+        except Exception as e:
+            # A failed side effect must not fail the request that already committed
+            print(f"DEBUG: Handler {handler.__name__} failed for {evt}: {e}")
+            traceback.print_exc()
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name="event-dispatch", daemon=True)
+            _worker.start()
+
+def _work():
+    while True:
+        app, evt = _queue.get()
+        try:
+            with app.app_context():
+                try:
+                    _run_handlers(evt)
+                finally:
+                    db.session.remove()
+        finally:
+            _queue.task_done()
+
+def init_app(app):
+    """Dispatch events from plain `db.session.commit()` calls before the response goes out."""
+    @app.after_request
+    def _dispatch_after_request(response):
+        dispatch_committed()
+        return response
@@ -0,0 +1,108 @@
+from app.models import db, Comment, Project, Task, User
+from app.services.event_bus import (
+    subscribe,
+    TaskCreated,
+    TaskUpdated,
+    TaskAssigned,
+    TasksImported,
+    TasksUpdated,
+    DueDateReminderDue,
+    CommentAdded,
+    ProjectCreated,
+    ProjectUpdated,
+    CollaboratorAdded,
+)
+from app.services.digest_services import notification_digest
+from app.services.email_services import (
+    send_comment_email_notification,
+    send_due_date_reminder_email,
+    send_task_assignment_emails,
+    send_task_creation_email_notification,
+    send_task_import_email,
+    send_project_creation_email_notification,
+    send_project_update_email_notification,
+    send_project_collaborator_added_email_notification,
+)
+from app.services.email_templates import task_context
+from app.services.task_import_services import imported_tasks_by_recipient
+
+def _users(ids):
+    if not ids:
+        return []
+    return User.query.filter(User.id.in_(ids)).all()
+
+@subscribe(TaskCreated)
+def email_task_created(evt):
+    task = db.session.get(Task, evt.task_id)
+    actor = db.session.get(User, evt.actor_id)
+    if not task or not actor:
+        return
+    context = task_context(task)
+    send_task_creation_email_notification(task, actor, context)
+    send_task_assignment_emails(task, actor, _users(evt.assignee_ids), context)
+
+@subscribe(TaskAssigned)
+def email_task_assigned(evt):
+    task = db.session.get(Task, evt.task_id)
+    actor = db.session.get(User, evt.actor_id)
+    if task and actor:
+        send_task_assignment_emails(task, actor, _users(evt.assignee_ids))
+
+@subscribe(TasksImported)
+def email_tasks_imported(evt):
+    actor = db.session.get(User, evt.actor_id)
+    if not actor:
+        return
+    for recipient, tasks in imported_tasks_by_recipient(evt.task_ids, exclude_user_id=actor.id).items():
+        send_task_import_email(recipient, actor, tasks)
+
+@subscribe(TaskUpdated)
+def digest_task_updated(evt):
+    task = db.session.get(Task, evt.task_id)
+    actor = db.session.get(User, evt.actor_id)
+    if task and actor:
+        notification_digest.add_task_update(task, actor, list(evt.updated_fields))
+
+@subscribe(TasksUpdated)
+def digest_tasks_updated(evt):
+    actor = db.session.get(User, evt.actor_id)
+    if not actor:
+        return
+    tasks = {t.id: t for t in Task.query.filter(Task.id.in_([task_id for task_id, _ in evt.updates])).all()}
+    notification_digest.add_task_updates(
+        [(tasks[task_id], list(fields)) for task_id, fields in evt.updates if task_id in tasks],
+        actor,
+    )
+
+@subscribe(DueDateReminderDue)
+def email_due_date_reminder(evt):
+    task = db.session.get(Task, evt.task_id)
+    if task:
+        send_due_date_reminder_email(task, evt.days_until_due)
+
+@subscribe(CommentAdded)
+def email_comment_added(evt):
+    comment = db.session.get(Comment, evt.comment_id)
+    if comment and comment.task:
+        send_comment_email_notification(comment, comment.task, evt.actor_id)
+
+@subscribe(ProjectCreated)
+def email_project_created(evt):
+    project = db.session.get(Project, evt.project_id)
+    actor = db.session.get(User, evt.actor_id)
+    if project and actor:
+        send_project_creation_email_notification(project, actor)
+
+@subscribe(ProjectUpdated)
+def email_project_updated(evt):
+    project = db.session.get(Project, evt.project_id)
+    actor = db.session.get(User, evt.actor_id)
+    if project and actor and evt.changes:
+        send_project_update_email_notification(project, actor, evt.changes)
+
+@subscribe(CollaboratorAdded)
+def email_project_collaborators_added(evt):
+    project = db.session.get(Project, evt.project_id)
+    actor = db.session.get(User, evt.actor_id)
+    if project and actor:
+        send_project_collaborator_added_email_notification(project, actor, _users(evt.user_ids))
@@ -0,0 +1,102 @@
+import re
+from flask import current_app, jsonify, request
+from werkzeug.http import unquote_etag
+
+class PreconditionFailed(Exception):
+    """The version a client edited is no longer the current one (HTTP 412)."""
+
+    def __init__(self, message, current_version=None):
+        super().__init__(message)
+        self.current_version = current_version
+
+def etag(kind, resource_id, version, project_version=None):
+    """Strong ETag for one version of a task or project, e.g. "task-12-v3-p5".
+
+    A task's representation embeds its project's name, so the project's
+    version is part of the tag. Strong, so clients can send it straight back
+    in If-Match: the row version moves with every field a client can edit.
+    """
+    tag = f"{kind}-{resource_id}-v{version}"
+    if project_version is not None:
+        tag += f"-p{project_version}"
+    return f'"{tag}"'
+
+def entity_etag(kind, instance):
+    project = getattr(instance, "project", None)
+    return etag(kind, instance.id, instance.version, getattr(project, "version", None))
+
+def aggregate_etag(name, *values):
+    """Weak ETag for a list, from aggregates that change whenever any member does."""
+    return 'W/"' + "-".join([name] + [str(v if v is not None else 0) for v in values]) + '"'
+
+def revalidate(response, tag):
+    """Attach `tag` and let clients keep the body as long as they revalidate it."""
+    resp = response[0] if isinstance(response, tuple) else response
+    resp.headers["ETag"] = tag
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def with_etag(response, kind, instance):
+    """Attach the ETag of `instance` to a (response, status) pair or response.
+
+    Objects without a version (nothing to compare against) get no ETag.
+    """
+    if getattr(instance, "version", None) is None:
+        return response
+    return revalidate(response, entity_etag(kind, instance))
+
+def is_fresh(tag):
+    """True if the request's If-None-Match already names `tag` (weak comparison)."""
+    if not tag:
+        return False
+    opaque, _ = unquote_etag(tag)
+    return request.if_none_match.contains_weak(opaque)
+
+def not_modified(tag):
+    """Empty 304 response for a client whose copy is still current."""
+    return revalidate(current_app.response_class(status=304), tag)
+
+def if_match_version(kind, resource_id, fallback=None):
+    """The row version a conditional request was made against, or None if unconditional.
+
+    Reads the If-Match header, falling back to a plain `version` value (for
+    multipart forms that cannot set headers). "*" matches any version. If-Match
+    uses strong comparison, so weak tags never match; the tags this server
+    sends for single tasks and projects are strong. A header naming only
+    other resources (or only weak tags) can never match, so it fails right away.
+    """
+    header = request.headers.get("If-Match")
+    if not header:
+        if fallback in (None, ""):
+            return None
+        try:
+            return int(fallback)
+        except (TypeError, ValueError):
+            raise PreconditionFailed(f"Invalid version: {fallback}")
+    if header.strip() == "*":
+        return None
+
+    pattern = re.compile(rf'^"{re.escape(kind)}-{resource_id}-v(\d+)(?:-p\d+)?"$')
+    tags = [tag.strip() for tag in header.split(",")]
+    for tag in tags:
+        match = pattern.match(tag)
+        if match:
+            return int(match.group(1))
+    if any(tag.startswith("W/") for tag in tags):
+        raise PreconditionFailed("If-Match needs a strong ETag")
+    raise PreconditionFailed(f"If-Match does not match this {kind}")
+
+def check_version(instance, expected_version, kind):
+    """Raise PreconditionFailed unless `instance` is still at `expected_version`."""
+    if expected_version is not None and instance.version != expected_version:
+        raise PreconditionFailed(
+            f"The {kind} was changed by someone else (now at version {instance.version})",
+            current_version=instance.version,
+        )
+
+def precondition_failed(error, kind, resource_id):
+    """412 response telling the client which version it has to reload."""
+    response = jsonify({"success": False, "error": str(error), "current_version": error.current_version})
+    if error.current_version is not None:
+        response.headers["ETag"] = etag(kind, resource_id, error.current_version)
+    return response, 412
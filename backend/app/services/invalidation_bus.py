@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+from app.models import db, CacheInvalidation
+
+BUS_ENABLED = os.getenv("INVALIDATION_BUS_ENABLED", "true").lower() in ("1", "true", "yes")
+POLL_INTERVAL = float(os.getenv("INVALIDATION_POLL_INTERVAL", 1.0))
+LOOKBACK_IDS = int(os.getenv("INVALIDATION_LOOKBACK_IDS", 100))
+RETENTION_SECONDS = int(os.getenv("INVALIDATION_RETENTION_SECONDS", 600))
+SWEEP_EVERY = 100
+
+logger = logging.getLogger(__name__)
+
+class InvalidationBus:
+    """Tells every worker which tables were written, whichever worker committed.
+
+    Each commit appends one row per written table to the cache_invalidations
+    change log, inside the same transaction, so a committed write is always
+    logged. Workers poll the log with an id cursor and hand subscribers the
+    set of tables seen since their last poll, so a burst of writes to one
+    table costs a single invalidation. The poll re-reads the last
+    `lookback` ids, because sequence ids can commit out of order; ids
+    already delivered are skipped, and the cursor only advances once
+    subscribers have run, which makes delivery at-least-once.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL, lookback=LOOKBACK_IDS, clock=time.monotonic):
+        self.poll_interval = poll_interval
+        self.lookback = lookback
+        self.clock = clock
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._cursor = None
+        self._seen = set()
+        self._last_poll = None
+        self._polls = 0
+        self.counters = {"polls": 0, "events": 0, "deliveries": 0, "coalesced": 0, "errors": 0}
+
+    def subscribe(self, fn):
+        """Call `fn(tables)` with each set of written table names."""
+        self._subscribers.append(fn)
+        return fn
+
+    def deliver(self, tables):
+        tables = set(tables)
+        if not tables:
+            return
+        for fn in self._subscribers:
+            fn(tables)
+        self.counters["deliveries"] += 1
+
+    # --- Publishing ---------------------------------------------------------
+
+    def publish(self, connection, tables):
+        """Log `tables` on the transaction's connection; returns the new row ids."""
+        result = connection.execute(
+            insert(CacheInvalidation).returning(CacheInvalidation.id),
+            [{"table_name": table} for table in sorted(tables)],
+        )
+        return list(result.scalars())
+
+    def mark_seen(self, ids):
+        with self._lock:
+            self._seen.update(ids)
+
+    # --- Polling ------------------------------------------------------------
+
+    def poll_if_due(self):
+        """Poll unless another thread is polling or the last poll was under `poll_interval` ago."""
+        if not BUS_ENABLED:
+            return
+        now = self.clock()
+        if self._last_poll is not None and now - self._last_poll < self.poll_interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_poll = now
+            self._poll()
+        except Exception as e:
+            # A stale cache for one more interval beats failing the request
+            logger.exception("Invalidation poll failed: %s", e)
+            self.counters["errors"] += 1
+        finally:
+            self._lock.release()
+
+    def poll(self):
+        with self._lock:
+            self._poll()
+
+    def _poll(self):
+        with db.engine.connect() as conn:
+            if self._cursor is None:
+                # A fresh worker has nothing cached yet, so history is irrelevant
+                self._cursor = conn.execute(select(func.max(CacheInvalidation.id))).scalar() or 0
+                self._seen.update(conn.execute(
+                    select(CacheInvalidation.id).where(CacheInvalidation.id > self._cursor - self.lookback)
+                ).scalars())
+                return
+            rows = conn.execute(
+                select(CacheInvalidation.id, CacheInvalidation.table_name)
+                .where(CacheInvalidation.id > self._cursor - self.lookback)
+                .order_by(CacheInvalidation.id)
+            ).all()
+
+            self.counters["polls"] += 1
+            new = [(row_id, table) for row_id, table in rows if row_id not in self._seen]
+            if new:
+                tables = {table for _, table in new}
+                self.deliver(tables)
+                self.counters["events"] += len(new)
+                self.counters["coalesced"] += len(new) - len(tables)
+                self._seen.update(row_id for row_id, _ in new)
+                self._cursor = max(self._cursor, new[-1][0])
+            self._seen = {row_id for row_id in self._seen if row_id > self._cursor - self.lookback}
+
+            self._polls += 1
+            if self._polls % SWEEP_EVERY == 0:
+                self.sweep(conn)
+
+    def sweep(self, conn):
+        """Delete log rows every worker has long since read."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=RETENTION_SECONDS)
+        with conn.begin():
+            conn.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+
+    def stats(self):
+        return {"cursor": self._cursor, **self.counters}
+
+invalidation_bus = InvalidationBus()
+
+# --- Commit hooks ----------------------------------------------------------
+# Tables are collected as the transaction flushes or runs bulk statements,
+# logged just before it commits and delivered locally right after. Nothing
+# is delivered before the commit, which would let another request cache
+# pre-commit data under the new version.
+
+def _written_tables(session):
+    return session.info.setdefault("written_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    tables = _written_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        tables.update(table.name for table in state.mapper.tables)
+        # Many-to-many collections write to their association table
+        for rel in state.mapper.relationships:
+            if rel.secondary is not None and state.attrs[rel.key].history.has_changes():
+                tables.add(rel.secondary.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = orm_execute_state.statement.table
+        _written_tables(orm_execute_state.session).add(getattr(table, "name", None) or table.__tablename__)
+
+@event.listens_for(Session, "before_commit")
+def _log_written_tables(session):
+    if not BUS_ENABLED:
+        return
+    # Flush first so the final flush's tables are logged too
+    session.flush()
+    tables = session.info.get("written_tables")
+    if tables:
+        session.info["published_ids"] = invalidation_bus.publish(session.connection(), tables)
+
+@event.listens_for(Session, "after_commit")
+def _deliver_committed_tables(session):
+    invalidation_bus.mark_seen(session.info.pop("published_ids", ()))
+    invalidation_bus.deliver(session.info.pop("written_tables", ()))
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_tables(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("written_tables", None)
+        session.info.pop("published_ids", None)
+
+def init_app(app):
+    """Start polling from the current end of the change log."""
+    invalidation_bus.reset()
@@ -1,6 +1,6 @@
 from datetime import date, datetime, timedelta
+from sqlalchemy import insert
 from app.models import db, Notification, Task, TaskStatus, User, NotificationType
-from sqlalchemy.orm.attributes import get_history
 from app.services.email_services import (
     email_service,
     get_notification_recipients,
@@ -10,8 +10,54 @@ from app.services.email_services import (
     send_task_assignment_email_notification,
     send_task_creation_email_notification
 )
+from app.services.digest_services import (
+    collapse_task_update_notifications,
+    find_collapsible_updates,
+    fold_task_update,
+)
+from app.services.event_bus import commit, publish, CommentAdded, DueDateReminderDue
 
 TRIGGER_DAYS = [7, 3, 1]
+REMINDER_BATCH_SIZE = 1000
+
+def reminder_triggers(duedate, today=None):
+    """The TRIGGER_DAYS whose reminder date has not passed yet for a task due on `duedate`."""
+    remaining_days = (duedate - (today or date.today())).days
+    return [days for days in TRIGGER_DAYS if days <= remaining_days]
+
+def bulk_create_due_date_reminders(tasks):
+    """Insert due date reminders for freshly inserted tasks in batched statements.
+
+    `tasks` holds dicts with id, title, duedate, status, project_name and
+    user_ids. The tasks are new, so unlike create_notifications_for_task
+    there are no existing reminders to check for. Returns the row count.
+    """
+    today = date.today()
+    rows = []
+    for task in tasks:
+        if task["status"] == TaskStatus.COMPLETED:
+            continue
+        triggers = reminder_triggers(task["duedate"], today)
+        if not triggers:
+            continue
+        payload = {
+            "project_name": task["project_name"] or "No Project",
+            "task_title": task["title"],
+            "duedate": task["duedate"].isoformat(),
+            "days_until_due": (task["duedate"] - today).days,
+        }
+        for user_id in task["user_ids"]:
+            for days_before in triggers:
+                rows.append({
+                    "user_id": user_id,
+                    "task_id": task["id"],
+                    "trigger_days_before": days_before,
+                    "payload": payload,
+                    "type": NotificationType.DUE_DATE_REMINDER,
+                })
+    for start in range(0, len(rows), REMINDER_BATCH_SIZE):
+        db.session.execute(insert(Notification.__table__), rows[start:start + REMINDER_BATCH_SIZE])
+    return len(rows)
 
 def create_notifications_for_task(task: Task):
     if not task or not task.duedate:
@@ -22,15 +68,7 @@ def create_notifications_for_task(task: Task):
 
     today = date.today()
     remaining_days = (task.duedate - today).days
-    
-    if remaining_days >= 7:
-        valid_triggers = [7, 3, 1]
-    elif remaining_days >= 3:
-        valid_triggers = [3, 1]
-    elif remaining_days >= 1:
-        valid_triggers = [1]
-    else:
-        valid_triggers = []
+    valid_triggers = reminder_triggers(task.duedate, today)
 
     users_to_notify = {task.owner} | set(task.collaborators or [])
 
@@ -65,10 +103,10 @@ def create_notifications_for_task(task: Task):
                 )
                 db.session.add(notif)
     
-    db.session.commit()
-
     if remaining_days <= 3:  # Only send emails for tasks due in 3 days or less/overdue
-        send_due_date_reminder_email(task, remaining_days)
+        publish(DueDateReminderDue(task.id, remaining_days))
+
+    commit()
 
 def create_comment_notification(comment):
     task = comment.task
@@ -97,8 +135,8 @@ def create_comment_notification(comment):
         )
         db.session.add(notif)
     
-    db.session.commit()
-    send_comment_email_notification(comment, task, comment.user_id)
+    publish(CommentAdded(comment.id, comment.user_id))
+    commit()
 
 
 def create_task_update_notification(task: Task, updated_by: User, updated_fields: list):
@@ -118,6 +156,9 @@ def create_task_update_notification(task: Task, updated_by: User, updated_fields
         "updated_by": updated_by.email
     }
 
+    # Merge into unread update rows from the same burst instead of adding more
+    users_to_notify = collapse_task_update_notifications(task, updated_fields, users_to_notify, payload)
+
     for user in users_to_notify:
         notif = Notification(
             user_id=user.id,
@@ -128,9 +169,46 @@ def create_task_update_notification(task: Task, updated_by: User, updated_fields
         db.session.add(notif)
         print(f"DEBUG: Added in-app notification for user: {user.email}")
     
-    db.session.commit()
+    commit()
     print(f"DEBUG: Committed {len(users_to_notify)} in-app notifications")
 
+def create_task_update_notifications_bulk(updates, updated_by: User):
+    """In-app update notifications for many tasks at once.
+
+    `updates` is a list of (task, updated_fields). Unread rows to fold into
+    are found with one query and the remaining rows are inserted together.
+    """
+    wanted = {}
+    for task, updated_fields in updates:
+        payload = {
+            "project_name": task.project.name if task.project else "No Project",
+            "task_title": task.title,
+            "updated_fields": updated_fields,
+            "updated_by": updated_by.email
+        }
+        for user in {task.owner} | set(task.collaborators or []):
+            if user.id != updated_by.id:
+                wanted[(task.id, user.id)] = (updated_fields, payload)
+
+    collapsible = find_collapsible_updates(
+        {task_id for task_id, _ in wanted},
+        {user_id for _, user_id in wanted},
+    )
+    rows = []
+    for (task_id, user_id), (updated_fields, payload) in wanted.items():
+        if (task_id, user_id) in collapsible:
+            fold_task_update(collapsible[(task_id, user_id)], updated_fields, payload)
+            continue
+        rows.append({
+            "user_id": user_id,
+            "task_id": task_id,
+            "payload": payload,
+            "type": NotificationType.TASK_UPDATED,
+        })
+    if rows:
+        db.session.execute(insert(Notification.__table__), rows)
+    commit()
+
 def create_task_assignment_notification(task: Task, assigned_by: User, assignee: User):
     """Create notification when task is assigned to someone"""
     if task.owner_id == assignee.id:
@@ -151,95 +229,14 @@ def create_task_assignment_notification(task: Task, assigned_by: User, assignee:
     )
     db.session.add(notif)
     
-    db.session.commit()
-
-def send_task_assignment_email_notification(task, assigned_by, assignee):
-    """Send email when a user is assigned to a task (as owner or collaborator)"""
-    
-    # Don't send email if the assignee is the same as the person assigning
-    if assigned_by.id == assignee.id:
-        return
-    
-    role = "owner" if task.owner_id == assignee.id else "collaborator"
-    
-    subject = f"📋 New task assignment: {task.title}"
-    
-    message = f"""
-    <strong>You have been assigned as {role} to a new task:</strong>
-    
-    <div class="task-info">
-        <p><strong>Task:</strong> {task.title}</p>
-        <p><strong>Description:</strong> {task.description or 'No description provided'}</p>
-        <p><strong>Due Date:</strong> {task.duedate.strftime('%Y-%m-%d') if task.duedate else 'Not set'}</p>
-        <p><strong>Priority:</strong> {task.priority}</p>
-        <p><strong>Status:</strong> {task.status.value}</p>
-        <p><strong>Assigned by:</strong> {assigned_by.email}</p>
-        <p><strong>Project:</strong> {task.project.name if task.project else 'No Project'}</p>
-    </div>
-    
-    <strong>Collaborators:</strong>
-    <ul>
-        <li>{task.owner.email} (Owner)</li>
-        {"".join([f"<li>{collab.email}</li>" for collab in task.collaborators])}
-    </ul>
-    
-    <em>Please review the task and update your progress accordingly.</em>
-    """
-    
-    email_service.send_notification_email(
-        [assignee.email],
-        subject,
-        message,
-        task.title,
-        task.id,
-        "task_assignment"
-    )
-
-def send_task_creation_email_notification(task, created_by):
-    """Send email to all involved users when a task is created"""
-    recipients = get_notification_recipients(task, created_by.id)
-    if not recipients:
-        return
-    
-    subject = f"🆕 New task created: {task.title}"
-    
-    message = f"""
-    <strong>A new task has been created:</strong>
-    
-    <div class="task-info">
-        <p><strong>Task:</strong> {task.title}</p>
-        <p><strong>Description:</strong> {task.description or 'No description provided'}</p>
-        <p><strong>Due Date:</strong> {task.duedate.strftime('%Y-%m-%d') if task.duedate else 'Not set'}</p>
-        <p><strong>Priority:</strong> {task.priority}</p>
-        <p><strong>Status:</strong> {task.status.value}</p>
-        <p><strong>Created by:</strong> {created_by.email}</p>
-        <p><strong>Project:</strong> {task.project.name if task.project else 'No Project'}</p>
-    </div>
-    
-    <strong>Team:</strong>
-    <ul>
-        <li>{task.owner.email} (Owner)</li>
-        {"".join([f"<li>{collab.email} (Collaborator)</li>" for collab in task.collaborators])}
-    </ul>
-    
-    <em>This task has been added to your schedule.</em>
-    """
-    
-    email_service.send_notification_email(
-        recipients,
-        subject,
-        message,
-        task.title,
-        task.id,
-        "task_creation"
-    )
+    commit()
 
 def remove_notifications_for_task(task: Task):
-    """Deletes all notifications for a given task."""
+    """Deletes the due date reminders of a task; update and assignment notifications stay."""
     if not task:
         return
-    Notification.query.filter_by(task_id=task.id).delete()
-    db.session.commit()
+    Notification.query.filter_by(task_id=task.id, type=NotificationType.DUE_DATE_REMINDER).delete()
+    commit()
 
 def update_notifications_for_task(task: Task):
     """Recreates notifications when task due date changes with debugging"""
@@ -249,11 +246,11 @@ def update_notifications_for_task(task: Task):
     print(f"DEBUG: Updating notifications for task: {task.title}")
     print(f"DEBUG: Current due date: {task.duedate}")
     
-    # Remove old notifications
-    deleted_count = Notification.query.filter_by(task_id=task.id).delete()
+    # Remove old reminders; the update notification for this change stays
+    deleted_count = Notification.query.filter_by(task_id=task.id, type=NotificationType.DUE_DATE_REMINDER).delete()
     print(f"DEBUG: Deleted {deleted_count} old notifications")
     
-    db.session.commit()
+    commit()
 
     # Create new notifications
     create_notifications_for_task(task)
@@ -273,7 +270,7 @@ def mark_notification_as_read(notification_id: int):
     notif = Notification.query.get(notification_id)
     if notif:
         notif.is_read = True
-        db.session.commit()
+        commit()
     return notif
 
 def mark_all_notifications_as_read(user_id: int):
@@ -281,7 +278,7 @@ def mark_all_notifications_as_read(user_id: int):
     Notification.query.filter_by(user_id=user_id, is_read=False).update(
         {"is_read": True}
     )
-    db.session.commit()
+    commit()
 
 def create_notification_payload(notification_type: NotificationType, **kwargs):
     """Standardized payload creation for all notification types"""
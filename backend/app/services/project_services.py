@@ -1,20 +1,34 @@
 import json
 # --- Imports are correct ---
-from app.models import db, Project, Attachment, User, ProjectStatus, Task, TaskStatus
+from app.models import db, Project, ProjectTaskStats, Attachment, User, ProjectStatus, Task, TaskStatus
 from app.services.user_services import get_user_by_email
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func 
-from datetime import datetime
-from app.services.email_services import (
-    send_project_creation_email_notification,
-    send_project_update_email_notification,
-    send_project_collaborator_added_email_notification
-)
+from sqlalchemy.orm.exc import StaleDataError
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import func, select
+from datetime import date, datetime
+from app.services.event_bus import commit, publish, ProjectCreated, ProjectUpdated, CollaboratorAdded
+from app.services.change_tracking import apply_changes, touch, PROJECT_FIELDS
+from app.services.http_cache import PreconditionFailed, aggregate_etag, check_version, etag
+from app.services.collaborator_services import resolve_users_by_email, sync_collaborators
+from app.services.report_services import get_project_report
+from app.services.response_cache import cached_query
+from app.services.user_resolver import get_resolver
+
+def _get_current_user():
+    """The user behind the current JWT, or None when called outside a request"""
+    try:
+        current_user_id = get_jwt_identity()
+    except RuntimeError:
+        return None
+    return get_resolver().get(current_user_id) if current_user_id else None
 
 # ... (all other functions: create_project, get_all_projects, etc. stay the same) ...
 def create_project(name, description, deadline, status, owner_email, collaborator_emails, attachments, notes):
     try:
-        owner = get_user_by_email(owner_email)
+        # Owner and collaborators resolve together in one query
+        resolver = get_resolver().want(emails=collaborator_emails or [])
+        owner = resolver.by_email(owner_email)
         if not owner:
             raise ValueError(f"Owner with email {owner_email} not found")
         
@@ -24,10 +38,8 @@ def create_project(name, description, deadline, status, owner_email, collaborato
             if isinstance(collaborator_emails, list) and len(collaborator_emails) == 1 and collaborator_emails[0] == '[]':
                 collaborator_emails = []
 
-            for email in collaborator_emails:
-                user = get_user_by_email(email)
-                if user:
-                    collaborators.append(user)
+            users_by_email = resolve_users_by_email(collaborator_emails)
+            collaborators = [users_by_email[e] for e in dict.fromkeys(collaborator_emails) if e in users_by_email]
 
         project = Project(
             name=name,
@@ -45,17 +57,16 @@ def create_project(name, description, deadline, status, owner_email, collaborato
                 db.session.add(attachment)
 
         db.session.add(project)
-        db.session.commit()
+        db.session.flush()
         
         # Get current user for email notification
-        from flask_jwt_extended import get_jwt_identity
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(int(current_user_id))
+        current_user = _get_current_user()
         
-        # Send project creation email notification
+        # The creation email goes out after the commit
         if current_user:
-            send_project_creation_email_notification(project, current_user)
+            publish(ProjectCreated(project.id, current_user.id))
         
+        commit()
         return project
     
     except SQLAlchemyError as e:
@@ -75,6 +86,24 @@ def get_all_projects(user_id):
         raise RuntimeError(f"Database error while fetching projects: {e}")
 
 
+def get_project_etag(project_id):
+    """ETag of a project's current representation, or None if it does not exist."""
+    version = db.session.execute(select(Project.version).where(Project.id == project_id)).scalar()
+    return etag("project", project_id, version) if version is not None else None
+
+def get_all_projects_etag(user_id):
+    """ETag of the projects a user owns or collaborates on (and their task counts), without loading them."""
+    row = db.session.execute(
+        select(
+            func.count(Project.id), func.sum(Project.version), func.sum(Project.id), func.max(Project.id),
+            func.sum(ProjectTaskStats.version),
+        )
+        .outerjoin(ProjectTaskStats, ProjectTaskStats.project_id == Project.id)
+        .where((Project.owner_id == user_id) | Project.collaborators.any(User.id == user_id))
+    ).one()
+    # Overdue counts move with the date, so yesterday's copy is never fresh
+    return aggregate_etag(f"projects-u{user_id}", *row, date.today().isoformat())
+
 def get_project_by_id(project_id):
     try:
         project = Project.query.get(project_id)
@@ -84,6 +113,7 @@ def get_project_by_id(project_id):
     except SQLAlchemyError as e:
         raise RuntimeError(f"Database error while fetching project {project_id}: {e}")
 
+@cached_query("projects", "project_collaborators", "users")
 def get_project_users(project_id):
     try:
         project = Project.query.get(project_id)
@@ -98,70 +128,38 @@ def get_project_users(project_id):
     except SQLAlchemyError as e:
         raise RuntimeError(f"Database error while fetching project {project_id}: {e}")
 
-def update_project(project_id, data, new_files, collaborator_emails=None):
+def update_project(project_id, data, new_files, collaborator_emails=None, expected_version=None):
     try:
         project = Project.query.get(project_id)
         if not project:
             raise ValueError(f"Project with ID {project_id} not found.")
-
-        # Track changes for notification
-        changes = {}
-        old_collaborators = set(project.collaborators)
-        
-        # Update simple fields
-        if "name" in data and data["name"] != project.name:
-            changes["Name"] = (project.name, data["name"])
-            project.name = data["name"]
-            
-        if "description" in data and data["description"] != project.description:
-            changes["Description"] = (project.description, data["description"])
-            project.description = data["description"]
-            
-        if "notes" in data and data["notes"] != project.notes:
-            changes["Notes"] = (project.notes, data["notes"])
-            project.notes = data["notes"]
-            
-        if "status" in data and data["status"] != project.status.value:
-            changes["Status"] = (project.status.value, data["status"])
-            project.status = ProjectStatus(data["status"])
-            
+        check_version(project, expected_version, "project")
+
+        # Collect the requested values; only real changes are assigned and reported
+        values = {}
+        for field in ("name", "description", "notes"):
+            if field in data:
+                values[field] = data[field]
+        if "status" in data:
+            values["status"] = ProjectStatus(data["status"])
         if "deadline" in data and data["deadline"]:
-            new_deadline = datetime.fromisoformat(data["deadline"].replace("Z", "+00:00")).date()
-            if project.deadline != new_deadline:
-                changes["Deadline"] = (
-                    project.deadline.strftime('%Y-%m-%d') if project.deadline else 'Not set',
-                    new_deadline.strftime('%Y-%m-%d')
-                )
-                project.deadline = new_deadline
-
-        # Update owner
-        new_owner = None
+            values["deadline"] = datetime.fromisoformat(data["deadline"].replace("Z", "+00:00")).date()
         if "owner" in data:
-            owner = User.query.filter_by(email=data["owner"]).first()
-            if owner and owner.id != project.owner_id:
-                changes["Owner"] = (project.owner.email, owner.email)
-                project.owner = owner
-                new_owner = owner
+            owner = get_resolver().want(emails=collaborator_emails or []).by_email(data["owner"])
+            if owner:
+                values["owner"] = owner
 
-        # Track new collaborators
+        changes = {}
+        for change in apply_changes(project, values, PROJECT_FIELDS):
+            old_value = change["old_value"]
+            if change["field"] == "Deadline" and old_value is None:
+                old_value = "Not set"
+            changes[change["field"]] = (old_value, change["new_value"])
+
+        # Reconcile collaborators row-by-row; only newcomers get notified
         new_collaborators = []
         if collaborator_emails is not None:
-            current_emails = {user.email for user in project.collaborators}
-            new_emails = set(collaborator_emails)
-            
-            # Find added collaborators
-            added_emails = new_emails - current_emails
-            for email in added_emails:
-                user = User.query.filter_by(email=email).first()
-                if user:
-                    new_collaborators.append(user)
-            
-            # Update collaborators
-            project.collaborators.clear()
-            for email in collaborator_emails:
-                user = User.query.filter_by(email=email).first()
-                if user:
-                    project.collaborators.append(user)
+            new_collaborators = sync_collaborators(project, collaborator_emails).added
 
         # Update attachments
         if "existing_attachments" in data:
@@ -171,31 +169,35 @@ def update_project(project_id, data, new_files, collaborator_emails=None):
             for att in project.attachments[:]:
                 if att.id not in existing_ids:
                     db.session.delete(att)
+                    touch(project)
 
         if new_files:
             for file in new_files:
                 attachment = Attachment(filename=file.filename, content=file.read(), project=project)
                 db.session.add(attachment)
+            touch(project)
 
-        db.session.commit()
-        
         # Get current user for email notification
-        from flask_jwt_extended import get_jwt_identity
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(int(current_user_id))
+        current_user = _get_current_user()
         
-        # Send email notifications
+        # Emails are dispatched only once the update has committed
         if current_user:
             # Send general project update notification if there were changes
             if changes:
-                send_project_update_email_notification(project, current_user, changes)
+                publish(ProjectUpdated(project.id, current_user.id, changes))
             
             # Send specific notification for new collaborators
             if new_collaborators:
-                send_project_collaborator_added_email_notification(project, current_user, new_collaborators)
+                publish(CollaboratorAdded(project.id, current_user.id, tuple(u.id for u in new_collaborators)))
         
+        commit()
         return project
     
+    except StaleDataError:
+        db.session.rollback()
+        current = db.session.execute(select(Project.version).where(Project.id == project_id)).scalar()
+        raise PreconditionFailed("The project was changed by someone else", current_version=current)
+
     except Exception as e:
         db.session.rollback()
         raise e
@@ -204,37 +206,5 @@ def update_project(project_id, data, new_files, collaborator_emails=None):
 # THIS IS THE FUNCTION THE SERVER CAN'T FIND
 # ------------------------------------
 def get_project_report_data(project_id, user_id):
-    try:
-        project = Project.query.get(project_id)
-        if not project:
-            raise ValueError(f"Project with ID {project_id} not found.")
-
-        user = User.query.get(user_id)
-        if not user:
-            raise PermissionError("User not found.")
-        
-        if user.id != project.owner_id and user not in project.collaborators:
-            raise PermissionError("You do not have access to generate reports for this project.")
-        
-        # --- Task Counting ---
-        status_counts_query = db.session.query(
-            Task.status, 
-            func.count(Task.id)
-        ).filter(
-            Task.project_id == project_id
-        ).group_by(
-            Task.status
-        ).all()
-
-        # 1. Initialize a dictionary with ALL possible statuses from your enum
-        report_data = {status.value: 0 for status in TaskStatus}
-
-        # 2. Overwrite the 0s with the actual counts from the query
-        for status_enum, count in status_counts_query:
-            report_data[status_enum.value] = count
-        
-        # 3. Return the dictionary as-is.
-        return report_data
-
-    except SQLAlchemyError as e:
-        raise RuntimeError(f"Database error while generating report data: {e}")
\ No newline at end of file
+    """Task counts per status; the full report is report_services.get_project_report."""
+    return get_project_report(project_id, user_id).status_counts
\ No newline at end of file
@@ -0,0 +1,161 @@
+import os
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, Project, ProjectProgressSnapshot, Task, TaskStatus, User
+from app.services.response_cache import cached_query
+
+PROGRESS_DEFAULT_DAYS = int(os.getenv("PROGRESS_DEFAULT_DAYS", 30))
+PROGRESS_MAX_DAYS = int(os.getenv("PROGRESS_MAX_DAYS", 366))
+
+@dataclass(frozen=True)
+class MemberBreakdown:
+    user_id: int
+    name: str
+    email: str
+    total: int
+    completed: int
+    overdue: int
+
+@dataclass(frozen=True)
+class TrendPoint:
+    week: str        # Monday of the week the tasks were created
+    created: int
+    completed: int   # how many of those are completed by now
+
+@dataclass(frozen=True)
+class ProjectReport:
+    project_id: int
+    as_of: str
+    total: int
+    status_counts: dict
+    overdue: int
+    due_this_week: int
+    completion_rate: float
+    priority_mix: dict
+    members: tuple
+    trend: tuple
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{
+            **data,
+            "members": tuple(MemberBreakdown(**m) for m in data["members"]),
+            "trend": tuple(TrendPoint(**p) for p in data["trend"]),
+        })
+
+def _authorize(project_id, user_id):
+    """One query: the project must exist and the user must own it or collaborate on it."""
+    member = select(Project.id).where(
+        Project.id == project_id,
+        (Project.owner_id == user_id) | Project.collaborators.any(User.id == user_id),
+    ).exists()
+    row = db.session.execute(select(Project.id, member.label("is_member")).where(Project.id == project_id)).first()
+    if row is None:
+        raise ValueError(f"Project with ID {project_id} not found.")
+    if not row.is_member:
+        raise PermissionError("You do not have access to generate reports for this project.")
+
+@cached_query("tasks", "users")
+def _report_data(project_id, as_of):
+    """Every metric folded from one GROUP BY over the project's tasks."""
+    today = date.fromisoformat(as_of)
+    open_task = Task.status != TaskStatus.COMPLETED
+    due = case(
+        (open_task & (Task.duedate < today), "overdue"),
+        (open_task & (Task.duedate <= today + timedelta(days=6)), "this_week"),
+        else_="other",
+    ).label("due")
+    week = cast(func.date_trunc("week", Task.created_at), Date).label("week")
+    rows = db.session.execute(
+        select(User.id, User.name, User.email, Task.status, Task.priority, due, week, func.count(Task.id).label("n"))
+        .join(User, User.id == Task.owner_id)
+        .where(Task.project_id == project_id)
+        .group_by(User.id, User.name, User.email, Task.status, Task.priority, due, week)
+    ).all()
+
+    status_counts = {status.value: 0 for status in TaskStatus}
+    priority_mix, members, trend = {}, {}, {}
+    overdue = due_this_week = 0
+    for user_id, name, email, status, priority, due_bucket, created_week, n in rows:
+        done = status == TaskStatus.COMPLETED
+        status_counts[status.value] += n
+        priority_mix[str(priority)] = priority_mix.get(str(priority), 0) + n
+        overdue += n if due_bucket == "overdue" else 0
+        due_this_week += n if due_bucket == "this_week" else 0
+
+        member = members.setdefault(user_id, {
+            "user_id": user_id, "name": name, "email": email, "total": 0, "completed": 0, "overdue": 0,
+        })
+        member["total"] += n
+        member["completed"] += n if done else 0
+        member["overdue"] += n if due_bucket == "overdue" else 0
+
+        if created_week is not None:
+            point = trend.setdefault(created_week, {"week": created_week.isoformat(), "created": 0, "completed": 0})
+            point["created"] += n
+            point["completed"] += n if done else 0
+
+    total = sum(status_counts.values())
+    return {
+        "project_id": project_id,
+        "as_of": as_of,
+        "total": total,
+        "status_counts": status_counts,
+        "overdue": overdue,
+        "due_this_week": due_this_week,
+        "completion_rate": round(100 * status_counts[TaskStatus.COMPLETED.value] / total, 1) if total else 0.0,
+        "priority_mix": dict(sorted(priority_mix.items(), key=lambda item: int(item[0]))),
+        "members": sorted(members.values(), key=lambda m: (-m["total"], m["email"])),
+        "trend": [trend[week] for week in sorted(trend)],
+    }
+
+def get_project_report(project_id, user_id):
+    """The ProjectReport of a project, for its owner or a collaborator.
+
+    Raises ValueError if the project does not exist and PermissionError if
+    the user is not on it. Reports are cached until a task or user changes
+    (or the day ends, as "overdue" and "due this week" move with it).
+    """
+    try:
+        _authorize(project_id, user_id)
+        return ProjectReport.from_dict(_report_data(project_id, date.today().isoformat()))
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while generating report data: {e}")
+
+def progress_range(start=None, end=None):
+    """The (start, end) days to chart, defaulting to the last PROGRESS_DEFAULT_DAYS days."""
+    end = end or date.today()
+    start = start or end - timedelta(days=PROGRESS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("The start date must not be after the end date")
+    if (end - start).days >= PROGRESS_MAX_DAYS:
+        raise ValueError(f"At most {PROGRESS_MAX_DAYS} days of progress can be requested at once")
+    return start, end
+
+def get_progress_history(project_id, user_id, start=None, end=None):
+    """Daily snapshots of a project's task counts from `start` to `end` (inclusive), oldest first.
+
+    Days the snapshot job did not run are simply missing from the series.
+    """
+    start, end = progress_range(start, end)
+    try:
+        _authorize(project_id, user_id)
+        snapshots = ProjectProgressSnapshot.query.filter(
+            ProjectProgressSnapshot.project_id == project_id,
+            ProjectProgressSnapshot.day.between(start, end),
+        ).order_by(ProjectProgressSnapshot.day).all()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while retrieving progress of project {project_id}: {e}")
+    return {
+        "project_id": project_id,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "series": [snapshot.to_dict() for snapshot in snapshots],
+    }
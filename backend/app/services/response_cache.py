@@ -0,0 +1,230 @@
+import functools
+import importlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from app.services.invalidation_bus import invalidation_bus
+from app.services.single_flight import SingleFlight
+
+CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+
+# --- Backends --------------------------------------------------------------
+# A backend stores opaque bytes under string keys and keeps one version
+# counter per table. Shared backends (e.g. Redis) implement the same five
+# methods: get, set, versions, bump and stats, plus clear.
+
+class MemoryCacheBackend:
+    """In-process LRU of cached bodies, bounded by total bytes and entry count.
+
+    Entries are kept in use order, so the least recently used ones are at
+    the front and are evicted first when either limit is exceeded.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {"evicted": 0, "too_large": 0}
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = len(key) + len(value)
+        with self._lock:
+            if size > self.max_bytes:
+                self.counters["too_large"] += 1
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(key) + len(old)
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                old_key, old_value = self._entries.popitem(last=False)
+                self._bytes -= len(old_key) + len(old_value)
+                self.counters["evicted"] += 1
+            return True
+
+    def versions(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self.counters,
+            }
+
+def build_cache_backend():
+    """Pick the backend from RESPONSE_CACHE_BACKEND: "memory" or a "module:factory" path."""
+    backend = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    if backend.lower() == "memory":
+        return MemoryCacheBackend()
+    module_name, _, factory = backend.partition(":")
+    return getattr(importlib.import_module(module_name), factory)()
+
+# --- Cache -----------------------------------------------------------------
+
+class ResponseCache:
+    """Values cached under a key that embeds the version of every table they were read from.
+
+    Nothing is ever invalidated by key: committing a change to a table bumps
+    its counter, so every entry built from the old data simply stops being
+    looked up and ages out of the LRU.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "stores": 0}
+
+    def versions(self, tables):
+        """Current version of each table, after catching up with other workers' writes."""
+        invalidation_bus.poll_if_due()
+        return self.backend.versions(tables)
+
+    def key(self, name, args, tables):
+        versions = self.versions(tables)
+        return f"{name}|{json.dumps(args, sort_keys=True, default=str)}|" + ",".join(
+            f"{table}:{version}" for table, version in zip(tables, versions)
+        )
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            self.counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key, value):
+        if self.backend.set(key, value):
+            with self._lock:
+                self.counters["stores"] += 1
+
+    def bump(self, tables):
+        if tables:
+            self.backend.bump(sorted(tables))
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+response_cache = ResponseCache(build_cache_backend())
+
+def _enabled():
+    return current_app.config.get("RESPONSE_CACHE_ENABLED", True)
+
+def cached_response(*tables, per_user=False):
+    """Serve a GET route from the cache until one of `tables` changes.
+
+    The key covers the endpoint, its URL arguments, the query string and
+    (with `per_user`) the caller's identity. Only 200 responses are stored.
+    Put it below @jwt_required() so authentication still runs on every hit.
+    """
+    def decorator(view):
+        misses = SingleFlight(f"response:{view.__module__}.{view.__qualname__}", ttl=0)
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not _enabled():
+                return view(*args, **kwargs)
+
+            key_args = [sorted(kwargs.items()), sorted(request.args.items(multi=True))]
+            if per_user:
+                key_args.append(get_jwt_identity())
+            key = response_cache.key(f"response:{request.endpoint}", key_args, tables)
+
+            cached = response_cache.get(key)
+            if cached is not None:
+                mimetype, _, body = cached.partition(b"\n")
+                return current_app.response_class(body, status=200, mimetype=mimetype.decode())
+
+            def render():
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.get_data(), response.status_code, response.mimetype
+
+            # Concurrent misses for the same key (e.g. right after a bump) render once
+            body, status, mimetype = misses.do(key, render)
+            if status == 200:
+                response_cache.set(key, mimetype.encode() + b"\n" + body)
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+        return wrapper
+    return decorator
+
+def cached_query(*tables):
+    """Memoize a service function returning plain JSON data until one of `tables` changes.
+
+    Every call gets a fresh copy, so callers may modify what they receive.
+    Exceptions and values that are not JSON serializable are not cached
+    (nor copied).
+    """
+    def decorator(fn):
+        name = f"query:{fn.__module__}.{fn.__qualname__}"
+        misses = SingleFlight(name, ttl=0)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled():
+                return fn(*args, **kwargs)
+
+            key = response_cache.key(name, [args, sorted(kwargs.items())], tables)
+            cached = response_cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+
+            value = misses.do(key, lambda: fn(*args, **kwargs))
+            try:
+                encoded = json.dumps(value).encode()
+            except (TypeError, ValueError):
+                return value
+            response_cache.set(key, encoded)
+            # Coalesced callers share `value`, so each one decodes its own copy
+            return json.loads(encoded)
+        return wrapper
+    return decorator
+
+# Table versions move when the invalidation bus reports a committed write,
+# whether this worker or another one made it.
+invalidation_bus.subscribe(response_cache.bump)
+
+def init_app(app):
+    """Read RESPONSE_CACHE_ENABLED and start the app with a cold cache."""
+    app.config["RESPONSE_CACHE_ENABLED"] = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    response_cache.clear()
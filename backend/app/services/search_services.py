@@ -0,0 +1,115 @@
+import base64
+import binascii
+import json
+import os
+from sqlalchemy import Float, and_, cast, func, literal, literal_column, null, or_, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, search_document, User, Task, Project, Comment
+
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", 20))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", 50))
+SEARCH_KINDS = ("task", "project", "comment")
+SNIPPET_LENGTH = 160
+
+def _visible_tasks(user_id):
+    """Tasks the user owns, collaborates on, or that belong to one of their projects."""
+    return or_(
+        Task.owner_id == user_id,
+        Task.collaborators.any(User.id == user_id),
+        Task.project_id.in_(select(Project.id).where(_visible_projects(user_id))),
+    )
+
+def _visible_projects(user_id):
+    return or_(Project.owner_id == user_id, Project.collaborators.any(User.id == user_id))
+
+def _hits(kind, user_id, query):
+    """One SELECT of (kind, id, title, snippet, task_id, rank) for a kind of searchable row."""
+    if kind == "task":
+        document = search_document(Task.title, Task.description, Task.notes)
+        columns = (Task.id, Task.title, Task.description, Task.id)
+        source, visible = Task, _visible_tasks(user_id)
+    elif kind == "project":
+        document = search_document(Project.name, Project.description, Project.notes)
+        columns = (Project.id, Project.name, Project.description, null())
+        source, visible = Project, _visible_projects(user_id)
+    else:
+        document = search_document(None, Comment.content)
+        columns = (Comment.id, Task.title, Comment.content, Comment.task_id)
+        source, visible = Comment, _visible_tasks(user_id)
+
+    row_id, title, snippet, task_id = columns
+    stmt = select(
+        literal(kind).label("kind"),
+        row_id.label("id"),
+        title.label("title"),
+        func.substr(snippet, 1, SNIPPET_LENGTH).label("snippet"),
+        task_id.label("task_id"),
+        # float8, so the rank in a cursor compares exactly with the column
+        cast(func.ts_rank(document, query), Float).label("rank"),
+    ).select_from(source)
+    if kind == "comment":
+        stmt = stmt.join(Task, Comment.task_id == Task.id)
+    return stmt.where(document.op("@@")(query), visible)
+
+def _encode_cursor(row):
+    raw = json.dumps([row.rank, row.kind, row.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor):
+    try:
+        rank, kind, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(rank), str(kind), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def _page_size(limit):
+    if limit in (None, ""):
+        return SEARCH_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, SEARCH_MAX_PAGE_SIZE)
+
+def search(user_id, q, kinds=None, limit=None, cursor=None):
+    """Rank the tasks, projects and comments the user can see against a search phrase.
+
+    `q` uses web search syntax ("quoted phrases", -excluded, or). Results are
+    ordered by rank, then kind and id, and paged with an opaque keyset cursor:
+    pass `next_cursor` back to get the following page. Returns
+    {"results": [...], "next_cursor": str or None}.
+    """
+    q = (q or "").strip()
+    if not q:
+        raise ValueError("Search query is required")
+    kinds = list(dict.fromkeys(kinds or SEARCH_KINDS))
+    unknown = [kind for kind in kinds if kind not in SEARCH_KINDS]
+    if unknown:
+        raise ValueError(f"Unknown search type: {', '.join(unknown)}")
+    limit = _page_size(limit)
+
+    try:
+        query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+        hits = union_all(*[_hits(kind, user_id, query) for kind in kinds]).subquery("hits")
+        stmt = select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id).limit(limit + 1)
+        if cursor:
+            rank, kind, row_id = _decode_cursor(cursor)
+            stmt = stmt.where(or_(
+                hits.c.rank < rank,
+                and_(hits.c.rank == rank, or_(hits.c.kind > kind, and_(hits.c.kind == kind, hits.c.id > row_id))),
+            ))
+        rows = db.session.execute(stmt).all()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while searching: {e}")
+
+    results = []
+    for row in rows[:limit]:
+        result = {"type": row.kind, "id": row.id, "title": row.title, "snippet": row.snippet, "rank": row.rank}
+        if row.kind == "comment":
+            result["task_id"] = row.task_id
+        results.append(result)
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"results": results, "next_cursor": next_cursor}
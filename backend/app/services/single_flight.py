@@ -0,0 +1,156 @@
+import functools
+import json
+import os
+import threading
+import time
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+
+SINGLE_FLIGHT_TTL = float(os.getenv("SINGLE_FLIGHT_TTL", 3.0))
+SINGLE_FLIGHT_WAIT = float(os.getenv("SINGLE_FLIGHT_WAIT", 30.0))
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for and receive the same result (or exception). A result is
+    then reused for `ttl` seconds, which absorbs the rest of a burst. Shared
+    results must be treated as read-only.
+    """
+
+    def __init__(self, name, ttl=SINGLE_FLIGHT_TTL, wait=SINGLE_FLIGHT_WAIT, clock=time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.wait = wait
+        self.clock = clock
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "computed": 0, "coalesced": 0, "reused": 0, "errors": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            self.counters["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set() and self.clock() - call.finished_at >= self.ttl:
+                call = None
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+                self.counters["reused" if call.done.is_set() else "coalesced"] += 1
+
+        if leader:
+            return self._run(key, call, fn)
+        if not call.done.wait(self.wait):
+            # The leader is stuck; do not let it hold everyone else hostage
+            return fn()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key, call, fn):
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self.counters["computed"] += 1
+                call.finished_at = self.clock()
+                # Errors are shared with the waiters but not reused afterwards
+                if call.error is not None or self.ttl <= 0:
+                    self._calls.pop(key, None)
+                self._expire()
+            call.done.set()
+        return call.result
+
+    def _expire(self):
+        now = self.clock()
+        for key in [k for k, c in self._calls.items() if c.done.is_set() and now - c.finished_at >= self.ttl]:
+            del self._calls[key]
+
+    def clear(self):
+        """Forget finished results; calls still in flight complete normally."""
+        with self._lock:
+            for key in [k for k, c in self._calls.items() if c.done.is_set()]:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": sum(not c.done.is_set() for c in self._calls.values()), **self.counters}
+
+_groups = {}
+
+def _group(name, ttl):
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name, ttl=ttl)
+    return group
+
+def _key(parts):
+    return json.dumps(parts, sort_keys=True, default=str)
+
+def single_flight(ttl=SINGLE_FLIGHT_TTL, scope=None):
+    """Coalesce concurrent calls of a service function with the same arguments.
+
+    `scope`, if given, is called with the same arguments and returns extra
+    key parts, e.g. the caller's role when the result depends on permissions.
+    """
+    def decorator(fn):
+        group = _group(f"{fn.__module__}.{fn.__qualname__}", ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parts = [args, sorted(kwargs.items())]
+            if scope is not None:
+                parts.append(scope(*args, **kwargs))
+            return group.do(_key(parts), lambda: fn(*args, **kwargs))
+        wrapper.single_flight = group
+        return wrapper
+    return decorator
+
+def single_flight_response(ttl=SINGLE_FLIGHT_TTL, per_user=True):
+    """Coalesce concurrent identical GETs of a route.
+
+    The key is the endpoint, URL arguments, query string and (with
+    `per_user`) the caller's identity. Callers share the body and status
+    but each gets its own response object. Put it below @jwt_required().
+    """
+    def decorator(view):
+        group = _group(f"response:{view.__module__}.{view.__qualname__}", ttl)
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            parts = [sorted(kwargs.items()), sorted(request.args.items(multi=True))]
+            if per_user:
+                parts.append(get_jwt_identity())
+
+            def render():
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.get_data(), response.status_code, response.mimetype
+
+            body, status, mimetype = group.do(_key(parts), render)
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+        wrapper.single_flight = group
+        return wrapper
+    return decorator
+
+def single_flight_stats():
+    """Counters for every coalesced function, keyed by its name."""
+    return {name: group.stats() for name, group in _groups.items()}
+
+def init_app(app):
+    """Start the app without results reused from a previous one."""
+    for group in _groups.values():
+        group.clear()
@@ -0,0 +1,157 @@
+import os
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, case, cast, extract, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, Project, Task, TaskStatus, TaskStatusTransition, User, UserRole
+from app.services.response_cache import cached_query
+
+ANALYTICS_DEFAULT_DAYS = int(os.getenv("ANALYTICS_DEFAULT_DAYS", 84))
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", 366))
+ANALYTICS_ROLES = (UserRole.HR, UserRole.DIRECTOR)
+PERCENTILES = (50, 85, 95)
+
+def record_status_transitions(transitions, actor_id=None):
+    """Append (task_id, from_status, to_status) rows to the status history in one INSERT.
+
+    Called by every path that creates tasks or changes their status, inside
+    its transaction, so the history commits or rolls back with the change.
+    """
+    rows = [
+        {"task_id": task_id, "from_status": from_status, "to_status": to_status, "changed_by": actor_id}
+        for task_id, from_status, to_status in transitions
+        if from_status != to_status
+    ]
+    if rows:
+        db.session.execute(insert(TaskStatusTransition), rows)
+
+def analytics_period(start=None, end=None):
+    """The (start, end) days to analyse, defaulting to the last ANALYTICS_DEFAULT_DAYS days."""
+    end = end or date.today()
+    start = start or end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("The start date must not be after the end date")
+    if (end - start).days >= ANALYTICS_MAX_DAYS:
+        raise ValueError(f"At most {ANALYTICS_MAX_DAYS} days can be analysed at once")
+    return start, end
+
+def _completions(start, end):
+    """One row per completion in [start, end] with when that cycle of work began.
+
+    A task's history is split into cycles at each completion, so a reopened
+    task is measured from its restart. A cycle starts when the task first
+    went Ongoing in it, or failing that when it was created or reopened.
+    """
+    T = TaskStatusTransition
+    completed_in_period = select(T.task_id).where(
+        T.to_status == TaskStatus.COMPLETED,
+        T.at >= datetime.combine(start, time.min),
+        T.at < datetime.combine(end + timedelta(days=1), time.min),
+    )
+    # Completions before each row: transitions up to and including a completion share its cycle
+    numbered = select(
+        T.task_id, T.to_status, T.at,
+        func.coalesce(
+            func.sum(case((T.to_status == TaskStatus.COMPLETED, 1), else_=0)).over(
+                partition_by=T.task_id, order_by=(T.at, T.id), rows=(None, -1)
+            ),
+            0,
+        ).label("cycle"),
+    ).where(T.task_id.in_(completed_in_period)).subquery("numbered")
+    cycles = select(
+        numbered,
+        func.min(case((numbered.c.to_status == TaskStatus.ONGOING, numbered.c.at))).over(
+            partition_by=(numbered.c.task_id, numbered.c.cycle)
+        ).label("started_at"),
+        func.min(numbered.c.at).over(partition_by=(numbered.c.task_id, numbered.c.cycle)).label("cycle_first_at"),
+    ).subquery("cycles")
+    started = func.coalesce(
+        cycles.c.started_at,
+        case((cycles.c.cycle == 0, func.least(Task.created_at, cycles.c.cycle_first_at)), else_=cycles.c.cycle_first_at),
+    )
+    return (
+        select(
+            cycles.c.task_id,
+            cycles.c.at.label("completed_at"),
+            (extract("epoch", cycles.c.at - started) / 3600).label("hours"),
+            Task.owner_id,
+            Task.project_id,
+        )
+        .join(Task, Task.id == cycles.c.task_id)
+        .where(
+            cycles.c.to_status == TaskStatus.COMPLETED,
+            cycles.c.at >= datetime.combine(start, time.min),
+            cycles.c.at < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .subquery("completions")
+    )
+
+def _hours(value):
+    return round(float(value), 1) if value is not None else None
+
+@cached_query("task_status_transitions", "tasks", "users", "projects")
+def _cycle_time_data(group_by, start_iso, end_iso):
+    start, end = date.fromisoformat(start_iso), date.fromisoformat(end_iso)
+    completions = _completions(start, end)
+    if group_by == "user":
+        columns = (User.id, User.name, User.email)
+        source = completions.join(User, User.id == completions.c.owner_id)
+    else:
+        columns = (Project.id, Project.name)
+        source = completions.join(Project, Project.id == completions.c.project_id)
+
+    groups = db.session.execute(
+        select(
+            *columns,
+            func.count().label("completed"),
+            func.avg(completions.c.hours).label("mean"),
+            *[
+                func.percentile_cont(p / 100).within_group(completions.c.hours).label(f"p{p}")
+                for p in PERCENTILES
+            ],
+        )
+        .select_from(source)
+        .group_by(*columns)
+        .order_by(func.count().desc(), columns[0])
+    ).all()
+
+    week = cast(func.date_trunc("week", completions.c.completed_at), Date).label("week")
+    throughput = db.session.execute(
+        select(week, func.count().label("completed")).group_by(week).order_by(week)
+    ).all()
+
+    return {
+        "group_by": group_by,
+        "from": start_iso,
+        "to": end_iso,
+        "groups": [
+            {
+                "id": row.id,
+                "name": row.name,
+                **({"email": row.email} if group_by == "user" else {}),
+                "completed": row.completed,
+                "mean_hours": _hours(row.mean),
+                **{f"p{p}_hours": _hours(getattr(row, f"p{p}")) for p in PERCENTILES},
+            }
+            for row in groups
+        ],
+        "throughput": [{"week": row.week.isoformat(), "completed": row.completed} for row in throughput],
+    }
+
+def get_cycle_time_analytics(user_id, group_by="user", start=None, end=None):
+    """Cycle-time percentiles per user (task owner) or project, and weekly throughput.
+
+    Cycle time runs from when work on a task started to its completion,
+    for every completion between `start` and `end`. Only HR and directors
+    may see it. Results are cached per period until the history changes.
+    """
+    if group_by not in ("user", "project"):
+        raise ValueError("group must be 'user' or 'project'")
+    start, end = analytics_period(start, end)
+    try:
+        role = db.session.execute(select(User.role).where(User.id == user_id)).scalar()
+        if role not in ANALYTICS_ROLES:
+            raise PermissionError("Only HR and directors can view cycle-time analytics.")
+        return _cycle_time_data(group_by, start.isoformat(), end.isoformat())
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while computing cycle-time analytics: {e}")
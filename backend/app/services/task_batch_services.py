@@ -0,0 +1,268 @@
+import os
+from datetime import date, datetime
+from sqlalchemy import tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models import db, Task, Project, Notification, NotificationType, TaskStatus
+from app.services.change_tracking import diff_values, TASK_FIELDS
+from app.services.event_bus import unit_of_work, publish, TaskAssigned, TasksUpdated, DueDateReminderDue
+from app.services.task_analytics_services import record_status_transitions
+from app.services.notification_services import (
+    bulk_create_due_date_reminders,
+    create_task_assignment_notification,
+    create_task_update_notifications_bulk,
+)
+from app.services.user_resolver import get_resolver
+
+BATCH_MAX_OPERATIONS = int(os.getenv("TASK_BATCH_MAX_OPERATIONS", 500))
+
+# Patch key -> task attribute it sets
+PATCH_FIELDS = {
+    "status": "status",
+    "owner": "owner",
+    "duedate": "duedate",
+    "project_id": "project",
+}
+
+# Task attribute -> (column written by the UPDATE, value for that column)
+_COLUMNS = {
+    "status": ("status", lambda value: value),
+    "owner": ("owner_id", lambda user: user.id),
+    "duedate": ("duedate", lambda value: value),
+    "project": ("project_id", lambda project: project.id if project else None),
+}
+
+def _parse_patch(patch, users, projects):
+    """Turn a patch of request values into task attribute values plus error messages."""
+    values = {}
+    errors = []
+    if not isinstance(patch, dict):
+        return values, ["patch must be an object"]
+
+    for key, raw in patch.items():
+        if key not in PATCH_FIELDS:
+            errors.append(f"Unsupported field: {key}")
+        elif key == "status":
+            try:
+                values["status"] = TaskStatus(raw)
+            except ValueError:
+                errors.append(f"Invalid status: {raw}")
+        elif key == "owner":
+            if isinstance(raw, str) and raw in users:
+                values["owner"] = users[raw]
+            else:
+                errors.append(f"Owner with email {raw} not found")
+        elif key == "duedate":
+            try:
+                values["duedate"] = datetime.fromisoformat(str(raw).replace("Z", "+00:00")).date()
+            except ValueError:
+                errors.append(f"Invalid date format: {raw}")
+        elif key == "project_id":
+            if raw in (None, ""):
+                values["project"] = None
+            elif _as_int(raw) in projects:
+                values["project"] = projects[_as_int(raw)]
+            else:
+                errors.append(f"Project with ID {raw} not found")
+    return values, errors
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _collect(operations):
+    """Owner emails, project ids and task ids mentioned anywhere in the batch."""
+    emails, project_ids, task_ids = set(), set(), set()
+    for op in operations:
+        if not isinstance(op, dict):
+            continue
+        if _as_int(op.get("task_id")) is not None:
+            task_ids.add(_as_int(op.get("task_id")))
+        for patch in (op.get("patch"), op.get("expected")):
+            if not isinstance(patch, dict):
+                continue
+            if patch.get("owner"):
+                emails.add(patch["owner"])
+            if _as_int(patch.get("project_id")) is not None:
+                project_ids.add(_as_int(patch["project_id"]))
+    return emails, project_ids, task_ids
+
+def apply_task_batch(operations, actor_id):
+    """Apply a list of {"task_id", "patch", "expected"?, "version"?} operations in one transaction.
+
+    Each task gets its own change detection, but tasks receiving the same
+    effective change are written by a single UPDATE ... WHERE id IN (...).
+    `expected` holds values the task must still have (e.g. the Kanban column
+    it was dragged from) and `version` the row version the client last saw;
+    if either no longer holds, the item is reported as a conflict. Writes are
+    guarded by the version read here, so concurrent saves are never overwritten.
+    Returns one result per operation, in order, with a status of "updated",
+    "unchanged", "conflict", "not_found" or "invalid".
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise ValueError(f"A batch is limited to {BATCH_MAX_OPERATIONS} operations")
+
+    emails, project_ids, task_ids = _collect(operations)
+    resolver = get_resolver().want(ids=[actor_id], emails=emails)
+
+    try:
+        with unit_of_work():
+            users = resolver.by_emails(emails)
+            actor = resolver.get(actor_id)
+            projects = {}
+            if project_ids:
+                projects = {p.id: p for p in Project.query.filter(Project.id.in_(project_ids)).all()}
+            tasks = {}
+            if task_ids:
+                tasks = {
+                    t.id: t
+                    for t in Task.query.options(
+                        joinedload(Task.owner),
+                        joinedload(Task.project),
+                        selectinload(Task.collaborators),
+                    ).filter(Task.id.in_(task_ids)).all()
+                }
+
+            results = []
+            groups = {}
+            updated = []
+            seen = set()
+            for op in operations:
+                task_id = _as_int(op.get("task_id")) if isinstance(op, dict) else None
+                result = {"task_id": task_id}
+                results.append(result)
+
+                if task_id is None:
+                    result.update(status="invalid", errors=["task_id is required"])
+                    continue
+                values, errors = _parse_patch(op.get("patch"), users, projects)
+                expected, expected_errors = _parse_patch(op.get("expected") or {}, users, projects)
+                errors += [f"expected: {e}" for e in expected_errors]
+                if errors:
+                    result.update(status="invalid", errors=errors)
+                    continue
+
+                task = tasks.get(task_id)
+                if task is None:
+                    result.update(status="not_found", errors=[f"Task with task ID {task_id} not found"])
+                    continue
+                if task_id in seen:
+                    result.update(status="conflict", errors=["Task appears more than once in this batch"])
+                    continue
+                seen.add(task_id)
+
+                version = op.get("version")
+                if version is not None and _as_int(version) != task.version:
+                    result.update(
+                        status="conflict",
+                        errors=["Task was changed by someone else"],
+                        current={"version": task.version},
+                    )
+                    continue
+
+                _, mismatched = diff_values(task, expected, TASK_FIELDS)
+                if mismatched:
+                    result.update(
+                        status="conflict",
+                        errors=["Task was changed by someone else"],
+                        current={change["field"]: change["old_value"] for change in mismatched},
+                    )
+                    continue
+
+                changed, changes = diff_values(task, values, TASK_FIELDS)
+                if not changes:
+                    result["status"] = "unchanged"
+                    continue
+
+                columns = tuple(sorted(
+                    (_COLUMNS[attr][0], _COLUMNS[attr][1](value)) for attr, value in changed.items()
+                ))
+                groups.setdefault(columns, []).append(task)
+                updated.append((task, changes, changed, result))
+                result.update(status="updated", changes=changes)
+
+            # One UPDATE per distinct change. Each row must still be at the version
+            # read above, so a task saved concurrently is skipped, not overwritten.
+            written = set()
+            for columns, group in groups.items():
+                written.update(db.session.execute(
+                    update(Task)
+                    .where(tuple_(Task.id, Task.version).in_([(task.id, task.version) for task in group]))
+                    .values({**dict(columns), "version": Task.version + 1})
+                    .returning(Task.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars())
+
+            transitions = []
+            for task, _, changed, result in updated:
+                if task.id not in written:
+                    result.update(status="conflict", errors=["Task was changed by someone else"])
+                    result.pop("changes")
+                    continue
+                if "status" in changed:
+                    transitions.append((task.id, task.status, changed["status"]))
+                if "owner" in changed and actor:
+                    # Same as update_task: recorded before the switch so the payload names the previous owner
+                    create_task_assignment_notification(task, actor, changed["owner"])
+                for attr, value in changed.items():
+                    set_committed_value(task, attr, value)
+                    if attr in ("owner", "project"):
+                        set_committed_value(task, _COLUMNS[attr][0], _COLUMNS[attr][1](value))
+                set_committed_value(task, "version", task.version + 1)
+            updated = [(task, changes, changed) for task, changes, changed, _ in updated if task.id in written]
+            record_status_transitions(transitions, actor.id if actor else None)
+
+            _apply_side_effects(updated, actor)
+
+        return results
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while updating tasks: {e}")
+
+def _apply_side_effects(updated, actor):
+    """Reminders, in-app notifications, assignment events and the coalesced email event for the updated tasks."""
+    if not updated:
+        return
+
+    completed = [task for task, _, changed in updated if changed.get("status") == TaskStatus.COMPLETED]
+    rescheduled = [
+        task for task, _, changed in updated
+        if "duedate" in changed and task.status != TaskStatus.COMPLETED
+    ]
+    # Same rules as update_task: completing a task clears its reminders,
+    # moving its due date rebuilds them. Assignment notifications written
+    # above stay.
+    cleared = {task.id for task in completed} | {task.id for task in rescheduled}
+    if cleared:
+        Notification.query.filter(
+            Notification.task_id.in_(cleared), Notification.type == NotificationType.DUE_DATE_REMINDER
+        ).delete(synchronize_session=False)
+    if rescheduled:
+        bulk_create_due_date_reminders(
+            {
+                "id": task.id,
+                "title": task.title,
+                "duedate": task.duedate,
+                "status": task.status,
+                "project_name": task.project.name if task.project else None,
+                "user_ids": [task.owner_id] + [c.id for c in task.collaborators],
+            }
+            for task in rescheduled
+        )
+        today = date.today()
+        for task in rescheduled:
+            if (task.duedate - today).days <= 3:
+                publish(DueDateReminderDue(task.id, (task.duedate - today).days))
+
+    if actor:
+        for task, _, changed in updated:
+            if "owner" in changed:
+                publish(TaskAssigned(task.id, actor.id, (changed["owner"].id,)))
+        create_task_update_notifications_bulk([(task, changes) for task, changes, _ in updated], actor)
+        publish(TasksUpdated(actor.id, tuple((task.id, tuple(changes)) for task, changes, _ in updated)))
@@ -0,0 +1,323 @@
+import codecs
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, Task, Project, TaskStatus, task_collaborators
+from app.services.event_bus import unit_of_work, publish, TasksImported
+from app.services.notification_services import bulk_create_due_date_reminders
+from app.services.task_analytics_services import record_status_transitions
+from app.services.user_resolver import get_resolver
+
+IMPORT_MAX_ROWS = int(os.getenv("TASK_IMPORT_MAX_ROWS", 10000))
+IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", 1000))
+MAX_REPORTED_ERRORS = 100
+READ_CHUNK = 64 * 1024
+
+_TASK_COLUMNS = Task.__table__.c
+_STATUSES = {key.lower(): status for status in TaskStatus for key in (status.name, status.value)}
+
+class TaskImportError(ValueError):
+    """An import that cannot go ahead; `errors` lists the failing rows as {"row", "errors"}."""
+
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+# --- Parsing ---------------------------------------------------------------
+
+def _normalize_keys(row):
+    return {str(key).strip().lower(): value for key, value in row.items() if key is not None}
+
+def iter_csv_rows(stream):
+    """Yield CSV rows (header keys lower-cased) while reading the body line by line."""
+    reader = codecs.getreader("utf-8-sig")(stream)
+    for row in csv.DictReader(reader):
+        yield _normalize_keys(row)
+
+def iter_json_rows(stream):
+    """Yield the objects of a top-level JSON array, decoding one chunk at a time."""
+    reader = codecs.getreader("utf-8-sig")(stream)
+    decoder = json.JSONDecoder()
+    buffer, opened, eof = "", False, False
+    while True:
+        buffer = buffer.lstrip()
+        if opened:
+            buffer = buffer.lstrip(",").lstrip()
+        if not buffer:
+            if eof:
+                raise TaskImportError("Unexpected end of JSON input")
+            chunk = reader.read(READ_CHUNK)
+            eof = not chunk
+            buffer += chunk
+            continue
+        if not opened:
+            if buffer[0] != "[":
+                raise TaskImportError("JSON imports must be an array of task objects")
+            buffer, opened = buffer[1:], True
+            continue
+        if buffer[0] == "]":
+            return
+        try:
+            row, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Most likely an object cut in half by the chunk boundary
+            if eof:
+                raise TaskImportError("Malformed JSON in import")
+            chunk = reader.read(READ_CHUNK)
+            eof = not chunk
+            buffer += chunk
+            continue
+        if not isinstance(row, dict):
+            raise TaskImportError("JSON imports must be an array of task objects")
+        buffer = buffer[end:]
+        yield _normalize_keys(row)
+
+def parse_import(stream, fmt):
+    """Row iterator for an uploaded body in `fmt` ("csv" or "json")."""
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    if fmt == "json":
+        return iter_json_rows(stream)
+    raise TaskImportError(f"Unsupported import format: {fmt}")
+
+# --- Validation ------------------------------------------------------------
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return value if value not in ("", None) else None
+
+def _split_emails(value):
+    if not value:
+        return []
+    items = value if isinstance(value, (list, tuple)) else re.split(r"[;,|\s]+", str(value))
+    return list(dict.fromkeys(str(item).strip() for item in items if item and str(item).strip()))
+
+def _check_length(errors, field, value):
+    limit = _TASK_COLUMNS[field].type.length
+    if value is not None and len(value) > limit:
+        errors.append(f"{field} must be at most {limit} characters")
+
+def _parse_row(raw, default_project_id):
+    """Type-check one row on its own; lookups that need the database come later."""
+    errors = []
+    title = _clean(raw.get("title"))
+    description = _clean(raw.get("description"))
+    notes = _clean(raw.get("notes"))
+    if not title:
+        errors.append("title is required")
+    for field, value in (("title", title), ("description", description), ("notes", notes)):
+        _check_length(errors, field, value)
+
+    duedate = None
+    due_raw = _clean(raw.get("duedate") or raw.get("due_date"))
+    if not due_raw:
+        errors.append("duedate is required")
+    else:
+        try:
+            duedate = datetime.fromisoformat(str(due_raw).replace("Z", "+00:00")).date()
+        except ValueError:
+            errors.append(f"Invalid date format: {due_raw}")
+
+    status = TaskStatus.UNASSIGNED
+    status_raw = _clean(raw.get("status"))
+    if status_raw:
+        status = _STATUSES.get(str(status_raw).lower())
+        if status is None:
+            errors.append(f"Invalid status: {status_raw}")
+
+    priority = 1
+    priority_raw = _clean(raw.get("priority"))
+    if priority_raw is not None:
+        try:
+            priority = int(priority_raw)
+        except (TypeError, ValueError):
+            errors.append(f"Invalid priority: {priority_raw}")
+
+    owner = _clean(raw.get("owner") or raw.get("owner_email"))
+    if not owner:
+        errors.append("owner is required")
+
+    project_id = _clean(raw.get("project_id")) or default_project_id
+    if project_id is not None:
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            errors.append(f"Invalid project_id: {project_id}")
+            project_id = None
+
+    return {
+        "title": title,
+        "description": description,
+        "notes": notes,
+        "duedate": duedate,
+        "status": status,
+        "priority": priority,
+        "owner": owner,
+        "collaborators": _split_emails(raw.get("collaborators")),
+        "project_id": project_id,
+    }, errors
+
+def validate_import_rows(rows, default_project_id=None):
+    """Parse and check every row before anything is written.
+
+    Owners, collaborators and projects are resolved in bulk (one query each).
+    Returns the prepared rows, or raises TaskImportError listing the first
+    MAX_REPORTED_ERRORS failing rows.
+    """
+    parsed = []
+    errors = []
+    emails = set()
+    project_ids = set()
+    for index, raw in enumerate(rows, start=1):
+        if index > IMPORT_MAX_ROWS:
+            raise TaskImportError(f"Imports are limited to {IMPORT_MAX_ROWS} rows")
+        row, row_errors = _parse_row(raw, default_project_id)
+        parsed.append((index, row, row_errors))
+        if row["owner"]:
+            emails.add(row["owner"])
+        emails.update(row["collaborators"])
+        if row["project_id"] is not None:
+            project_ids.add(row["project_id"])
+
+    if not parsed:
+        raise TaskImportError("The import contains no rows")
+
+    users = get_resolver().by_emails(emails)
+    projects = {}
+    if project_ids:
+        projects = dict(db.session.execute(
+            select(Project.id, Project.name).where(Project.id.in_(project_ids))
+        ).all())
+
+    prepared = []
+    for index, row, row_errors in parsed:
+        if row["owner"] and row["owner"] not in users:
+            row_errors.append(f"Owner with email {row['owner']} not found")
+        unknown = [email for email in row["collaborators"] if email not in users]
+        if unknown:
+            row_errors.append(f"Unknown collaborators: {', '.join(unknown)}")
+        if row["project_id"] is not None and row["project_id"] not in projects:
+            row_errors.append(f"Project with ID {row['project_id']} not found")
+        if row_errors:
+            errors.append({"row": index, "errors": row_errors})
+            continue
+        owner_id = users[row["owner"]].id
+        row["owner_id"] = owner_id
+        row["collaborator_ids"] = [users[e].id for e in row["collaborators"] if users[e].id != owner_id]
+        row["project_name"] = projects.get(row["project_id"])
+        prepared.append(row)
+
+    if errors:
+        raise TaskImportError(f"{len(errors)} row(s) failed validation", errors[:MAX_REPORTED_ERRORS])
+    return prepared
+
+# --- Writing ---------------------------------------------------------------
+
+def _batches(items, size=None):
+    size = size or IMPORT_BATCH_SIZE
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def insert_imported_tasks(prepared):
+    """Insert validated rows, their collaborators and due date reminders in batched statements.
+
+    Does not commit. Returns the new task ids in row order.
+    """
+    task_table = Task.__table__
+    insert_tasks = insert(task_table).returning(task_table.c.id, sort_by_parameter_order=True)
+
+    task_ids = []
+    for batch in _batches(prepared):
+        result = db.session.execute(insert_tasks, [
+            {
+                "title": row["title"],
+                "description": row["description"],
+                "duedate": row["duedate"],
+                "status": row["status"],
+                "notes": row["notes"],
+                "owner_id": row["owner_id"],
+                "project_id": row["project_id"],
+                "priority": row["priority"],
+            }
+            for row in batch
+        ])
+        task_ids.extend(result.scalars().all())
+
+    links = [
+        {"task_id": task_id, "user_id": user_id}
+        for task_id, row in zip(task_ids, prepared)
+        for user_id in row["collaborator_ids"]
+    ]
+    for batch in _batches(links):
+        db.session.execute(insert(task_collaborators), batch)
+
+    bulk_create_due_date_reminders(
+        {
+            "id": task_id,
+            "title": row["title"],
+            "duedate": row["duedate"],
+            "status": row["status"],
+            "project_name": row["project_name"],
+            "user_ids": [row["owner_id"]] + row["collaborator_ids"],
+        }
+        for task_id, row in zip(task_ids, prepared)
+    )
+    return task_ids
+
+def import_tasks(rows, actor_id, default_project_id=None):
+    """Validate and insert a whole import in one transaction; returns the new task ids.
+
+    Everyone involved gets a single summary email once the import commits,
+    instead of a creation, assignment and reminder email per task.
+    """
+    try:
+        with unit_of_work():
+            prepared = validate_import_rows(rows, default_project_id)
+            task_ids = insert_imported_tasks(prepared)
+            record_status_transitions(
+                [(task_id, None, row["status"]) for task_id, row in zip(task_ids, prepared)],
+                int(actor_id) if actor_id is not None else None,
+            )
+            if actor_id is not None:
+                publish(TasksImported(int(actor_id), tuple(task_ids)))
+        return task_ids
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while importing tasks: {e}")
+
+def imported_tasks_by_recipient(task_ids, exclude_user_id=None):
+    """{email: [task dicts]} for everyone who owns or collaborates on the imported tasks."""
+    by_user = {}
+    for chunk in _batches(list(task_ids)):
+        tasks = {}
+        for row in db.session.execute(
+            select(Task.id, Task.title, Task.duedate, Task.priority, Task.status, Task.owner_id, Project.name)
+            .outerjoin(Project, Task.project_id == Project.id)
+            .where(Task.id.in_(chunk))
+            .order_by(Task.id)
+        ):
+            tasks[row.id] = {
+                "id": row.id,
+                "title": row.title,
+                "duedate": row.duedate.isoformat() if row.duedate else None,
+                "priority": row.priority,
+                "status": row.status.value if row.status else None,
+                "project_name": row.name or "No Project",
+            }
+            by_user.setdefault(row.owner_id, []).append({**tasks[row.id], "role": "owner"})
+        for task_id, user_id in db.session.execute(
+            select(task_collaborators.c.task_id, task_collaborators.c.user_id)
+            .where(task_collaborators.c.task_id.in_(chunk))
+            .order_by(task_collaborators.c.task_id)
+        ):
+            by_user.setdefault(user_id, []).append({**tasks[task_id], "role": "collaborator"})
+
+    by_user.pop(exclude_user_id, None)
+    users = get_resolver().by_ids(by_user)
+    return {users[user_id].email: tasks for user_id, tasks in by_user.items() if user_id in users}
@@ -3,7 +3,9 @@ from app.models import db, Task, Attachment, User, Project
 from app.services.user_services import get_user_by_email, get_users_info
 from app.services.project_services import get_project_users
 from app.models import TaskStatus
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime
 from app.services.notification_services import (
     create_notifications_for_task,
@@ -14,11 +16,12 @@ from app.services.notification_services import (
     create_task_assignment_notification,
 )
 from flask_jwt_extended import get_jwt_identity
-from app.services.email_services import send_task_assignment_email_notification
-from app.services.email_services import (
-    send_task_creation_email_notification,
-    send_task_assignment_email_notification
-)
+from app.services.event_bus import unit_of_work, publish, TaskCreated, TaskUpdated, TaskAssigned
+from app.services.change_tracking import apply_changes, touch, TASK_FIELDS
+from app.services.http_cache import PreconditionFailed, aggregate_etag, check_version, etag
+from app.services.task_analytics_services import record_status_transitions
+from app.services.collaborator_services import resolve_users_by_email, sync_collaborators
+from app.services.user_resolver import get_resolver
 
 class _NotificationFacade:
     def create_notifications_for_task(self, *args, **kwargs):
@@ -44,62 +47,41 @@ notification_service = _NotificationFacade()
 
 def create_task(title, description, duedate, status, owner_email, collaborator_emails, attachments, notes, priority, project_id=None):
     try:
-        owner = get_user_by_email(owner_email)
-        if not owner:
-            raise ValueError(f"Owner with email {owner_email} not found")
-        
-        collaborators = []
-        if collaborator_emails:
-            for email in collaborator_emails:
-                user = get_user_by_email(email)
-                if user:
-                    collaborators.append(user)
-
-        task = Task(title=title, description=description, duedate=duedate, status=status, owner=owner, collaborators=collaborators, notes=notes, priority=priority)
-
-        if project_id:
-            project = Project.query.get(project_id)
-            if project:
-                task.project = project
-
-        if attachments:
-            for file in attachments:
-                attachment = Attachment(filename=file.filename, content=file.read(), task=task)
-                db.session.add(attachment)
-
-        db.session.add(task)
-        db.session.commit()
+        with unit_of_work():
+            resolver = get_resolver().want(emails=collaborator_emails or [])
+            owner = resolver.by_email(owner_email)
+            if not owner:
+                raise ValueError(f"Owner with email {owner_email} not found")
+            
+            users_by_email = resolve_users_by_email(collaborator_emails or [])
+            collaborators = [users_by_email[e] for e in dict.fromkeys(collaborator_emails or []) if e in users_by_email]
 
-        notification_service.create_notifications_for_task(task)
+            task = Task(title=title, description=description, duedate=duedate, status=status, owner=owner, collaborators=collaborators, notes=notes, priority=priority)
 
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(int(current_user_id))
+            if project_id:
+                project = Project.query.get(project_id)
+                if project:
+                    task.project = project
 
-        # Send email notifications to all involved users
-        if current_user:
-            print(f"DEBUG: Current user: {current_user.email}")
-            print(f"DEBUG: Task owner: {owner.email}")
-            print(f"DEBUG: Collaborators: {[c.email for c in collaborators]}")
-            
-            # Send task creation notification to everyone except the creator
-            try:
-                send_task_creation_email_notification(task, current_user)
-            except Exception as e:
-                print(f"DEBUG: Error sending task creation email: {e}")
-            
-            # Also send individual assignment notifications
-            if current_user.id != owner.id:
-                try:
-                    send_task_assignment_email_notification(task, current_user, owner)
-                except Exception as e:
-                    print(f"DEBUG: Error sending owner assignment email: {e}")
-            
-            for collaborator in collaborators:
-                if collaborator.id != current_user.id:
-                    try:
-                        send_task_assignment_email_notification(task, current_user, collaborator)
-                    except Exception as e:
-                        print(f"DEBUG: Error sending collaborator assignment email to {collaborator.email}: {e}")
+            if attachments:
+                for file in attachments:
+                    attachment = Attachment(filename=file.filename, content=file.read(), task=task)
+                    db.session.add(attachment)
+
+            db.session.add(task)
+            db.session.flush()
+
+            notification_service.create_notifications_for_task(task)
+
+            current_user = resolver.get(get_jwt_identity())
+            record_status_transitions(
+                [(task.id, None, task.status or TaskStatus.UNASSIGNED)],
+                current_user.id if current_user else None,
+            )
+
+            # Creation and assignment emails go out once the task is committed
+            if current_user:
+                publish(TaskCreated(task.id, current_user.id, tuple(u.id for u in [owner] + collaborators)))
 
         return task
     
@@ -119,6 +101,28 @@ def get_task(task_id):
         db.session.rollback()
         raise RuntimeError(f"Database error while retrieving task {task_id}: {e}")
     
+def get_task_etag(task_id):
+    """ETag of a task's current representation from one narrow query; None if it does not exist."""
+    row = db.session.execute(
+        select(Task.version, Project.version)
+        .outerjoin(Project, Task.project_id == Project.id)
+        .where(Task.id == task_id)
+    ).first()
+    return etag("task", task_id, *row) if row else None
+
+def get_user_tasks_etag(user_id):
+    """ETag of a user's task list, from aggregates over the same rows get_user_tasks returns.
+
+    The sums move whenever any task (or its project) gets a new version, which a
+    max() would miss for all but the newest row; the id sum and max track membership.
+    """
+    row = db.session.execute(
+        select(func.count(Task.id), func.sum(Task.version), func.sum(Task.id), func.max(Task.id), func.sum(Project.version))
+        .outerjoin(Project, Task.project_id == Project.id)
+        .where((Task.owner_id == user_id) | Task.collaborators.any(User.id == user_id))
+    ).one()
+    return aggregate_etag(f"tasks-u{user_id}", *row)
+
 def get_user_tasks(owner_id):
     try:
         user = User.query.get(owner_id)
@@ -184,200 +188,141 @@ def link_task_to_project(task_id, project_id):
         db.session.rollback()
         raise RuntimeError(f"Database error while linking task {task_id} to project {project_id}: {e}")
 
-def update_task(task_id, data, new_files):
+def _parse_date(value):
     try:
-        print(f"Starting update for task {task_id}")
-        print(f"Received data: {data}")
-        print(f"Received files: {new_files}")
-        
-        task = Task.query.get(task_id)
-        if not task:
-            raise ValueError(f"Task with task ID {task_id} not found")
-        
-        old_values = {
-            'status': task.status,
-            'duedate': task.duedate,
-            'priority': task.priority,
-            'owner_id': task.owner_id
-        }
-        
-        # Track changes for notifications
-        updated_fields = []
-        
-        # Update fields and track changes
-        if "title" in data and data["title"] != task.title:
-            task.title = data["title"]
-            updated_fields.append({
-                "field": "title",
-                "old_value": task.title,
-                "new_value": data["title"]
-            })
-        
-        if "description" in data and data["description"] != task.description:
-            task.description = data["description"]
-            updated_fields.append({
-                "field": "description", 
-                "old_value": task.description,
-                "new_value": data["description"]
-            })
-            
-        # Due date change - IMPORTANT: This triggers notifications
-        if "duedate" in data and data["duedate"]:
-            try:
-                new_duedate = datetime.fromisoformat(data["duedate"].replace('Z', '+00:00'))
-                if task.duedate != new_duedate:
-                    updated_fields.append({
-                        "field": "due date",
-                        "old_value": task.duedate.strftime('%Y-%m-%d') if task.duedate else "Not set",
-                        "new_value": new_duedate.strftime('%Y-%m-%d')
-                    })
-                    task.duedate = new_duedate
-            except ValueError as e:
-                print(f"Date parsing error: {e}")
-                raise ValueError(f"Invalid date format: {data['duedate']}")
-        
-        # Status change
-        if "status" in data and data["status"]:
-            try:
-                new_status = TaskStatus(data["status"])
-                if task.status != new_status:
-                    updated_fields.append({
-                        "field": "status",
-                        "old_value": task.status.value,
-                        "new_value": new_status.value
-                    })
-                    task.status = new_status
-            except ValueError:
-                raise ValueError(f"Invalid status: {data['status']}")
-        
-        # Priority change
-        if "priority" in data:
-            new_priority = int(data["priority"])
-            if task.priority != new_priority:
-                updated_fields.append({
-                    "field": "priority",
-                    "old_value": str(task.priority),
-                    "new_value": str(new_priority)
-                })
-                task.priority = new_priority
-        
-        # Notes change
-        if "notes" in data and data["notes"] != task.notes:
-            task.notes = data["notes"]
-            updated_fields.append({
-                "field": "notes",
-                "old_value": task.notes,
-                "new_value": data["notes"]
-            })
-
-        # Owner change
-        if "owner" in data:
-            owner = User.query.filter_by(email=data["owner"]).first()
-            if not owner:
-                raise ValueError(f"Owner with email {data['owner']} not found")
-            
-            if owner.id != task.owner_id:
-                updated_fields.append({
-                    "field": "assignee",
-                    "old_value": task.owner.email,
-                    "new_value": owner.email
-                })
-                
-                user_id = get_jwt_identity()  
-                current_user = User.query.get(int(user_id))
-                create_task_assignment_notification(task, current_user, owner)
-                # Add email notification for assignment change
-                from app.services.email_services import send_task_assignment_email_notification
-                send_task_assignment_email_notification(task, current_user, owner)
-                
-                task.owner = owner
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    except ValueError:
+        raise ValueError(f"Invalid date format: {value}")
 
-        # Collaborators change
-        collaborators = data.get("collaborators")
-        if collaborators is not None:
+def update_task(task_id, data, new_files, expected_version=None):
+    try:
+        with unit_of_work():
+            task = Task.query.get(task_id)
+            if not task:
+                raise ValueError(f"Task with task ID {task_id} not found")
+            # Edits made against an older version are refused instead of overwriting
+            check_version(task, expected_version, "task")
+            
+            # The actor, new owner and collaborators all come back in one query
+            collaborators = data.get("collaborators")
             if isinstance(collaborators, str):
                 try:
                     collaborators = json.loads(collaborators)
                 except json.JSONDecodeError:
                     collaborators = []
+            resolver = get_resolver().want(
+                ids=[get_jwt_identity()],
+                emails=[data.get("owner")] + list(collaborators or []),
+            )
+            current_user = resolver.get(get_jwt_identity())
             
-            current_collaborator_emails = [c.email for c in task.collaborators]
-            new_collaborators = [c for c in collaborators if c not in current_collaborator_emails]
-            removed_collaborators = [c for c in current_collaborator_emails if c not in collaborators]
-            
-            # Track collaborator changes
-            if new_collaborators or removed_collaborators:
-                updated_fields.append({
-                    "field": "collaborators",
-                    "old_value": ", ".join(current_collaborator_emails) if current_collaborator_emails else "None",
-                    "new_value": ", ".join(collaborators) if collaborators else "None"
-                })
-            
-            task.collaborators.clear()
-            if collaborators:
-                for email in collaborators:
-                    user = User.query.filter_by(email=email).first()
-                    if user:
-                        task.collaborators.append(user)
-                        
-                        if email in new_collaborators:
-                            user_id = get_jwt_identity()  
-                            current_user = User.query.get(int(user_id))
-                            create_task_assignment_notification(task, current_user, user)
-                            # Add email notification for new collaborator
-                            from app.services.email_services import send_task_assignment_email_notification
-                            send_task_assignment_email_notification(task, current_user, user)
-
-        # Handle attachments
-        if "existing_attachments" in data:
-            existing_attachments = data["existing_attachments"]
-            if isinstance(existing_attachments, str):
+            # Collect the requested values, typed like the columns they go into
+            values = {}
+            for field in ("title", "description", "notes"):
+                if field in data:
+                    values[field] = data[field]
+            if data.get("duedate"):
+                values["duedate"] = _parse_date(data["duedate"])
+            if data.get("status"):
                 try:
-                    existing_attachments = json.loads(existing_attachments)
-                except json.JSONDecodeError:
-                    existing_attachments = []
+                    values["status"] = TaskStatus(data["status"])
+                except ValueError:
+                    raise ValueError(f"Invalid status: {data['status']}")
+            if "priority" in data:
+                values["priority"] = int(data["priority"])
             
-            existing_ids = [att.get("id") for att in existing_attachments if att.get("id")]
-            for att in task.attachments[:]:
-                if att.id not in existing_ids:
-                    db.session.delete(att)
-
-        if new_files:
-            for file in new_files:
-                attachment = Attachment(
-                    filename=file.filename,
-                    content=file.read(),
-                    task=task
-                )
-                db.session.add(attachment)
-            # Track attachment changes
-            updated_fields.append({
-                "field": "attachments",
-                "old_value": f"{len(task.attachments)} files",
-                "new_value": f"{len(task.attachments) + len(new_files)} files"
-            })
-
-        db.session.commit()
+            new_assignees = []
+            if "owner" in data:
+                owner = resolver.by_email(data["owner"])
+                if not owner:
+                    raise ValueError(f"Owner with email {data['owner']} not found")
+                if owner.id != task.owner_id:
+                    # Recorded before the switch so the payload names the previous owner
+                    if current_user:
+                        notification_service.create_task_assignment_notification(task, current_user, owner)
+                    new_assignees.append(owner.id)
+                values["owner"] = owner
+            
+            old_status = task.status
+            updated_fields = apply_changes(task, values, TASK_FIELDS)
 
-        # TRIGGER NOTIFICATIONS FOR ALL CHANGES
-        user_id = get_jwt_identity()  
-        current_user = User.query.get(int(user_id))
-        
-        # Create in-app notifications for any field changes
-        if updated_fields and current_user:
-            create_task_update_notification(task, current_user, updated_fields)
+            # Collaborators change
+            if collaborators is not None:
+                collaborator_changes = sync_collaborators(task, collaborators)
+                if collaborator_changes.added or collaborator_changes.removed:
+                    updated_fields.append({
+                        "field": "collaborators",
+                        "old_value": ", ".join(collaborator_changes.before) or "None",
+                        "new_value": ", ".join(collaborator_changes.after) or "None"
+                    })
+                    for user in collaborator_changes.added:
+                        if current_user:
+                            notification_service.create_task_assignment_notification(task, current_user, user)
+                        new_assignees.append(user.id)
+
+            # Handle attachments
+            removed_attachments = 0
+            if "existing_attachments" in data:
+                existing_attachments = data["existing_attachments"]
+                if isinstance(existing_attachments, str):
+                    try:
+                        existing_attachments = json.loads(existing_attachments)
+                    except json.JSONDecodeError:
+                        existing_attachments = []
+                
+                existing_ids = [att.get("id") for att in existing_attachments if att.get("id")]
+                for att in task.attachments[:]:
+                    if att.id not in existing_ids:
+                        db.session.delete(att)
+                        removed_attachments += 1
+
+            if new_files or removed_attachments:
+                # Track attachment changes
+                updated_fields.append({
+                    "field": "attachments",
+                    "old_value": f"{len(task.attachments)} files",
+                    "new_value": f"{len(task.attachments) - removed_attachments + len(new_files or [])} files"
+                })
+                for file in new_files or []:
+                    attachment = Attachment(
+                        filename=file.filename,
+                        content=file.read(),
+                        task=task
+                    )
+                    db.session.add(attachment)
+                touch(task)
+
+            # A save that changes nothing writes nothing and notifies nobody
+            if not updated_fields:
+                return task
+
+            db.session.flush()
+            if task.status != old_status:
+                record_status_transitions([(task.id, old_status, task.status)], current_user.id if current_user else None)
+
+            # In-app notifications join this transaction; emails wait for the commit
+            if current_user and new_assignees:
+                publish(TaskAssigned(task.id, current_user.id, tuple(new_assignees)))
             
-            # Send email notifications for any field changes (excluding the user who made changes)
-            from app.services.email_services import send_task_update_email_notification
-            send_task_update_email_notification(task, current_user, updated_fields, current_user.id)
+            if current_user:
+                notification_service.create_task_update_notification(task, current_user, updated_fields)
+                publish(TaskUpdated(task.id, current_user.id, tuple(updated_fields)))
 
-        # Update due date notifications if due date changed
-        due_date_changed = any(change.get('field') == 'due date' for change in updated_fields)
-        if due_date_changed:
-            update_notifications_for_task(task)
+            changed = {change["field"] for change in updated_fields}
+            # Reminders follow the due date, and stop once the task is done
+            if "due date" in changed:
+                notification_service.update_notifications_for_task(task)
+            if "status" in changed and task.status == TaskStatus.COMPLETED:
+                notification_service.remove_notifications_for_task(task)
 
         return task
     
+    except StaleDataError:
+        # Someone else committed between our read and our write
+        db.session.rollback()
+        current = db.session.execute(select(Task.version).where(Task.id == task_id)).scalar()
+        raise PreconditionFailed("The task was changed by someone else", current_version=current)
+
     except SQLAlchemyError as e:
         print(f"Database error: {e}")
         db.session.rollback()
@@ -386,4 +331,4 @@ def update_task(task_id, data, new_files):
     except Exception as e:
         print(f"Unexpected error: {e}")
         db.session.rollback()
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,196 @@
+import os
+from datetime import date
+import click
+from sqlalchemy import DDL, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, Project, ProjectProgressSnapshot, ProjectTaskStats, Task, TaskStatus, TASK_STATS_TRIGGERS_SQL
+
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", 500))
+
+STATUS_FIELDS = tuple(status.name.lower() for status in TaskStatus)
+COUNTER_FIELDS = STATUS_FIELDS + ("total", "overdue")
+
+def empty_stats():
+    """Stats of a project that has no tasks (and so no project_task_stats row yet)."""
+    return {
+        "status_counts": {status.value: 0 for status in TaskStatus},
+        "total": 0,
+        "overdue": 0,
+        "overdue_as_of": None,
+        "completion_rate": 0.0,
+    }
+
+def _count(project_ids, today):
+    """The counters recomputed from `tasks` with one grouped query; None means every project."""
+    open_task = Task.status != TaskStatus.COMPLETED
+    query = select(
+        Task.project_id,
+        *[func.count().filter(Task.status == status).label(status.name.lower()) for status in TaskStatus],
+        func.count().label("total"),
+        func.count().filter(open_task & (Task.duedate < today)).label("overdue"),
+    ).where(Task.project_id.isnot(None)).group_by(Task.project_id)
+    if project_ids is not None:
+        query = query.where(Task.project_id.in_(project_ids))
+    return {row.project_id: {field: getattr(row, field) for field in COUNTER_FIELDS} for row in db.session.execute(query)}
+
+def _store(counts, today):
+    """Overwrite the counters of the given projects, zeroing projects whose tasks are all gone."""
+    for project_id, values in counts.items():
+        stmt = insert(ProjectTaskStats).values(project_id=project_id, overdue_as_of=today, version=1, **values)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[ProjectTaskStats.project_id],
+            set_={**values, "overdue_as_of": today, "version": ProjectTaskStats.version + 1},
+        ))
+
+def _count_overdue(project_ids, today):
+    """Open tasks due before `today` per project, counted without touching project_task_stats."""
+    return dict(db.session.execute(
+        select(Task.project_id, func.count())
+        .where(Task.project_id.in_(project_ids), Task.status != TaskStatus.COMPLETED, Task.duedate < today)
+        .group_by(Task.project_id)
+    ).all())
+
+def get_task_stats(project_ids, today=None):
+    """Task counts per project id, read from project_task_stats in one query.
+
+    Rows whose overdue count predates `today` get it recounted as of
+    `today` on read, with one grouped query over those projects. Nothing
+    is written; the nightly reconcile rolls the stored rows forward.
+    """
+    today = today or date.today()
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    try:
+        rows = ProjectTaskStats.query.filter(ProjectTaskStats.project_id.in_(project_ids)).all()
+        stale = {row.project_id for row in rows if row.overdue_as_of < today}
+        overdue = _count_overdue(stale, today) if stale else {}
+        stats = {}
+        for row in rows:
+            stats[row.project_id] = row.to_dict()
+            if row.project_id in stale:
+                stats[row.project_id].update(overdue=overdue.get(row.project_id, 0), overdue_as_of=today.isoformat())
+        return {project_id: stats.get(project_id) or empty_stats() for project_id in project_ids}
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while retrieving task stats: {e}")
+
+def reconcile_task_stats(fix=True, today=None):
+    """Compare every project's counters with a recount of its tasks.
+
+    Returns one {"project_id", "field", "stored", "actual"} entry per
+    counter that drifted. Overdue counts from an earlier day are not drift,
+    just stale. With `fix`, every row is rewritten from the recount as of
+    `today`. Task writes wait while this runs so none of them is lost.
+    """
+    today = today or date.today()
+    try:
+        # Blocks the triggers' row updates (not plain reads) until commit
+        db.session.execute(text("LOCK TABLE project_task_stats IN EXCLUSIVE MODE"))
+        actual = _count(None, today)
+        stored = {row.project_id: row for row in db.session.execute(select(ProjectTaskStats)).scalars()}
+
+        drift = []
+        for project_id in sorted(actual.keys() | stored.keys()):
+            row = stored.get(project_id)
+            counts = actual.get(project_id, dict.fromkeys(COUNTER_FIELDS, 0))
+            for field in COUNTER_FIELDS:
+                if field == "overdue" and row is not None and row.overdue_as_of != today:
+                    continue
+                have = getattr(row, field) if row is not None else 0
+                if have != counts[field]:
+                    drift.append({"project_id": project_id, "field": field, "stored": have, "actual": counts[field]})
+
+        if fix:
+            _store({project_id: actual.get(project_id, dict.fromkeys(COUNTER_FIELDS, 0))
+                    for project_id in actual.keys() | stored.keys()}, today)
+            db.session.commit()
+        else:
+            db.session.rollback()
+        return drift
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while reconciling task stats: {e}")
+
+def install_task_stats(today=None):
+    """Create project_task_stats and its triggers where missing, then backfill every counter.
+
+    For databases created before the counters existed. Safe to re-run: the
+    table is only created if absent, the functions and trigger are replaced,
+    and the backfill is a reconcile in the same transaction, so no task
+    written meanwhile is missed. Returns the counters that were repaired.
+    """
+    try:
+        connection = db.session.connection()
+        ProjectTaskStats.__table__.create(connection, checkfirst=True)
+        connection.execute(DDL(TASK_STATS_TRIGGERS_SQL))
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while installing task stats: {e}")
+    return reconcile_task_stats(fix=True, today=today)
+
+def take_progress_snapshots(batch_size=SNAPSHOT_BATCH_SIZE, today=None):
+    """Record every project's counters as today's progress snapshot; returns how many were written.
+
+    Projects are walked in id order, `batch_size` at a time, each batch
+    read from project_task_stats and committed on its own. Re-running on
+    the same day overwrites that day's rows, so the job is safe to retry.
+    """
+    today = today or date.today()
+    written, after = 0, 0
+    try:
+        while True:
+            project_ids = db.session.execute(
+                select(Project.id).where(Project.id > after).order_by(Project.id).limit(batch_size)
+            ).scalars().all()
+            if not project_ids:
+                return written
+            rows = [
+                {
+                    "project_id": project_id,
+                    "day": today,
+                    **{status.name.lower(): stats["status_counts"][status.value] for status in TaskStatus},
+                    "overdue": stats["overdue"],
+                }
+                for project_id, stats in get_task_stats(project_ids, today=today).items()
+            ]
+            stmt = insert(ProjectProgressSnapshot).values(rows)
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=[ProjectProgressSnapshot.project_id, ProjectProgressSnapshot.day],
+                set_={field: stmt.excluded[field] for field in STATUS_FIELDS + ("overdue",)},
+            ))
+            db.session.commit()
+            written += len(rows)
+            after = project_ids[-1]
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while taking progress snapshots: {e}")
+
+def init_app(app):
+    """Register the daily cron jobs: `flask reconcile-task-stats` after midnight, `flask snapshot-project-progress` before.
+
+    `flask install-task-stats` is run once per deploy, before the app serves traffic.
+    """
+    @app.cli.command("install-task-stats")
+    def install_task_stats_command():
+        """Install the task counter triggers on an existing database and backfill the counters."""
+        drift = install_task_stats()
+        click.echo(f"Task stats triggers installed; {len(drift)} counter(s) backfilled")
+
+    @app.cli.command("reconcile-task-stats")
+    @click.option("--check", is_flag=True, help="Only report drift; exit with status 1 if any is found.")
+    def reconcile_task_stats_command(check):
+        """Recount every project's task counters and repair any drift."""
+        drift = reconcile_task_stats(fix=not check)
+        for entry in drift:
+            click.echo(f"project {entry['project_id']}: {entry['field']} stored {entry['stored']}, actual {entry['actual']}")
+        click.echo(f"{len(drift)} drifted counter(s){'' if check else ' repaired'}")
+        if check and drift:
+            raise SystemExit(1)
+
+    @app.cli.command("snapshot-project-progress")
+    @click.option("--batch-size", default=SNAPSHOT_BATCH_SIZE, show_default=True, help="Projects per transaction.")
+    def snapshot_project_progress_command(batch_size):
+        """Record today's task counts of every project for burndown charts."""
+        click.echo(f"{take_progress_snapshots(batch_size=batch_size)} project snapshot(s) written")
@@ -0,0 +1,114 @@
+import os
+from datetime import date
+from sqlalchemy import case, false, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
+from app.models import db, Task, Project, TaskStatus
+
+# Also stops the recursion should bad data ever put a task under its own subtree
+TASK_TREE_MAX_DEPTH = int(os.getenv("TASK_TREE_MAX_DEPTH", 20))
+
+def _subtree_rows(roots, max_depth):
+    """The `roots` SELECT of tasks and their descendants down to `max_depth`, in one recursive query."""
+    columns = lambda t: (t.id, t.parent_id, t.title, t.status, t.duedate, t.priority, t.owner_id)
+    tree = select(*columns(Task), literal(0).label("depth")).where(roots).cte("task_tree", recursive=True)
+    child = aliased(Task)
+    tree = tree.union_all(
+        select(*columns(child), (tree.c.depth + 1).label("depth"))
+        .where(child.parent_id == tree.c.id, tree.c.depth < max_depth)
+    )
+    # Nodes on the last level say whether anything was cut off below them
+    below = aliased(Task)
+    has_more = case(
+        (tree.c.depth == max_depth, select(below.id).where(below.parent_id == tree.c.id).exists()),
+        else_=false(),
+    )
+    return db.session.execute(
+        select(tree, has_more.label("has_more")).order_by(tree.c.depth, tree.c.id)
+    ).all()
+
+def _empty_rollup():
+    return {"subtasks": 0, "completed": 0, "completion": None, "earliest_due": None, "overdue": 0}
+
+def _build(rows):
+    """Nest the rows under their parents and roll each subtree up into its root, bottom-up."""
+    today = date.today()
+    nodes = {}
+    for row in rows:
+        nodes[row.id] = {
+            "id": row.id,
+            "parent_id": row.parent_id,
+            "title": row.title,
+            "status": row.status.value,
+            "duedate": row.duedate.isoformat() if row.duedate else None,
+            "priority": row.priority,
+            "owner_id": row.owner_id,
+            "depth": row.depth,
+            "has_more_subtasks": bool(row.has_more),
+            "rollup": _empty_rollup(),
+            "subtasks": [],
+        }
+
+    roots = []
+    # Deepest first, so every node's rollup is final before it is added to its parent
+    for row in reversed(rows):
+        node = nodes[row.id]
+        rollup = node["rollup"]
+        if rollup["subtasks"]:
+            rollup["completion"] = round(100 * rollup["completed"] / rollup["subtasks"], 1)
+        parent = nodes.get(row.parent_id)
+        if parent is None or row.depth == 0:
+            roots.append(node)
+            continue
+        parent["subtasks"].append(node)
+        into = parent["rollup"]
+        done = row.status == TaskStatus.COMPLETED
+        into["subtasks"] += 1 + rollup["subtasks"]
+        into["completed"] += int(done) + rollup["completed"]
+        into["overdue"] += int(not done and row.duedate is not None and row.duedate < today) + rollup["overdue"]
+        dues = [d for d in (into["earliest_due"], rollup["earliest_due"]) if d]
+        if not done and row.duedate:
+            dues.append(row.duedate.isoformat())
+        into["earliest_due"] = min(dues) if dues else None
+
+    for node in nodes.values():
+        node["subtasks"].reverse()
+    roots.reverse()
+    return roots
+
+def _depth(max_depth):
+    if max_depth is None:
+        return TASK_TREE_MAX_DEPTH
+    return min(max(int(max_depth), 0), TASK_TREE_MAX_DEPTH)
+
+def get_task_tree(task_id, max_depth=None):
+    """A task with its subtasks nested `max_depth` levels deep, each node rolled up.
+
+    A node's rollup covers the loaded subtasks below it: how many there are,
+    how many are completed (and the percentage), the earliest due date among
+    open ones and how many open ones are overdue.
+    """
+    try:
+        rows = _subtree_rows(Task.id == task_id, _depth(max_depth))
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while loading the subtasks of task {task_id}: {e}")
+    if not rows:
+        raise ValueError(f"Task with ID {task_id} not found.")
+    return _build(rows)[0]
+
+def get_project_task_trees(project_id, max_depth=None):
+    """Every top-level task of a project as a tree, like get_task_tree."""
+    parent = aliased(Task)
+    roots = (Task.project_id == project_id) & (
+        Task.parent_id.is_(None)
+        | ~select(parent.id).where(parent.id == Task.parent_id, parent.project_id == project_id).exists()
+    )
+    try:
+        if db.session.get(Project, project_id) is None:
+            raise ValueError(f"Project with ID {project_id} not found.")
+        rows = _subtree_rows(roots, _depth(max_depth))
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while loading the task tree of project {project_id}: {e}")
+    return _build(rows)
@@ -0,0 +1,143 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import db, EmailCooldown
+
+class MemoryThrottleStore:
+    """In-process LRU of last-send times with TTL eviction and a size cap.
+
+    Entries are kept in send order, so expired keys and overflow are always
+    at the front and every check is O(1) amortised.
+    """
+
+    def __init__(self, ttl, max_entries=10000, clock=time.time):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"allowed": 0, "blocked": 0, "expired": 0, "evicted": 0}
+
+    def hit(self, key):
+        """Record a send for `key` and return True, or return False if it is still cooling down."""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            if key in self._entries:
+                self.counters["blocked"] += 1
+                return False
+            self._entries[key] = now
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evicted"] += 1
+            self.counters["allowed"] += 1
+            return True
+
+    def _expire(self, now):
+        cutoff = now - self.ttl
+        while self._entries:
+            oldest_key, sent_at = next(iter(self._entries.items()))
+            if sent_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+            self.counters["expired"] += 1
+
+    def stats(self):
+        with self._lock:
+            approx_bytes = sys.getsizeof(self._entries) + sum(
+                sys.getsizeof(k) + sys.getsizeof(v) for k, v in self._entries.items()
+            )
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": approx_bytes,
+                **self.counters,
+            }
+
+class DatabaseThrottleStore:
+    """Shared cooldown table so every worker applies the same throttle.
+
+    Each check is a single upsert that only overwrites rows whose cooldown
+    has passed, so two workers racing on the same key cannot both send.
+    Expired rows are swept every `sweep_every` checks and the table is
+    trimmed back to `max_entries` at the same time.
+    """
+
+    def __init__(self, ttl, max_entries=100000, sweep_every=500, clock=time.time):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self.clock = clock
+        self._checks = 0
+        self._lock = threading.Lock()
+        self.counters = {"allowed": 0, "blocked": 0, "evicted": 0, "errors": 0}
+
+    def _insert(self, conn):
+        if conn.dialect.name == "postgresql":
+            return postgresql.insert(EmailCooldown)
+        return sqlite.insert(EmailCooldown)
+
+    def hit(self, key):
+        now = self.clock()
+        try:
+            with db.engine.begin() as conn:
+                stmt = self._insert(conn).values(key=key, sent_at=now)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[EmailCooldown.key],
+                    set_={"sent_at": stmt.excluded.sent_at},
+                    where=EmailCooldown.sent_at <= now - self.ttl,
+                ).returning(EmailCooldown.key)
+                allowed = conn.execute(stmt).first() is not None
+        except Exception as e:
+            # Never let the throttle table block an email
+            print(f"DEBUG: Throttle store error, allowing send: {e}")
+            self.counters["errors"] += 1
+            return True
+
+        with self._lock:
+            self.counters["allowed" if allowed else "blocked"] += 1
+            self._checks += 1
+            sweep = self._checks % self.sweep_every == 0
+        if sweep:
+            self.sweep(now)
+        return allowed
+
+    def sweep(self, now=None):
+        """Delete expired rows and trim the table to `max_entries`."""
+        now = self.clock() if now is None else now
+        with db.engine.begin() as conn:
+            removed = conn.execute(
+                delete(EmailCooldown).where(EmailCooldown.sent_at <= now - self.ttl)
+            ).rowcount
+            keep = (
+                select(EmailCooldown.key)
+                .order_by(EmailCooldown.sent_at.desc())
+                .limit(self.max_entries)
+            )
+            removed += conn.execute(
+                delete(EmailCooldown).where(EmailCooldown.key.not_in(keep))
+            ).rowcount
+        self.counters["evicted"] += removed
+        return removed
+
+    def stats(self):
+        entries = db.session.execute(select(func.count()).select_from(EmailCooldown)).scalar()
+        return {
+            "backend": "database",
+            "entries": entries,
+            "max_entries": self.max_entries,
+            **self.counters,
+        }
+
+def build_throttle_store(ttl):
+    """Pick the backend from EMAIL_THROTTLE_BACKEND ("memory" or "database")."""
+    backend = os.getenv("EMAIL_THROTTLE_BACKEND", "memory").lower()
+    max_entries = int(os.getenv("EMAIL_THROTTLE_MAX_ENTRIES", 10000))
+    if backend == "database":
+        return DatabaseThrottleStore(ttl, max_entries=max_entries)
+    return MemoryThrottleStore(ttl, max_entries=max_entries)
@@ -0,0 +1,126 @@
+import bisect
+import os
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, User
+from app.services.response_cache import response_cache
+
+USER_SEARCH_LIMIT = int(os.getenv("USER_SEARCH_LIMIT", 10))
+USER_SEARCH_MAX_LIMIT = int(os.getenv("USER_SEARCH_MAX_LIMIT", 50))
+# Writes through the app bump the "users" table version; a periodic full
+# rebuild catches anything that bypasses it (e.g. an edit made by hand)
+USER_INDEX_MAX_AGE = float(os.getenv("USER_INDEX_MAX_AGE", 600))
+
+def _normalize(text):
+    return " ".join((text or "").lower().split())
+
+def _keys(name, email):
+    """Strings a user can be found by prefix of: the email, the full name and each later word of the name."""
+    words = _normalize(name).split(" ")
+    return ({_normalize(email)} | {" ".join(words[i:]) for i in range(len(words))}) - {""}
+
+class UserPrefixIndex:
+    """Sorted (key, user id) pairs answering typeahead lookups with a binary search.
+
+    The index is an immutable snapshot swapped in whole, so lookups never
+    take a lock. It is brought up to date lazily: a lookup that sees a new
+    "users" table version from the invalidation bus, whichever worker made
+    the write, rebuilds it from scratch, as does one made after
+    USER_INDEX_MAX_AGE.
+    """
+
+    def __init__(self, max_age=USER_INDEX_MAX_AGE, clock=time.monotonic):
+        self.max_age = max_age
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._snapshot = ([], {})
+        self._version = None
+        self._built_at = None
+        self.counters = {"searches": 0, "rebuilds": 0}
+
+    def build(self, rows):
+        """Replace the index with `rows` of (id, name, email, role)."""
+        users, keys = self._entries(rows)
+        keys.sort()
+        self._snapshot = (keys, users)
+        self._built_at = self.clock()
+        self.counters["rebuilds"] += 1
+
+    def _entries(self, rows):
+        users, keys = {}, []
+        for user_id, name, email, role in rows:
+            users[user_id] = {"id": user_id, "name": name, "email": email, "role": role}
+            keys.extend((key, user_id) for key in _keys(name, email))
+        return users, keys
+
+    def search(self, prefix, limit=USER_SEARCH_LIMIT):
+        """Up to `limit` users with a key starting with `prefix`, in key order."""
+        self.counters["searches"] += 1
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        keys, users = self._snapshot
+        results, seen = [], set()
+        i = bisect.bisect_left(keys, (prefix,))
+        while i < len(keys) and len(results) < limit:
+            key, user_id = keys[i]
+            if not key.startswith(prefix):
+                break
+            if user_id not in seen:
+                seen.add(user_id)
+                results.append(users[user_id])
+            i += 1
+        return results
+
+    def sync(self):
+        """Catch up with the users table if its version moved since the last sync."""
+        version = response_cache.versions(("users",))
+        if version == self._version and not self._expired():
+            return
+        with self._lock:
+            if version == self._version and not self._expired():
+                return
+            # The bus only says the table changed, not which rows or how,
+            # so any change (insert, edit or delete) rebuilds the snapshot
+            self.build(
+                (row.id, row.name, row.email, row.role.value)
+                for row in db.session.execute(select(User.id, User.name, User.email, User.role))
+            )
+            # Versions are read before the data, so a concurrent write only causes one extra sync
+            self._version = version
+
+    def _expired(self):
+        return self._built_at is not None and self.clock() - self._built_at >= self.max_age
+
+    def stats(self):
+        keys, users = self._snapshot
+        return {"users": len(users), "keys": len(keys), **self.counters}
+
+user_index = UserPrefixIndex()
+
+def search_users(q, limit=None):
+    """Typeahead lookup of users by the start of their email, name or any word of their name."""
+    if limit in (None, ""):
+        limit = USER_SEARCH_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("limit must be an integer")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+    try:
+        user_index.sync()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while indexing users: {e}")
+    return user_index.search(q or "", min(limit, USER_SEARCH_MAX_LIMIT))
+
+def init_app(app):
+    """Build the index from the app's database on first use."""
+    user_index.reset()
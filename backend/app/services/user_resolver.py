@@ -0,0 +1,108 @@
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import or_
+from werkzeug.local import LocalProxy
+from app.models import db, User
+
+class UserResolver:
+    """Request-scoped identity map for users, keyed by id and by email.
+
+    Ids and emails asked for with `want()` are queued and fetched together
+    in one query the next time anything is looked up; results are memoized
+    for the rest of the request. Misses are not memoized, so a user created
+    later in the same request is still found.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._by_id = {}
+        self._by_email = {}
+        self._pending_ids = set()
+        self._pending_emails = set()
+        self.queries = 0
+
+    def want(self, ids=(), emails=()):
+        """Queue ids/emails for the next batched load."""
+        for user_id in ids:
+            user_id = _as_id(user_id)
+            if user_id is not None and user_id not in self._by_id:
+                self._pending_ids.add(user_id)
+        for email in emails:
+            if email and email not in self._by_email:
+                self._pending_emails.add(email)
+        return self
+
+    def prime(self, users):
+        """Remember users the caller already loaded."""
+        for user in users:
+            self._by_id[user.id] = user
+            self._by_email[user.email] = user
+        return self
+
+    def _load(self):
+        if not self._pending_ids and not self._pending_emails:
+            return
+        clauses = []
+        if self._pending_ids:
+            clauses.append(User.id.in_(self._pending_ids))
+        if self._pending_emails:
+            clauses.append(User.email.in_(self._pending_emails))
+        self._pending_ids = set()
+        self._pending_emails = set()
+        self.queries += 1
+        self.prime(User.query.filter(or_(*clauses)).all())
+
+    def get(self, user_id):
+        user_id = _as_id(user_id)
+        if user_id is None:
+            return None
+        self.want(ids=[user_id])._load()
+        return self._by_id.get(user_id)
+
+    def by_email(self, email):
+        self.want(emails=[email])._load()
+        return self._by_email.get(email)
+
+    def by_ids(self, ids):
+        """{id: User} for the ids that exist, in one query at most."""
+        ids = [i for i in (_as_id(i) for i in ids) if i is not None]
+        self.want(ids=ids)._load()
+        return {i: self._by_id[i] for i in ids if i in self._by_id}
+
+    def by_emails(self, emails):
+        """{email: User} for the emails that exist, in one query at most."""
+        emails = [e for e in emails if e]
+        self.want(emails=emails)._load()
+        return {e: self._by_email[e] for e in emails if e in self._by_email}
+
+    def current_user(self):
+        """The User behind the request's JWT identity, or None."""
+        return self.get(get_jwt_identity())
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def get_resolver():
+    """The resolver for the current request (or app context), bound to the live session."""
+    resolver = g.get("_user_resolver")
+    session = db.session()
+    if resolver is None or resolver.session is not session:
+        resolver = g._user_resolver = UserResolver(session)
+    return resolver
+
+def register_user_lookup(jwt):
+    """Expose the resolver through flask_jwt_extended's `current_user`.
+
+    The loader returns a lazy proxy rather than the user itself: the lookup is
+    only queued, so it batches with the route's own lookups, and a missing user
+    reads as falsy instead of failing the request with a 401 inside
+    `jwt_required`. Routes keep answering 404 for unknown users.
+    """
+    @jwt.user_lookup_loader
+    def _lookup_user(jwt_header, jwt_data):
+        identity = jwt_data.get("sub")
+        get_resolver().want(ids=[identity])
+        return LocalProxy(lambda: get_resolver().get(identity))
@@ -1,6 +1,13 @@
+import os
 from app.models import db, User, UserRole
 from flask import jsonify 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from app.services.response_cache import cached_query
+
+DIRECTORY_PAGE_SIZE = int(os.getenv("USER_DIRECTORY_PAGE_SIZE", 100))
+DIRECTORY_MAX_PAGE_SIZE = int(os.getenv("USER_DIRECTORY_MAX_PAGE_SIZE", 1000))
+DIRECTORY_EXPORT_BATCH = int(os.getenv("USER_DIRECTORY_EXPORT_BATCH", 1000))
 
 def create_user(name, email, role, password):
     """Create and save a new user"""
@@ -29,15 +36,89 @@ def validate_login(email, password):
         return user
     return None
 
+@cached_query("users")
 def get_users_info():
     try:
-        users = User.query.all()
-        users_data = [
-            {"id": user.id, "role": user.role.value, "name": user.name, "email": user.email} 
-            for user in users
-        ]
+        users_data = [_directory_entry(row) for row in db.session.execute(_directory_query())]
 
         return users_data
     
     except SQLAlchemyError as e:
         return jsonify({"error": "Database error", "message": "Unable to fetch users."})
+
+# --- Directory ---------------------------------------------------------------
+# Only the four public columns are selected, as plain rows, so listing users
+# never loads password hashes or builds ORM objects. Pages are keyed on id.
+
+def _directory_query(roles=None):
+    stmt = select(User.id, User.role, User.name, User.email).order_by(User.id)
+    if roles:
+        stmt = stmt.where(User.role.in_(roles))
+    return stmt
+
+def _directory_entry(row):
+    return {"id": row.id, "role": row.role.value, "name": row.name, "email": row.email}
+
+def _parse_roles(roles):
+    """UserRole members from role names, e.g. ["staff", "MANAGER"] or "staff,manager"."""
+    if isinstance(roles, str):
+        roles = roles.split(",")
+    parsed = []
+    for role in roles or []:
+        if isinstance(role, UserRole):
+            parsed.append(role)
+        elif role.strip():
+            try:
+                parsed.append(UserRole[role.strip().upper()])
+            except KeyError as exc:
+                raise ValueError(f"Invalid role: {role}") from exc
+    return parsed
+
+def _as_int(value, name, default):
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+def get_user_directory(roles=None, after=None, limit=None):
+    """One page of users ordered by id, optionally limited to some roles.
+
+    Pass the returned `next_after` as `after` to get the next page; it is
+    None on the last one.
+    """
+    roles = _parse_roles(roles)
+    after = _as_int(after, "after", 0)
+    limit = _as_int(limit, "limit", DIRECTORY_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    limit = min(limit, DIRECTORY_MAX_PAGE_SIZE)
+
+    try:
+        rows = db.session.execute(_directory_query(roles).where(User.id > after).limit(limit + 1)).all()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise RuntimeError(f"Database error while listing users: {e}")
+    return {
+        "users": [_directory_entry(row) for row in rows[:limit]],
+        "next_after": rows[limit - 1].id if len(rows) > limit else None,
+    }
+
+def iter_user_directory(roles=None, batch_size=DIRECTORY_EXPORT_BATCH):
+    """Every user (of `roles`), fetched in keyset batches so exports use flat memory.
+
+    Roles are validated now; the rows are read as the result is iterated.
+    """
+    roles = _parse_roles(roles)
+
+    def entries():
+        after = 0
+        while True:
+            rows = db.session.execute(_directory_query(roles).where(User.id > after).limit(batch_size)).all()
+            for row in rows:
+                yield _directory_entry(row)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1].id
+    return entries()
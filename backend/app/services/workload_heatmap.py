@@ -0,0 +1,75 @@
+import os
+from datetime import timedelta
+import numpy as np
+
+WORKLOAD_DAILY_CAPACITY = int(os.getenv("WORKLOAD_DAILY_CAPACITY", 2))
+
+class WorkloadHeatmap:
+    """Per-user load matrices over a date range, built from parallel task arrays.
+
+    Each position of the input arrays is one (user, task) assignment: the
+    user id, the task's due day as an offset from `start` (-1 if it was
+    already overdue), its priority and its status code. Everything is done
+    with bincount, reduceat and cumsum over whole arrays; the only Python
+    loops are over users and weeks when the result is serialized.
+
+    Overdue work counts against the first day. A user is overloaded from
+    the first day on which the work due so far exceeds `capacity` tasks
+    per day elapsed.
+    """
+
+    def __init__(self, user_ids, days, priorities, statuses, start, n_days, n_statuses, capacity=WORKLOAD_DAILY_CAPACITY):
+        self.start = start
+        self.n_days = n_days
+        self.capacity = capacity
+        # User ids are small dense integers, so a lookup table maps them to rows without sorting
+        user_ids = np.asarray(user_ids)
+        present = np.bincount(user_ids) > 0
+        self.users = np.flatnonzero(present)
+        row = (np.cumsum(present) - 1)[user_ids]
+        n_users = len(self.users)
+        days = np.asarray(days)
+
+        cell = row * n_days + np.maximum(days, 0)
+        self.tasks = np.bincount(cell, minlength=n_users * n_days).reshape(n_users, n_days)
+        self.load = (
+            np.bincount(cell, weights=np.asarray(priorities), minlength=n_users * n_days)
+            .reshape(n_users, n_days)
+            .astype(np.int64)
+        )
+        self.overdue = np.bincount(row[days < 0], minlength=n_users)
+        self.statuses = np.bincount(
+            row * n_statuses + np.asarray(statuses), minlength=n_users * n_statuses
+        ).reshape(n_users, n_statuses)
+
+        # Columns where a new Monday-based week begins
+        week = (np.arange(n_days) + start.weekday()) // 7
+        self.week_columns = np.flatnonzero(np.diff(week, prepend=-1))
+        self.weekly_tasks = np.add.reduceat(self.tasks, self.week_columns, axis=1) if n_users else self.tasks
+        self.weekly_load = np.add.reduceat(self.load, self.week_columns, axis=1) if n_users else self.load
+
+        over = np.cumsum(self.tasks, axis=1) > capacity * np.arange(1, n_days + 1)
+        self.overloaded_from = np.where(over.any(axis=1), over.argmax(axis=1), -1)
+        self.overloaded_days = (self.tasks > capacity).sum(axis=1)
+
+    def to_dict(self, status_labels):
+        """JSON-ready matrices; rows follow `users` and columns the days (or weeks) of the range."""
+        return {
+            "from": self.start.isoformat(),
+            "to": (self.start + timedelta(days=self.n_days - 1)).isoformat(),
+            "capacity": self.capacity,
+            "users": self.users.tolist(),
+            "week_starts": [
+                (self.start + timedelta(days=int(column) - (self.start.weekday() if i == 0 else 0))).isoformat()
+                for i, column in enumerate(self.week_columns)
+            ],
+            "daily": {"tasks": self.tasks.tolist(), "load": self.load.tolist()},
+            "weekly": {"tasks": self.weekly_tasks.tolist(), "load": self.weekly_load.tolist()},
+            "overdue": self.overdue.tolist(),
+            "status_counts": {label: self.statuses[:, i].tolist() for i, label in enumerate(status_labels)},
+            "overloaded_from": [
+                (self.start + timedelta(days=day)).isoformat() if day >= 0 else None
+                for day in self.overloaded_from.tolist()
+            ],
+            "overloaded_days": self.overloaded_days.tolist(),
+        }
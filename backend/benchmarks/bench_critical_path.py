@@ -0,0 +1,64 @@
+"""Micro-benchmark for the critical-path engine.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_critical_path
+
+Builds the schedule of a 10k-task project whose tasks each depend on up
+to three earlier ones, then times incremental updates (a due date moving,
+a task being completed) against rebuilding from scratch.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from app.services.critical_path import CriticalPath
+
+TASKS = 10_000
+UPDATES = 500
+TODAY = date(2025, 1, 6)
+
+
+def make_project(count, seed=1):
+    rng = random.Random(seed)
+    tasks = {i: (TODAY + timedelta(days=rng.randint(0, 365)), rng.random() < 0.3) for i in range(1, count + 1)}
+    edges = {
+        (i, rng.randint(max(1, i - 200), i - 1))
+        for i in range(2, count + 1)
+        for _ in range(rng.randint(0, 3))
+    }
+    return tasks, edges
+
+
+def main():
+    tasks, edges = make_project(TASKS)
+    deadline = TODAY + timedelta(days=300)
+
+    started = time.perf_counter()
+    schedule = CriticalPath(tasks, edges, deadline=deadline, today=TODAY)
+    print(f"{'full build (10k tasks, %d edges)' % len(edges):<44} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+
+    started = time.perf_counter()
+    schedule.result()
+    print(f"{'result() serialization':<44} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+
+    rng = random.Random(2)
+    touched = 0
+    started = time.perf_counter()
+    for _ in range(UPDATES):
+        task_id = rng.randint(1, TASKS)
+        due, completed = tasks[task_id]
+        tasks[task_id] = (due + timedelta(days=rng.randint(-5, 5)), rng.random() < 0.3)
+        touched += schedule.update(task_id, *tasks[task_id])
+    elapsed = time.perf_counter() - started
+    print(f"{'incremental update (avg of %d)' % UPDATES:<44} {elapsed / UPDATES * 1e3:10.3f} ms"
+          f"   ({touched / UPDATES:.0f} tasks revisited on average)")
+
+    started = time.perf_counter()
+    rebuilt = CriticalPath(tasks, edges, deadline=deadline, today=TODAY)
+    print(f"{'rebuild after the same updates':<44} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+    assert rebuilt.ef == schedule.ef and rebuilt.lf == schedule.lf
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark for email body rendering.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_email_templates
+
+Compares rendering one shared body per event against rendering a body per
+recipient, and measures building the task context snapshot.
+"""
+import timeit
+from types import SimpleNamespace
+from datetime import date
+
+from app.services.email_templates import render_email, task_context
+
+RECIPIENTS = 25
+ROUNDS = 2000
+
+
+def make_task(collaborators):
+    owner = SimpleNamespace(email="owner@example.com")
+    return SimpleNamespace(
+        id=1,
+        title="Quarterly report",
+        description="Collect numbers & <draft> the summary",
+        duedate=date(2025, 1, 31),
+        priority=3,
+        status=SimpleNamespace(value="Ongoing"),
+        project=SimpleNamespace(name="Finance"),
+        owner=owner,
+        collaborators=[SimpleNamespace(email=f"user{i}@example.com") for i in range(collaborators)],
+    )
+
+
+def main():
+    task = make_task(RECIPIENTS)
+    context = task_context(task)
+
+    def shared_body():
+        render_email("task_creation", task=task_context(task), actor_email="creator@example.com")
+
+    def body_per_recipient():
+        for _ in range(RECIPIENTS):
+            render_email("task_creation", task=task_context(task), actor_email="creator@example.com")
+
+    def render_only():
+        render_email("task_creation", task=context, actor_email="creator@example.com")
+
+    for label, fn, rounds in (
+        ("context snapshot", lambda: task_context(task), ROUNDS),
+        ("render (pre-built context)", render_only, ROUNDS),
+        ("one body per event", shared_body, ROUNDS),
+        (f"one body per recipient (x{RECIPIENTS})", body_per_recipient, ROUNDS // 10),
+    ):
+        seconds = timeit.timeit(fn, number=rounds)
+        print(f"{label:<40} {seconds / rounds * 1e6:10.1f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Micro-benchmark for the user typeahead index.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_user_search
+
+Builds the prefix index over 100k synthetic users and compares a lookup
+against filtering the full user list, which is what EmailCombobox did in
+the browser after downloading every user. Also reports the cost of adding
+a batch of new users and the payload sizes of both approaches.
+"""
+import json
+import random
+import time
+import timeit
+
+from app.services.user_index import UserPrefixIndex
+
+USERS = 100_000
+ROUNDS = 2000
+FIRST = ["ada", "alan", "grace", "linus", "margaret", "ken", "barbara", "donald", "edsger", "frances"]
+LAST = ["lovelace", "turing", "hopper", "torvalds", "hamilton", "thompson", "liskov", "knuth", "dijkstra", "allen"]
+
+
+def make_users(count, start=1):
+    rng = random.Random(start)
+    users = []
+    for user_id in range(start, start + count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        users.append((user_id, f"{first.title()} {last.title()}", f"{first}.{last}{user_id}@example.com", "staff"))
+    return users
+
+
+def main():
+    users = make_users(USERS)
+    index = UserPrefixIndex()
+
+    started = time.perf_counter()
+    index.build(users)
+    print(f"{'build (100k users)':<40} {(time.perf_counter() - started) * 1e3:10.1f} ms")
+
+    dicts = [{"id": i, "name": n, "email": e, "role": r} for i, n, e, r in users]
+
+    def linear(prefix):
+        return [u for u in dicts if u["email"].startswith(prefix) or u["name"].lower().startswith(prefix)][:10]
+
+    for prefix in ("a", "gr", "hop", "margaret.k"):
+        seconds = timeit.timeit(lambda: index.search(prefix), number=ROUNDS)
+        print(f"{'index search ' + repr(prefix):<40} {seconds / ROUNDS * 1e6:10.1f} us")
+    seconds = timeit.timeit(lambda: linear("hop"), number=20)
+    print(f"{'linear filter of all users' + chr(32) + repr('hop'):<40} {seconds / 20 * 1e6:10.1f} us")
+
+    print(f"{'payload: all users':<40} {len(json.dumps(dicts)) / 1024:10.1f} KiB")
+    print(f"{'payload: one search':<40} {len(json.dumps(index.search('gr'))) / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
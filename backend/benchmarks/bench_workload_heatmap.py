@@ -0,0 +1,64 @@
+"""Micro-benchmark for the workload heatmap.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_workload_heatmap
+
+Spreads 1M open task assignments over 5k users and a 28-day range (with
+some overdue), then times decoding the packed columns Postgres sends,
+building the matrices, and serializing them.
+"""
+import json
+import time
+from datetime import date
+
+import numpy as np
+
+from app.services.workload_heatmap import WorkloadHeatmap
+
+ASSIGNMENTS = 1_000_000
+USERS = 5_000
+DAYS = 28
+START = date(2025, 1, 2)
+LABELS = ["Unassigned", "Ongoing", "Pending Review"]
+
+
+def make_packed(rng):
+    """The four big-endian buffers the heatmap query returns."""
+    return (
+        rng.integers(1, USERS + 1, ASSIGNMENTS).astype(">i4").tobytes(),
+        rng.integers(-1, DAYS, ASSIGNMENTS).astype(">i2").tobytes(),
+        rng.integers(1, 4, ASSIGNMENTS).astype(">i2").tobytes(),
+        rng.integers(0, len(LABELS), ASSIGNMENTS).astype(">i2").tobytes(),
+    )
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<44} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+    return result
+
+
+def main():
+    packed = make_packed(np.random.default_rng(1))
+
+    columns = timed(
+        "decode packed columns (1M rows)",
+        lambda: [
+            np.frombuffer(buffer, dtype=dtype).astype(np.int64)
+            for buffer, dtype in zip(packed, (">i4", ">i2", ">i2", ">i2"))
+        ],
+    )
+    heatmap = timed(
+        f"build matrices ({USERS} users x {DAYS} days)",
+        lambda: WorkloadHeatmap(*columns, START, DAYS, len(LABELS)),
+    )
+    data = timed("to_dict()", lambda: heatmap.to_dict(LABELS))
+    body = timed("json.dumps()", lambda: json.dumps(data))
+    print(f"{'payload':<44} {len(body) / 1e6:10.2f} MB")
+    assert int(heatmap.tasks.sum()) == ASSIGNMENTS
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pytest
 from datetime import date, timedelta
 from flask_jwt_extended import create_access_token
+from sqlalchemy import event
 
 from app import create_app
 from app.models import (
@@ -205,6 +206,77 @@ def test_workload_data_counts_active_items(client, auth_headers):
     assert "workload" in primary_entry
 
 
+def test_workload_counts_each_user_with_a_fixed_number_of_queries(client, auth_headers, calendar_data, app_instance):
+    selects = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    with app_instance.app_context():
+        for i in range(5):
+            db.session.add(User(name=f"Idle {i}", email=f"idle{i}@example.com", role="STAFF", password_hash="x"))
+        db.session.commit()
+        event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/calendar/workload", headers=auth_headers)
+    finally:
+        with app_instance.app_context():
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    counts = {
+        member["email"]: (member["task_count"], member["project_count"], member["overdue_count"])
+        for member in response.get_json()["team_members"]
+    }
+    assert counts["primary@example.com"] == (4, 3, 1)
+    assert counts["collab@example.com"] == (1, 1, 0)
+    assert counts["other@example.com"] == (0, 1, 0)
+    assert counts["idle0@example.com"] == (0, 0, 0)
+    # Current user lookup, then users, tasks and projects
+    assert len(selects) == 4
+
+
+def test_workload_heatmap_counts_owned_and_shared_open_tasks(client, auth_headers, calendar_data):
+    response = client.get("/api/calendar/workload/heatmap", headers=auth_headers)
+    assert response.status_code == 200
+    heatmap = response.get_json()
+
+    assert heatmap["from"] == date.today().isoformat()
+    assert len(heatmap["daily"]["tasks"][0]) == 28
+    rows = {user_id: i for i, user_id in enumerate(heatmap["users"])}
+    primary, collaborator = rows[calendar_data["primary_id"]], rows[calendar_data["collaborator_id"]]
+    # Overdue work lands on the first day; the completed task is left out
+    assert heatmap["daily"]["tasks"][primary][:7] == [1, 0, 1, 1, 0, 0, 1]
+    assert heatmap["overdue"][primary] == 1
+    assert heatmap["daily"]["tasks"][collaborator][3] == 1
+    assert sum(heatmap["weekly"]["tasks"][primary]) == 4
+    assert heatmap["status_counts"]["Ongoing"][primary] == 2
+
+
+def test_workload_heatmap_default_range_moves_with_the_date(client, auth_headers, calendar_data, monkeypatch):
+    from app.services import calendar_services
+
+    assert client.get("/api/calendar/workload/heatmap", headers=auth_headers).get_json()["from"] == date.today().isoformat()
+
+    tomorrow = date.today() + timedelta(days=1)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return tomorrow
+
+    monkeypatch.setattr(calendar_services, "date", Tomorrow)
+    heatmap = client.get("/api/calendar/workload/heatmap", headers=auth_headers).get_json()
+    assert heatmap["from"] == tomorrow.isoformat()
+
+
+def test_workload_heatmap_rejects_bad_ranges(client, auth_headers):
+    assert client.get("/api/calendar/workload/heatmap?from=today", headers=auth_headers).status_code == 400
+    response = client.get("/api/calendar/workload/heatmap?from=2025-01-01&to=2025-12-31", headers=auth_headers)
+    assert response.status_code == 400
+
+
 def test_workload_user_not_found_returns_404(client, app_instance):
     with app_instance.app_context():
         token = create_access_token(identity="999")
@@ -89,13 +89,44 @@ def test_create_project_route_handles_exception(client, auth_headers, monkeypatc
 
 
 def test_get_all_projects_route_returns_serialized_projects(client, auth_headers, monkeypatch):
-    project_obj = SimpleNamespace(to_dict=lambda: {"id": 1, "name": "Proj"})
+    project_obj = SimpleNamespace(id=1, to_dict=lambda: {"id": 1, "name": "Proj"})
     monkeypatch.setattr(project_services, "get_all_projects", lambda user_id: [project_obj])
     monkeypatch.setattr(project_routes, "get_jwt_identity", lambda: "1")
 
     response = client.get("/api/project/get-all-projects", headers=auth_headers)
     assert response.status_code == 200
-    assert response.get_json() == [{"id": 1, "name": "Proj"}]
+    [project] = response.get_json()
+    assert (project["id"], project["name"]) == (1, "Proj")
+    assert project["task_stats"]["total"] == 0
+
+
+def test_get_all_projects_route_includes_task_stats(client, auth_headers):
+    from datetime import date
+    from app.models import Project, Task, TaskStatus, User
+
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    helper = User(email="helper@example.com", password_hash="pwd", name="Helper")
+    db.session.add_all([owner, helper])
+    db.session.commit()
+    project = Project(name="Progress", owner_id=owner.id, collaborators=[helper])
+    db.session.add(project)
+    db.session.commit()
+    task = Task(title="Done", owner_id=owner.id, duedate=date.today(), status=TaskStatus.ONGOING, project_id=project.id)
+    db.session.add_all([task, Task(title="Open", owner_id=owner.id, duedate=date.today(), project_id=project.id)])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(owner.id))}"}
+
+    response = client.get("/api/project/get-all-projects", headers=headers)
+    stats = response.get_json()[0]["task_stats"]
+    assert stats["total"] == 2
+    assert stats["status_counts"]["Ongoing"] == 1
+
+    # Finishing a task moves the progress bar, so the old copy is no longer fresh
+    task.status = TaskStatus.COMPLETED
+    db.session.commit()
+    response = client.get("/api/project/get-all-projects", headers={**headers, "If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.get_json()[0]["task_stats"]["completion_rate"] == 50.0
 
 
 def test_get_all_projects_route_requires_user_identity(client, auth_headers, monkeypatch):
@@ -158,3 +189,114 @@ def test_update_project_route_handles_exception(client, auth_headers, monkeypatc
 
     assert response.status_code == 500
     assert response.get_json()["success"] is False
+
+
+def test_get_project_route_sends_etag(client, auth_headers, monkeypatch):
+    project_obj = SimpleNamespace(id=55, version=3, to_dict=lambda: {"id": 55, "name": "Detail"})
+    monkeypatch.setattr(project_services, "get_project_by_id", lambda _: project_obj)
+
+    response = client.get("/api/project/get-project/55", headers=auth_headers)
+    assert response.headers["ETag"] == '"project-55-v3"'
+
+
+def test_update_project_route_passes_if_match_version(client, auth_headers, monkeypatch):
+    calls = []
+    project_obj = SimpleNamespace(id=99, version=4, to_dict=lambda: {"id": 99, "name": "Updated"})
+    monkeypatch.setattr(
+        project_services, "update_project", lambda *args, **kwargs: calls.append(args) or project_obj
+    )
+
+    response = client.put(
+        "/api/project/update-project/99",
+        data={"name": "Updated"},
+        headers={**auth_headers, "If-Match": '"project-99-v3"'},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    assert calls[0][-1] == 3
+    assert response.headers["ETag"] == '"project-99-v4"'
+
+
+def test_update_project_route_returns_412_on_conflict(client, auth_headers, monkeypatch):
+    def stale(*args, **kwargs):
+        raise project_services.PreconditionFailed("changed", current_version=5)
+
+    monkeypatch.setattr(project_services, "update_project", stale)
+
+    response = client.put(
+        "/api/project/update-project/7",
+        data={"name": "Mine"},
+        headers={**auth_headers, "If-Match": '"project-7-v4"'},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 412
+    assert response.get_json()["current_version"] == 5
+    assert response.headers["ETag"] == '"project-7-v5"'
+
+
+def test_get_project_route_revalidates_without_loading(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(project_services, "get_project_etag", lambda _: '"project-55-v3"')
+    monkeypatch.setattr(project_services, "get_project_by_id", lambda _: pytest.fail("project was loaded"))
+
+    response = client.get(
+        "/api/project/get-project/55",
+        headers={**auth_headers, "If-None-Match": '"project-55-v3"'},
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"project-55-v3"'
+
+
+def test_get_all_projects_route_revalidates_without_loading(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(project_services, "get_all_projects_etag", lambda _: 'W/"projects-u1-2-7-3-2"')
+    monkeypatch.setattr(project_services, "get_all_projects", lambda _: pytest.fail("projects were loaded"))
+
+    response = client.get(
+        "/api/project/get-all-projects",
+        headers={**auth_headers, "If-None-Match": 'W/"projects-u1-2-7-3-2"'},
+    )
+    assert response.status_code == 304
+
+
+def test_progress_route_passes_the_date_range(client, auth_headers, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        project_routes.report_services,
+        "get_progress_history",
+        lambda project_id, user_id, start, end: calls.append((project_id, user_id, start, end)) or {"series": []},
+    )
+
+    response = client.get("/api/project/4/progress?from=2025-01-01&to=2025-01-31", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert calls[0][0] == 4 and calls[0][1] == "1"
+    assert (calls[0][2].isoformat(), calls[0][3].isoformat()) == ("2025-01-01", "2025-01-31")
+
+
+def test_progress_route_rejects_bad_dates(client, auth_headers):
+    assert client.get("/api/project/4/progress?from=yesterday", headers=auth_headers).status_code == 400
+    assert client.get("/api/project/4/progress?from=2025-02-01&to=2025-01-01", headers=auth_headers).status_code == 400
+
+
+def test_progress_route_unknown_project(client, auth_headers):
+    response = client.get("/api/project/999/progress", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_critical_path_route(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(
+        project_routes.dependency_services,
+        "get_critical_path",
+        lambda project_id: {"project_id": project_id, "critical_path": [3, 4], "at_risk": True},
+    )
+
+    response = client.get("/api/project/7/critical-path", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json() == {"project_id": 7, "critical_path": [3, 4], "at_risk": True}
+
+
+def test_critical_path_route_unknown_project(client, auth_headers):
+    response = client.get("/api/project/999/critical-path", headers=auth_headers)
+    assert response.status_code == 404
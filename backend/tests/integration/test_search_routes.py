@@ -0,0 +1,69 @@
+import pytest
+from datetime import date
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.models import db, User, Task
+
+
+@pytest.fixture
+def app_instance():
+    app = create_app()
+    app.config.update(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+            "JWT_SECRET_KEY": "search-secret",
+        }
+    )
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app_instance):
+    return app_instance.test_client()
+
+
+@pytest.fixture
+def auth_headers(app_instance):
+    with app_instance.app_context():
+        user = User(name="Searcher", email="searcher@example.com", role="STAFF")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all([
+            Task(title=f"Deploy service {i}", duedate=date.today(), owner_id=user.id) for i in range(3)
+        ])
+        db.session.commit()
+        token = create_access_token(identity=str(user.id))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_search_pages_with_cursor(client, auth_headers):
+    first = client.get("/api/search?q=deploy&limit=2", headers=auth_headers)
+    assert first.status_code == 200
+    data = first.get_json()
+    assert [r["type"] for r in data["results"]] == ["task", "task"]
+    assert data["next_cursor"]
+
+    second = client.get(f"/api/search?q=deploy&limit=2&cursor={data['next_cursor']}", headers=auth_headers)
+    rest = second.get_json()
+    assert len(rest["results"]) == 1
+    assert rest["next_cursor"] is None
+    assert len({r["id"] for r in data["results"] + rest["results"]}) == 3
+
+
+def test_search_without_query_returns_400(client, auth_headers):
+    response = client.get("/api/search?types=task", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Search query is required"
+
+
+def test_search_requires_authentication(client):
+    assert client.get("/api/search?q=deploy").status_code == 401
@@ -1,3 +1,4 @@
+import io
 import json
 from datetime import date
 
@@ -5,7 +6,7 @@ import pytest
 from flask_jwt_extended import create_access_token
 
 from app import create_app
-from app.models import db, User, Task, TaskStatus
+from app.models import db, User, Task, Project, TaskStatus
 
 
 @pytest.fixture
@@ -137,3 +138,259 @@ def test_get_user_tasks_requires_auth(client):
     assert response.status_code == 401
     data = response.get_json()
     assert data["msg"] == "Missing Authorization Header"
+
+
+def test_import_tasks_from_csv_upload(client, auth_headers):
+    due = date.today().isoformat()
+    body = (
+        "title,duedate,owner,priority,status\n"
+        f"First,{due},owner@example.com,2,Ongoing\n"
+        f"Second,{due},owner@example.com,,\n"
+    )
+
+    response = client.post(
+        "/api/task/import",
+        data={"file": (io.BytesIO(body.encode()), "tasks.csv")},
+        headers=auth_headers,
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["created"] == 2
+
+    with client.application.app_context():
+        tasks = Task.query.filter(Task.id.in_(data["task_ids"])).order_by(Task.id).all()
+        assert [(t.title, t.priority, t.status) for t in tasks] == [
+            ("First", 2, TaskStatus.ONGOING),
+            ("Second", 1, TaskStatus.UNASSIGNED),
+        ]
+
+
+def test_import_tasks_from_json_body(client, auth_headers):
+    rows = [{"title": "From JSON", "duedate": date.today().isoformat(), "owner": "owner@example.com"}]
+
+    response = client.post(
+        "/api/task/import",
+        data=json.dumps(rows),
+        headers=auth_headers,
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert response.get_json()["created"] == 1
+
+
+def test_import_tasks_rejects_invalid_rows_without_writing(client, auth_headers):
+    body = "title,duedate,owner\nGood,2030-01-01,owner@example.com\n,not-a-date,ghost@example.com\n"
+
+    response = client.post(
+        "/api/task/import",
+        data=body,
+        headers=auth_headers,
+        content_type="text/csv",
+    )
+
+    assert response.status_code == 400
+    data = response.get_json()
+    assert data["errors"][0]["row"] == 2
+    assert "title is required" in data["errors"][0]["errors"]
+
+    with client.application.app_context():
+        assert Task.query.count() == 0
+
+
+def test_batch_update_reports_per_item_results(client, auth_headers):
+    with client.application.app_context():
+        task = Task(title="Card", duedate=date.today(), status=TaskStatus.ONGOING, owner_id=1)
+        db.session.add(task)
+        db.session.commit()
+        task_id = task.id
+
+    response = client.post(
+        "/api/task/batch-update",
+        json={"operations": [
+            {"task_id": task_id, "patch": {"status": TaskStatus.COMPLETED.value}},
+            {"task_id": 999, "patch": {"status": TaskStatus.COMPLETED.value}},
+        ]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["updated"] == 1
+    assert [r["status"] for r in data["results"]] == ["updated", "not_found"]
+
+
+def test_batch_update_requires_operations(client, auth_headers):
+    response = client.post("/api/task/batch-update", json={}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def _seed_task():
+    task = Task(title="Shared", duedate=date.today(), status=TaskStatus.ONGOING, owner_id=1)
+    db.session.add(task)
+    db.session.commit()
+    return task.id
+
+
+def test_get_task_sends_etag(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    response = client.get(f"/api/task/get-task/{task_id}", headers=auth_headers)
+
+    assert response.headers["ETag"] == f'"task-{task_id}-v1"'
+    assert response.get_json()["version"] == 1
+
+
+def test_update_task_with_current_etag_bumps_version(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    response = client.put(
+        f"/api/task/update-task/{task_id}",
+        data={"title": "Renamed"},
+        headers={**auth_headers, "If-Match": f'"task-{task_id}-v1"'},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"task-{task_id}-v2"'
+    assert response.get_json()["task"]["version"] == 2
+
+
+def test_etag_from_get_task_works_as_if_match(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    tag = client.get(f"/api/task/get-task/{task_id}", headers=auth_headers).headers["ETag"]
+    response = client.put(
+        f"/api/task/update-task/{task_id}",
+        data={"title": "Renamed"},
+        headers={**auth_headers, "If-Match": tag},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["task"]["version"] == 2
+
+
+def test_update_task_with_stale_etag_is_rejected(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+    client.put(f"/api/task/update-task/{task_id}", data={"title": "First save"}, headers=auth_headers)
+
+    response = client.put(
+        f"/api/task/update-task/{task_id}",
+        data={"title": "Second save"},
+        headers={**auth_headers, "If-Match": f'"task-{task_id}-v1"'},
+    )
+
+    assert response.status_code == 412
+    assert response.get_json()["current_version"] == 2
+    assert response.headers["ETag"] == f'"task-{task_id}-v2"'
+    with client.application.app_context():
+        assert db.session.get(Task, task_id).title == "First save"
+
+
+def test_update_task_with_weak_etag_is_rejected(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    response = client.put(
+        f"/api/task/update-task/{task_id}",
+        data={"title": "Renamed"},
+        headers={**auth_headers, "If-Match": f'W/"task-{task_id}-v1"'},
+    )
+
+    assert response.status_code == 412
+    with client.application.app_context():
+        assert db.session.get(Task, task_id).title != "Renamed"
+
+
+def test_update_task_accepts_version_form_field(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    response = client.put(
+        f"/api/task/update-task/{task_id}",
+        data={"title": "Renamed", "version": "7"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 412
+
+
+def test_get_task_revalidation_returns_304(client, auth_headers):
+    with client.application.app_context():
+        task_id = _seed_task()
+
+    first = client.get(f"/api/task/get-task/{task_id}", headers=auth_headers)
+    again = client.get(
+        f"/api/task/get-task/{task_id}",
+        headers={**auth_headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert again.status_code == 304
+    assert again.data == b""
+
+    client.put(f"/api/task/update-task/{task_id}", data={"title": "Renamed"}, headers=auth_headers)
+    after_edit = client.get(
+        f"/api/task/get-task/{task_id}",
+        headers={**auth_headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert after_edit.status_code == 200
+    assert after_edit.get_json()["title"] == "Renamed"
+
+
+def test_user_task_list_etag_follows_any_member(client, auth_headers):
+    with client.application.app_context():
+        first_id = _seed_task()
+        second_id = _seed_task()
+    client.put(f"/api/task/update-task/{second_id}", data={"title": "Newest"}, headers=auth_headers)
+
+    listing = client.get("/api/task/get-user-tasks", headers=auth_headers)
+    tag = listing.headers["ETag"]
+    assert client.get("/api/task/get-user-tasks", headers={**auth_headers, "If-None-Match": tag}).status_code == 304
+
+    # Bringing the other task to the same version leaves max(version) and count unchanged
+    client.put(f"/api/task/update-task/{first_id}", data={"title": "Edited"}, headers=auth_headers)
+    refreshed = client.get("/api/task/get-user-tasks", headers={**auth_headers, "If-None-Match": tag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != tag
+
+
+def test_get_task_tree_nests_subtasks(client, auth_headers):
+    with client.application.app_context():
+        parent_id = _seed_task()
+        db.session.add(Task(title="Child", duedate=date.today(), status=TaskStatus.COMPLETED, owner_id=1, parent_id=parent_id))
+        db.session.commit()
+
+    response = client.get(f"/api/task/get-task-tree/{parent_id}?depth=3", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [child["title"] for child in data["subtasks"]] == ["Child"]
+    assert data["rollup"]["completion"] == 100.0
+    assert client.get("/api/task/get-task-tree/999", headers=auth_headers).status_code == 404
+
+
+def test_task_dependency_routes(client, auth_headers):
+    with client.application.app_context():
+        project = Project(name="Plan", owner_id=1)
+        db.session.add(project)
+        db.session.commit()
+        first, second = (
+            Task(title=title, duedate=date.today(), status=TaskStatus.ONGOING, owner_id=1, project_id=project.id)
+            for title in ("First", "Second")
+        )
+        db.session.add_all([first, second])
+        db.session.commit()
+        first_id, second_id = first.id, second.id
+
+    added = client.post(f"/api/task/add-dependency/{second_id}", json={"depends_on_id": first_id}, headers=auth_headers)
+    assert added.status_code == 201
+    cycle = client.post(f"/api/task/add-dependency/{first_id}", json={"depends_on_id": second_id}, headers=auth_headers)
+    assert cycle.status_code == 409
+    listed = client.get(f"/api/task/get-dependencies/{second_id}", headers=auth_headers)
+    assert listed.get_json() == {"depends_on": [first_id], "blocks": []}
+    removed = client.delete(f"/api/task/remove-dependency/{second_id}/{first_id}", headers=auth_headers)
+    assert removed.status_code == 200
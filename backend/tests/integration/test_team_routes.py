@@ -58,3 +58,26 @@ def test_get_team_members_user_not_found_returns_404(client, app_instance):
     response = client.get("/api/team/members", headers=headers)
     assert response.status_code == 404
     assert response.get_json()["error"] == "User not found"
+
+
+def test_cycle_time_is_forbidden_for_staff(client, auth_headers):
+    response = client.get("/api/team/cycle-time", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_cycle_time_for_directors(client, app_instance):
+    with app_instance.app_context():
+        director = User(name="Director", email="director@example.com", role="DIRECTOR")
+        director.set_password("password")
+        db.session.add(director)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(director.id))}"}
+
+    response = client.get("/api/team/cycle-time?group=project&from=2025-01-01&to=2025-03-31", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "group_by": "project", "from": "2025-01-01", "to": "2025-03-31", "groups": [], "throughput": [],
+    }
+
+    assert client.get("/api/team/cycle-time?from=soon", headers=headers).status_code == 400
+    assert client.get("/api/team/cycle-time?group=team", headers=headers).status_code == 400
@@ -1,7 +1,8 @@
 import pytest
+from flask_jwt_extended import create_access_token
 
 from app import create_app
-from app.models import db
+from app.models import db, User
 
 
 @pytest.fixture
@@ -12,6 +13,7 @@ def app_instance():
             "TESTING": True,
             "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
             "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+            "JWT_SECRET_KEY": "user-secret",
         }
     )
 
@@ -42,3 +44,42 @@ def test_get_all_users_route_handles_exception(client, monkeypatch):
     response = client.get("/api/user/get-all-users")
     assert response.status_code == 500
     assert response.get_json()["success"] is False
+
+
+def test_search_users_route_matches_prefixes(client, app_instance):
+    with app_instance.app_context():
+        for name, email in [("Dana Scully", "dana@example.com"), ("Fox Mulder", "fox@example.com")]:
+            user = User(name=name, email=email, role="STAFF")
+            user.set_password("password")
+            db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity="1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/user/search?q=mul", headers=headers)
+    assert response.status_code == 200
+    assert [u["email"] for u in response.get_json()] == ["fox@example.com"]
+    assert client.get("/api/user/search?q=d&limit=x", headers=headers).status_code == 400
+    assert client.get("/api/user/search?q=d").status_code == 401
+
+
+def test_user_directory_routes_page_and_stream(client, app_instance):
+    with app_instance.app_context():
+        for i in range(3):
+            user = User(name=f"Staff {i}", email=f"staff{i}@example.com", role="STAFF")
+            user.set_password("password")
+            db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity="1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    page = client.get("/api/user/directory?limit=2", headers=headers).get_json()
+    assert len(page["users"]) == 2
+    rest = client.get(f"/api/user/directory?after={page['next_after']}", headers=headers).get_json()
+    assert [u["email"] for u in rest["users"]] == ["staff2@example.com"]
+
+    export = client.get("/api/user/directory/export?role=staff", headers=headers)
+    assert export.status_code == 200
+    assert export.is_streamed
+    assert [u["email"] for u in export.get_json()] == [f"staff{i}@example.com" for i in range(3)]
+    assert client.get("/api/user/directory/export?role=intern", headers=headers).status_code == 400
@@ -0,0 +1,193 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import create_app
+from app.models import db, User, Task, Project, ProjectStatus, TaskStatus
+from app.services import task_services
+from app.services.change_tracking import apply_changes, get_changes, normalize, touch, TASK_FIELDS
+from app.services.http_cache import PreconditionFailed
+from app.services.project_services import update_project
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def task(app):
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    other = User(email="other@example.com", password_hash="pwd", name="Other")
+    db.session.add_all([owner, other])
+    db.session.commit()
+
+    task = Task(
+        title="Tracked",
+        description="",
+        duedate=date.today() + timedelta(days=5),
+        status=TaskStatus.ONGOING,
+        owner_id=owner.id,
+        priority=2,
+    )
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+@pytest.fixture
+def recorder(monkeypatch, task):
+    calls = {"update": [], "update_due": [], "assignment": []}
+    monkeypatch.setattr(task_services, "get_jwt_identity", lambda: str(task.owner_id))
+    monkeypatch.setattr(
+        task_services.notification_service,
+        "create_task_update_notification",
+        lambda task, updated_by, fields: calls["update"].append(fields),
+    )
+    monkeypatch.setattr(
+        task_services.notification_service,
+        "update_notifications_for_task",
+        lambda task: calls["update_due"].append(task.id),
+    )
+    monkeypatch.setattr(
+        task_services.notification_service,
+        "create_task_assignment_notification",
+        lambda task, assigned_by, assignee: calls["assignment"].append(assignee.email),
+    )
+    return calls
+
+
+def test_normalize_treats_blank_and_datetime_like_their_column_values():
+    assert normalize("") is None
+    assert normalize(datetime(2030, 1, 2, 15, 30)) == normalize(date(2030, 1, 2)) == "2030-01-02"
+    assert normalize(TaskStatus.COMPLETED) == "Completed"
+    assert normalize(3) == "3"
+
+
+def test_apply_changes_skips_noop_assignments(task):
+    changes = apply_changes(task, {
+        "title": "Tracked",
+        "description": None,
+        "duedate": datetime.combine(task.duedate, datetime.min.time()),
+        "priority": 2,
+    }, TASK_FIELDS)
+
+    assert changes == []
+    assert task not in db.session.dirty
+
+
+def test_apply_changes_reports_previous_values(task):
+    other = User.query.filter_by(email="other@example.com").first()
+    old_due = task.duedate
+
+    changes = apply_changes(task, {
+        "title": "Renamed",
+        "duedate": old_due + timedelta(days=1),
+        "owner": other,
+    }, TASK_FIELDS)
+
+    assert changes == [
+        {"field": "title", "old_value": "Tracked", "new_value": "Renamed"},
+        {"field": "due date", "old_value": old_due.isoformat(), "new_value": (old_due + timedelta(days=1)).isoformat()},
+        {"field": "assignee", "old_value": "owner@example.com", "new_value": "other@example.com"},
+    ]
+
+
+def test_get_changes_is_empty_after_flush(task):
+    task.title = "Flushed"
+    db.session.flush()
+    assert get_changes(task, TASK_FIELDS) == []
+
+
+def test_update_task_noop_save_notifies_nobody(task, recorder):
+    task_services.update_task(task.id, {
+        "title": "Tracked",
+        "description": "",
+        "duedate": task.duedate.isoformat() + "T00:00:00.000Z",
+        "status": TaskStatus.ONGOING.value,
+        "priority": "2",
+        "owner": "owner@example.com",
+        "collaborators": "[]",
+    }, [])
+
+    assert recorder == {"update": [], "update_due": [], "assignment": []}
+
+
+def test_update_task_reports_only_changed_fields(task, recorder):
+    new_due = task.duedate + timedelta(days=2)
+    task_services.update_task(task.id, {
+        "title": "Tracked",
+        "duedate": new_due.isoformat() + "T00:00:00.000Z",
+        "priority": "4",
+    }, [])
+
+    assert [[c["field"] for c in fields] for fields in recorder["update"]] == [["due date", "priority"]]
+    assert recorder["update"][0][1] == {"field": "priority", "old_value": "2", "new_value": "4"}
+    assert recorder["update_due"] == [task.id]
+    assert db.session.get(Task, task.id).duedate == new_due
+
+
+def test_update_project_ignores_unchanged_fields(app, monkeypatch):
+    owner = User(email="lead@example.com", password_hash="pwd", name="Lead")
+    db.session.add(owner)
+    db.session.commit()
+    project = Project(name="Apollo", description="Moon", status=ProjectStatus.IN_PROGRESS,
+                      deadline=date(2030, 1, 1), owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+
+    published = []
+    monkeypatch.setattr("app.services.project_services.publish", published.append)
+    monkeypatch.setattr("app.services.project_services._get_current_user", lambda: owner)
+    update_project(project.id, {
+        "name": "Apollo",
+        "description": "Mars",
+        "status": ProjectStatus.IN_PROGRESS.value,
+        "deadline": "2030-01-01T00:00:00.000Z",
+        "owner": "lead@example.com",
+    }, [])
+
+    assert len(published) == 1
+    assert published[0].changes == {"Description": ("Moon", "Mars")}
+
+
+def test_touch_bumps_version_once_per_flush(task):
+    touch(task)
+    touch(task)
+    db.session.commit()
+    assert task.version == 2
+
+    task.title = "Renamed"
+    touch(task)
+    db.session.commit()
+    assert task.version == 3
+
+
+def test_update_project_rejects_stale_version(app, monkeypatch):
+    owner = User(email="lead@example.com", password_hash="pwd", name="Lead")
+    db.session.add(owner)
+    db.session.commit()
+    project = Project(name="Apollo", owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    project.name = "Gemini"
+    db.session.commit()
+
+    monkeypatch.setattr("app.services.project_services._get_current_user", lambda: owner)
+    with pytest.raises(PreconditionFailed) as exc:
+        update_project(project.id, {"name": "Mercury"}, [], expected_version=1)
+
+    assert exc.value.current_version == 2
+    assert db.session.get(Project, project.id).name == "Gemini"
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, Task, Project, ProjectStatus, TaskStatus
+from app.services.collaborator_services import resolve_users_by_email, sync_collaborators
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    users = [User(email=f"user{i}@example.com", password_hash="pwd", name=f"User {i}") for i in range(4)]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+@pytest.fixture
+def task(users):
+    task = Task(
+        title="Shared",
+        duedate=date.today() + timedelta(days=3),
+        status=TaskStatus.ONGOING,
+        owner_id=users[0].id,
+    )
+    task.collaborators.extend([users[1], users[2]])
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+@pytest.fixture
+def statements(app):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # The cache invalidation log written at commit is not part of the sync
+        if "cache_invalidations" not in statement:
+            seen.append(statement.split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_resolve_users_by_email_skips_unknown(users):
+    resolved = resolve_users_by_email(["user1@example.com", "ghost@example.com", ""])
+    assert set(resolved) == {"user1@example.com"}
+
+
+def test_sync_unchanged_set_writes_nothing(task, statements):
+    changes = sync_collaborators(task, ["user2@example.com", "user1@example.com"])
+
+    assert changes.added == [] and changes.removed == set()
+    assert "DELETE" not in statements and "INSERT" not in statements
+
+
+def test_sync_applies_only_the_difference(task, users, statements):
+    changes = sync_collaborators(task, ["user1@example.com", "user3@example.com", "ghost@example.com"])
+    db.session.commit()
+
+    assert [u.email for u in changes.added] == ["user3@example.com"]
+    assert changes.removed == {users[2].id}
+    assert sorted(changes.before) == ["user1@example.com", "user2@example.com"]
+    assert changes.after == ["user1@example.com", "user3@example.com"]
+    assert statements.count("DELETE") == 1
+    assert statements.count("INSERT") == 1
+    assert sorted(u.email for u in task.collaborators) == ["user1@example.com", "user3@example.com"]
+
+
+def test_sync_project_collaborators(users):
+    project = Project(name="P", status=ProjectStatus.NOT_STARTED, owner_id=users[0].id)
+    project.collaborators.append(users[1])
+    db.session.add(project)
+    db.session.commit()
+
+    changes = sync_collaborators(project, [])
+    db.session.commit()
+
+    assert changes.removed == {users[1].id}
+    assert project.collaborators == []
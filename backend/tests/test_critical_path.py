@@ -0,0 +1,90 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.critical_path import CriticalPath
+
+TODAY = date(2025, 3, 3)
+
+
+def day(n):
+    return TODAY + timedelta(days=n)
+
+
+def chain():
+    # design -> build -> ship, with a side task that also feeds ship
+    tasks = {1: (day(2), False), 2: (day(5), False), 3: (day(6), False), 4: (day(9), False)}
+    edges = [(2, 1), (3, 2), (3, 4)]
+    return tasks, edges
+
+
+def test_slack_and_critical_path():
+    tasks, edges = chain()
+    schedule = CriticalPath(tasks, edges, deadline=day(4), today=TODAY)
+    result = schedule.result()
+
+    by_id = {task["id"]: task for task in result["tasks"]}
+    # ship must finish by the deadline (day 4), so build by 3 and design by 2
+    assert [by_id[t]["latest_finish"] for t in (1, 2, 3, 4)] == [day(2).isoformat(), day(3).isoformat(), day(4).isoformat(), day(3).isoformat()]
+    # One day each: design finishes day 1, build day 2, ship day 3
+    assert [by_id[t]["slack"] for t in (1, 2, 3, 4)] == [1, 1, 1, 2]
+    assert result["critical_path"] == [1, 2, 3]
+    assert result["projected_finish"] == day(3).isoformat()
+    assert result["at_risk"] is False
+
+
+def test_late_tasks_put_the_deadline_at_risk():
+    tasks, edges = chain()
+    tasks[1] = (day(-1), False)  # design is already overdue
+    result = CriticalPath(tasks, edges, deadline=day(2), today=TODAY).result()
+
+    assert result["at_risk"] is True
+    # The side task still has a day: it only has to beat the deadline minus ship's day
+    assert result["late_tasks"] == 3
+    assert result["critical_path"][0] == 1
+
+
+def test_completed_tasks_take_no_time_and_are_never_critical():
+    tasks, edges = chain()
+    tasks[1] = (day(-10), True)
+    result = CriticalPath(tasks, edges, deadline=day(4), today=TODAY).result()
+
+    by_id = {task["id"]: task for task in result["tasks"]}
+    assert by_id[1]["critical"] is False
+    assert by_id[2]["earliest_finish"] == day(1).isoformat()
+    assert 1 not in result["critical_path"]
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        CriticalPath({1: (day(1), False), 2: (day(1), False)}, [(1, 2), (2, 1)], today=TODAY)
+
+
+def test_updates_match_a_full_rebuild():
+    rng = random.Random(7)
+    tasks = {i: (day(rng.randint(-3, 40)), rng.random() < 0.2) for i in range(1, 401)}
+    edges = {(i, rng.randint(1, i - 1)) for i in range(2, 401) for _ in range(rng.randint(0, 3))}
+    schedule = CriticalPath(tasks, edges, deadline=day(30), today=TODAY)
+
+    for _ in range(50):
+        task_id = rng.randint(1, 400)
+        tasks[task_id] = (day(rng.randint(-3, 40)), rng.random() < 0.2)
+        schedule.update(task_id, *tasks[task_id])
+        rebuilt = CriticalPath(tasks, edges, deadline=day(30), today=TODAY)
+        assert schedule.ef == rebuilt.ef
+        assert schedule.lf == rebuilt.lf
+        assert schedule.result()["tasks"] == rebuilt.result()["tasks"]
+
+
+
+def test_update_stops_where_values_no_longer_change():
+    tasks, edges = chain()
+    schedule = CriticalPath(tasks, edges, deadline=day(4), today=TODAY)
+
+    # A later due date for the side task changes neither of its finishes
+    assert schedule.update(4, day(12), False) == 2
+    assert schedule.update(4, day(12), False) == 0
+    # Completing design shifts everything downstream; it has nothing upstream
+    assert schedule.update(1, day(2), True) == 4
+    assert schedule.result()["critical_path"] == [2, 3]
@@ -0,0 +1,143 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.models import db, User, Task, Project, TaskStatus
+from app.services import dependency_services
+from app.services.dependency_services import (
+    DependencyCycleError,
+    add_dependency,
+    get_critical_path,
+    get_task_dependencies,
+    remove_dependency,
+)
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def project(app):
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    db.session.add(owner)
+    db.session.commit()
+    project = Project(name="Release", owner_id=owner.id, deadline=date.today() + timedelta(days=3))
+    elsewhere = Project(name="Elsewhere", owner_id=owner.id)
+    db.session.add_all([project, elsewhere])
+    db.session.commit()
+    tasks = [
+        Task(title=f"Step {i}", duedate=date.today() + timedelta(days=10), status=TaskStatus.ONGOING,
+             owner_id=owner.id, project_id=project.id)
+        for i in range(4)
+    ]
+    outsider = Task(title="Outsider", duedate=date.today(), owner_id=owner.id, project_id=elsewhere.id)
+    db.session.add_all(tasks + [outsider])
+    db.session.commit()
+    return {"project": project, "tasks": [t.id for t in tasks], "outsider": outsider.id}
+
+
+def test_dependencies_are_added_once_and_listed(project):
+    first, second, third, _ = project["tasks"]
+    assert add_dependency(second, first) is True
+    assert add_dependency(second, first) is False
+    assert add_dependency(third, second) is True
+
+    assert get_task_dependencies(second) == {"depends_on": [first], "blocks": [third]}
+    assert remove_dependency(third, second) is True
+    assert remove_dependency(third, second) is False
+
+
+def test_cycles_are_refused(project):
+    first, second, third, _ = project["tasks"]
+    add_dependency(second, first)
+    add_dependency(third, second)
+
+    with pytest.raises(DependencyCycleError, match="already depends"):
+        add_dependency(first, third)
+    with pytest.raises(DependencyCycleError):
+        add_dependency(first, first)
+    assert get_task_dependencies(first) == {"depends_on": [], "blocks": [second]}
+
+
+def test_dependencies_stay_within_a_project(project):
+    with pytest.raises(ValueError, match="same project"):
+        add_dependency(project["tasks"][0], project["outsider"])
+    with pytest.raises(ValueError, match="not found"):
+        add_dependency(project["tasks"][0], 999)
+
+
+def test_critical_path_is_updated_incrementally(project):
+    first, second, third, fourth = project["tasks"]
+    add_dependency(second, first)
+    add_dependency(third, second)
+
+    result = get_critical_path(project["project"].id)
+    assert result["critical_path"] == [first, second, third]
+    assert result["at_risk"] is False
+    assert result["recomputed"] == 4
+    assert get_critical_path(project["project"].id)["recomputed"] == 0
+
+    # Completing the first step revisits it (in both passes) and its two dependents
+    task = db.session.get(Task, first)
+    task.status = TaskStatus.COMPLETED
+    db.session.commit()
+    result = get_critical_path(project["project"].id)
+    assert result["recomputed"] == 4
+    assert result["critical_path"] == [second, third]
+
+    # New edges rebuild the schedule
+    add_dependency(fourth, third)
+    result = get_critical_path(project["project"].id)
+    assert result["critical_path"] == [second, third, fourth]
+    assert result["at_risk"] is False
+
+
+def test_a_slow_rebuild_does_not_hold_up_other_projects(app, project, monkeypatch):
+    release, started = threading.Event(), threading.Event()
+    slow_project = project["project"].id
+    build = dependency_services.CriticalPath
+
+    def slow_build(tasks, edges, deadline=None, today=None):
+        if project["tasks"][0] in tasks:
+            started.set()
+            assert release.wait(5)
+        return build(tasks, edges, deadline=deadline, today=today)
+
+    monkeypatch.setattr(dependency_services, "CriticalPath", slow_build)
+    results = []
+
+    def read_slow_project():
+        with app.app_context():
+            results.append(get_critical_path(slow_project))
+
+    thread = threading.Thread(target=read_slow_project)
+    thread.start()
+    try:
+        assert started.wait(5)
+        elsewhere = db.session.get(Task, project["outsider"]).project_id
+        assert get_critical_path(elsewhere)["critical_path"] == [project["outsider"]]
+    finally:
+        release.set()
+        thread.join(5)
+    assert results[0]["project_id"] == slow_project
+
+
+def test_critical_path_of_missing_project(app):
+    with pytest.raises(ValueError, match="not found"):
+        get_critical_path(999)
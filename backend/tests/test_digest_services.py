@@ -0,0 +1,199 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.models import db, User, Task, Notification, NotificationType, TaskStatus
+from app.services import digest_services, notification_service
+from app.services.digest_services import NotificationDigest, merge_updated_fields
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def task_with_team(app):
+    editor = User(email="editor@example.com", password_hash="pwd", name="Editor")
+    watcher = User(email="watcher@example.com", password_hash="pwd", name="Watcher")
+    db.session.add_all([editor, watcher])
+    db.session.commit()
+
+    task = Task(
+        title="Digest Task",
+        duedate=date.today() + timedelta(days=5),
+        status=TaskStatus.ONGOING,
+        owner_id=editor.id,
+    )
+    task.collaborators.append(watcher)
+    db.session.add(task)
+    db.session.commit()
+    return task, editor, watcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_merge_keeps_first_old_and_latest_new():
+    merged = merge_updated_fields(
+        [{"field": "status", "old_value": "Ongoing", "new_value": "Pending Review"}],
+        [
+            {"field": "status", "old_value": "Pending Review", "new_value": "Completed"},
+            {"field": "priority", "old_value": "1", "new_value": "2"},
+        ],
+    )
+    assert merged == [
+        {"field": "status", "old_value": "Ongoing", "new_value": "Completed"},
+        {"field": "priority", "old_value": "1", "new_value": "2"},
+    ]
+
+
+def test_merge_drops_reverted_fields():
+    merged = merge_updated_fields(
+        [{"field": "title", "old_value": "A", "new_value": "B"}],
+        [{"field": "title", "old_value": "B", "new_value": "A"}],
+    )
+    assert merged == []
+
+
+def test_burst_of_updates_sends_one_email_per_recipient(app, task_with_team, monkeypatch):
+    task, editor, watcher = task_with_team
+    sent = []
+    monkeypatch.setattr(
+        digest_services, "send_task_update_digest_email",
+        lambda recipient, updates: sent.append((recipient, updates)),
+    )
+    clock = FakeClock()
+    digest = NotificationDigest(window=60, auto_flush=False, clock=clock)
+
+    digest.add_task_update(task, editor, [{"field": "priority", "old_value": "1", "new_value": "2"}])
+    digest.add_task_update(task, editor, [{"field": "priority", "old_value": "2", "new_value": "3"}])
+    digest.add_task_update(task, editor, [{"field": "notes", "old_value": None, "new_value": "hi"}])
+
+    assert digest.flush_due() == 0
+    clock.now = 61
+    assert digest.flush_due() == 1
+
+    recipient, updates = sent[0]
+    assert recipient == watcher.email
+    assert updates[0][0].id == task.id
+    assert updates[0][2] == [
+        {"field": "priority", "old_value": "1", "new_value": "3"},
+        {"field": "notes", "old_value": None, "new_value": "hi"},
+    ]
+    assert digest.pending_count() == 0
+
+
+def test_in_app_update_notifications_collapse(app, task_with_team):
+    task, editor, watcher = task_with_team
+
+    notification_service.create_task_update_notification(
+        task, editor, [{"field": "status", "old_value": "Ongoing", "new_value": "Pending Review"}]
+    )
+    notification_service.create_task_update_notification(
+        task, editor, [{"field": "status", "old_value": "Pending Review", "new_value": "Completed"}]
+    )
+
+    notifs = Notification.query.filter_by(task_id=task.id, type=NotificationType.TASK_UPDATED).all()
+    assert len(notifs) == 1
+    assert notifs[0].user_id == watcher.id
+    assert notifs[0].payload["updated_fields"] == [
+        {"field": "status", "old_value": "Ongoing", "new_value": "Completed"}
+    ]
+
+
+def test_buffer_is_shared_and_survives_a_restart(app, task_with_team, monkeypatch):
+    task, editor, watcher = task_with_team
+    sent = []
+    monkeypatch.setattr(
+        digest_services, "send_task_update_digest_email",
+        lambda recipient, updates: sent.append((recipient, updates)),
+    )
+    clock = FakeClock()
+    NotificationDigest(window=60, auto_flush=False, clock=clock).add_task_update(
+        task, editor, [{"field": "priority", "old_value": "1", "new_value": "2"}]
+    )
+
+    # Another worker, or this one after a restart, sends it
+    other = NotificationDigest(window=60, auto_flush=False, clock=clock)
+    assert other.pending_count() == 1
+    clock.now = 61
+    assert other.flush_due() == 1
+    assert sent[0][0] == watcher.email
+    assert other.flush_due() == 0
+
+
+def test_failed_send_is_put_back_and_retried_a_window_later(app, task_with_team, monkeypatch):
+    task, editor, watcher = task_with_team
+    outcomes = [RuntimeError("webhook down"), None]
+    sent = []
+
+    def send(recipient, updates):
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+        sent.append((recipient, updates[0][2]))
+
+    monkeypatch.setattr(digest_services, "send_task_update_digest_email", send)
+    clock = FakeClock()
+    digest = NotificationDigest(window=60, auto_flush=False, clock=clock)
+    digest.add_task_update(task, editor, [{"field": "priority", "old_value": "1", "new_value": "2"}])
+
+    clock.now = 61
+    assert digest.flush_due() == 0
+    assert digest.pending_count() == 1
+    digest.add_task_update(task, editor, [{"field": "priority", "old_value": "2", "new_value": "3"}])
+
+    assert digest.flush_due() == 0
+    clock.now = 122
+    assert digest.flush_due() == 1
+    assert sent == [(watcher.email, [{"field": "priority", "old_value": "1", "new_value": "3"}])]
+    assert digest.counters["failed"] == 1
+
+
+def test_flush_command_sends_due_digests(app, task_with_team, monkeypatch):
+    task, editor, _ = task_with_team
+    monkeypatch.setattr(digest_services, "send_task_update_digest_email", lambda recipient, updates: None)
+    NotificationDigest(window=60, auto_flush=False, clock=lambda: 0.0).add_task_update(
+        task, editor, [{"field": "priority", "old_value": "1", "new_value": "2"}]
+    )
+
+    result = app.test_cli_runner().invoke(args=["flush-notification-digests"])
+    assert result.exit_code == 0
+    assert "1 digest email(s) sent" in result.output
+
+
+def test_timer_rearms_after_a_failed_flush(app, task_with_team, monkeypatch):
+    task, editor, _ = task_with_team
+    clock = FakeClock()
+    digest = NotificationDigest(window=60, auto_flush=False, clock=clock)
+    digest.add_task_update(task, editor, [{"field": "priority", "old_value": "1", "new_value": "2"}])
+
+    def broken():
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(digest, "flush_due", broken)
+    clock.now = 61
+    digest._on_timer(app)
+
+    assert digest._timer is not None
+    assert digest._timer.interval == 60
+    digest._timer.cancel()
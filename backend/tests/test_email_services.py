@@ -0,0 +1,234 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from app import create_app
+from app.models import db, EmailCooldown
+
+from app.services import email_services
+from app.services.email_services import CircuitBreaker, EmailService
+from app.services.throttle_store import MemoryThrottleStore, DatabaseThrottleStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def service(monkeypatch, clock):
+    monkeypatch.setenv("POWER_AUTOMATE_WEBHOOK_URL", "http://webhook.test")
+    svc = EmailService()
+    svc.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, slow_call_threshold=5, clock=clock)
+    svc.throttle = MemoryThrottleStore(ttl=0)
+    return svc
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_half_open_probe_closes_on_success(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 31
+    assert breaker.allow_request() is True
+    # Only one probe at a time while half-open
+    assert breaker.allow_request() is False
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_slow_success_counts_as_failure(clock):
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=2, clock=clock)
+    breaker.record_success(3.0)
+    stats = breaker.stats()
+    assert stats["state"] == CircuitBreaker.OPEN
+    assert stats["slow_calls"] == 1
+
+
+def test_open_breaker_fails_fast_and_buffers(service, monkeypatch):
+    calls = []
+
+    def failing_post(*args, **kwargs):
+        calls.append(kwargs["json"])
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(email_services.requests, "post", failing_post)
+
+    for i in range(4):
+        assert service.send_notification_email(["a@example.com"], "s", "m", "t", i, "x") is False
+
+    # Two real attempts trip the breaker; the rest never reach the network
+    assert len(calls) == 2
+    stats = service.get_stats()
+    assert stats["state"] == CircuitBreaker.OPEN
+    assert stats["suppressed"] == 4
+
+
+def test_suppressed_sends_replay_after_recovery(service, monkeypatch, clock):
+    monkeypatch.setattr(
+        email_services.requests, "post",
+        lambda *a, **k: (_ for _ in ()).throw(requests.Timeout("slow")),
+    )
+    service.send_notification_email(["a@example.com"], "s", "m", "t", 1, "x")
+    service.send_notification_email(["a@example.com"], "s", "m", "t", 2, "x")
+    assert service.breaker.state == CircuitBreaker.OPEN
+
+    delivered = []
+
+    def ok_post(*args, **kwargs):
+        delivered.append(kwargs["json"]["task_id"])
+        return SimpleNamespace(status_code=202)
+
+    monkeypatch.setattr(email_services.requests, "post", ok_post)
+    clock.now = 31
+
+    assert service.send_notification_email(["a@example.com"], "s", "m", "t", 3, "x") is True
+    # The buffer is replayed on a background thread, not by the request that sent
+    timer = service._replay_timer
+    assert timer is not None
+    timer.join(timeout=5)
+    assert delivered == [3, 1, 2]
+    assert service.get_stats()["suppressed"] == 0
+
+
+def test_error_response_counts_as_failure_and_is_buffered(service, monkeypatch):
+    monkeypatch.setattr(email_services.requests, "post", lambda *a, **k: SimpleNamespace(status_code=500))
+
+    assert service.send_notification_email(["a@example.com"], "s", "m", "t", 1, "x") is False
+    stats = service.get_stats()
+    assert stats["failures"] == 1
+    assert stats["suppressed"] == 1
+    assert service.suppressed[0]["task_id"] == 1
+
+
+def test_memory_throttle_blocks_within_ttl_and_expires(clock):
+    store = MemoryThrottleStore(ttl=300, clock=clock)
+
+    assert store.hit("1_a@example.com") is True
+    assert store.hit("1_a@example.com") is False
+    assert store.hit("2_a@example.com") is True
+
+    clock.now = 301
+    assert store.hit("1_a@example.com") is True
+    stats = store.stats()
+    assert stats["expired"] == 2
+    assert stats["entries"] == 1
+
+
+def test_memory_throttle_caps_entries(clock):
+    store = MemoryThrottleStore(ttl=300, max_entries=2, clock=clock)
+    for i in range(5):
+        store.hit(f"{i}_a@example.com")
+
+    stats = store.stats()
+    assert stats["entries"] == 2
+    assert stats["evicted"] == 3
+    assert stats["approx_bytes"] > 0
+
+
+@pytest.fixture
+def app_instance():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_database_throttle_is_shared_between_instances(app_instance, clock):
+    worker_a = DatabaseThrottleStore(ttl=300, clock=clock)
+    worker_b = DatabaseThrottleStore(ttl=300, clock=clock)
+
+    assert worker_a.hit("1_a@example.com") is True
+    assert worker_b.hit("1_a@example.com") is False
+
+    clock.now = 301
+    assert worker_b.hit("1_a@example.com") is True
+    assert worker_a.hit("1_a@example.com") is False
+
+
+def test_database_throttle_sweep_trims_table(app_instance, clock):
+    store = DatabaseThrottleStore(ttl=300, max_entries=2, clock=clock)
+    for i in range(4):
+        clock.now = i
+        store.hit(f"{i}_a@example.com")
+
+    assert store.sweep() == 2
+    assert {row.key for row in EmailCooldown.query.all()} == {"2_a@example.com", "3_a@example.com"}
+
+    clock.now = 302
+    assert store.sweep() == 1
+    assert store.stats()["entries"] == 1
+
+
+def test_templates_escape_user_content():
+    from app.services.email_templates import render_email
+
+    body = render_email(
+        "comment",
+        task={"title": "Task", "project_name": "No Project"},
+        comment={"author_email": "a@example.com", "content": "<script>x</script>", "created_at": "2025-01-01 10:00"},
+    )
+    assert "<script>" not in body
+    assert "&lt;script&gt;" in body
+
+
+def test_task_creation_renders_one_body_for_all_recipients(service, monkeypatch):
+    owner = SimpleNamespace(id=1, email="owner@example.com")
+    collab = SimpleNamespace(id=2, email="collab@example.com")
+    creator = SimpleNamespace(id=3, email="creator@example.com")
+    task = SimpleNamespace(
+        id=9, title="Launch", description=None, duedate=None, priority=1,
+        status=SimpleNamespace(value="Ongoing"), project=None,
+        owner=owner, owner_id=owner.id, collaborators=[collab],
+    )
+    sent = []
+    monkeypatch.setattr(email_services, "email_service", service)
+    monkeypatch.setattr(service, "send_notification_email", lambda recipients, subject, message, *a, **k: sent.append((sorted(recipients), message)))
+
+    email_services.send_task_creation_email_notification(task, creator)
+
+    assert len(sent) == 1
+    recipients, message = sent[0]
+    assert recipients == ["collab@example.com", "owner@example.com"]
+    assert "collab@example.com (Collaborator)" in message
+    assert "No Project" in message
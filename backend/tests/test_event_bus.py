@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.models import db, User, Task, Comment, Notification, TaskStatus
+from app.services import event_bus, notification_service
+from app.services.event_bus import unit_of_work, publish, commit, subscribe, CommentAdded
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def handled(monkeypatch):
+    """Swap the real handlers for a recorder."""
+    seen = []
+    monkeypatch.setattr(event_bus, "_handlers", {})
+    subscribe(CommentAdded)(seen.append)
+    return seen
+
+
+@pytest.fixture
+def task_with_watcher(app):
+    author = User(email="author@example.com", password_hash="pwd", name="Author")
+    watcher = User(email="watcher@example.com", password_hash="pwd", name="Watcher")
+    db.session.add_all([author, watcher])
+    db.session.commit()
+    task = Task(
+        title="Events",
+        duedate=date.today() + timedelta(days=10),
+        status=TaskStatus.ONGOING,
+        owner_id=watcher.id,
+    )
+    db.session.add(task)
+    db.session.commit()
+    return task, author, watcher
+
+
+def test_events_dispatch_only_after_commit(app, handled):
+    with unit_of_work():
+        publish(CommentAdded(1, 2))
+        assert handled == []
+
+    assert handled == [CommentAdded(1, 2)]
+
+
+def test_rollback_drops_events(app, handled):
+    with pytest.raises(ValueError):
+        with unit_of_work():
+            publish(CommentAdded(1, 2))
+            raise ValueError("boom")
+
+    with unit_of_work():
+        pass
+    assert handled == []
+
+
+def test_nested_commit_only_flushes(app, task_with_watcher, handled, monkeypatch):
+    task, author, watcher = task_with_watcher
+    commits = []
+    original_commit = db.session.commit
+    monkeypatch.setattr(db.session, "commit", lambda: (commits.append(1), original_commit()))
+
+    with unit_of_work():
+        comment = Comment(task_id=task.id, user_id=author.id, content="hello")
+        db.session.add(comment)
+        db.session.flush()
+        notification_service.create_comment_notification(comment)
+        notification_service.create_notifications_for_task(task)
+
+    assert len(commits) == 1
+    assert Notification.query.filter_by(task_id=task.id).count() == 4
+    assert handled == [CommentAdded(comment.id, author.id)]
+
+
+def test_failed_write_leaves_no_notifications_or_emails(app, task_with_watcher, handled):
+    task, author, watcher = task_with_watcher
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            comment = Comment(task_id=task.id, user_id=author.id, content="hello")
+            db.session.add(comment)
+            db.session.flush()
+            notification_service.create_comment_notification(comment)
+            raise RuntimeError("later step failed")
+
+    assert Comment.query.count() == 0
+    assert Notification.query.count() == 0
+    assert handled == []
+
+
+def test_commit_outside_unit_of_work_dispatches(app, handled):
+    publish(CommentAdded(3, 4))
+    commit()
+    assert handled == [CommentAdded(3, 4)]
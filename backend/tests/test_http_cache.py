@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from app.services.http_cache import (
+    PreconditionFailed,
+    check_version,
+    entity_etag,
+    if_match_version,
+    is_fresh,
+)
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_entity_etag_names_kind_id_and_versions():
+    assert entity_etag("project", SimpleNamespace(id=12, version=3)) == '"project-12-v3"'
+    task = SimpleNamespace(id=12, version=3, project=SimpleNamespace(version=5))
+    assert entity_etag("task", task) == '"task-12-v3-p5"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("*", None),
+    ('"task-12-v3"', 3),
+    ('"task-12-v4-p2"', 4),
+    ('"task-9-v1", "task-12-v5"', 5),
+    ('W/"task-12-v4", "task-12-v5"', 5),
+])
+def test_if_match_version_reads_the_header(app, header, expected):
+    headers = {"If-Match": header} if header else {}
+    with app.test_request_context(headers=headers):
+        assert if_match_version("task", 12) == expected
+
+
+def test_if_match_version_falls_back_to_form_value(app):
+    with app.test_request_context():
+        assert if_match_version("task", 12, "6") == 6
+        with pytest.raises(PreconditionFailed):
+            if_match_version("task", 12, "latest")
+
+
+def test_if_match_for_another_resource_fails(app):
+    with app.test_request_context(headers={"If-Match": '"project-12-v3"'}):
+        with pytest.raises(PreconditionFailed):
+            if_match_version("task", 12)
+
+
+@pytest.mark.parametrize("header", ['W/"task-12-v4"', 'W/"task-12-v4-p2"'])
+def test_if_match_rejects_weak_etags(app, header):
+    with app.test_request_context(headers={"If-Match": header}):
+        with pytest.raises(PreconditionFailed, match="strong"):
+            if_match_version("task", 12)
+
+
+def test_check_version_reports_the_current_version():
+    check_version(SimpleNamespace(version=2), None, "task")
+    check_version(SimpleNamespace(version=2), 2, "task")
+    with pytest.raises(PreconditionFailed) as exc:
+        check_version(SimpleNamespace(version=2), 1, "task")
+    assert exc.value.current_version == 2
+
+
+def test_is_fresh_uses_weak_comparison(app):
+    with app.test_request_context(headers={"If-None-Match": '"task-12-v3", W/"task-9-v1"'}):
+        assert is_fresh('W/"task-12-v3"')
+        assert not is_fresh('W/"task-12-v4"')
+        assert not is_fresh(None)
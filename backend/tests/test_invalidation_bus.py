@@ -0,0 +1,131 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from app import create_app
+from app.models import db, User, CacheInvalidation
+from app.services.invalidation_bus import InvalidationBus, invalidation_bus
+from app.services.response_cache import response_cache
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def bus(app):
+    bus = InvalidationBus(poll_interval=0, lookback=10)
+    received = []
+    bus.subscribe(received.append)
+    bus.poll()  # start at the end of the log
+    return bus, received
+
+
+def other_worker_writes(*tables):
+    """Log writes the way another process's commit would."""
+    with db.engine.begin() as conn:
+        return invalidation_bus.publish(conn, tables)
+
+
+def test_commit_logs_each_written_table_once(app):
+    db.session.add_all([User(email=f"u{i}@example.com", password_hash="pwd", name="U") for i in range(3)])
+    db.session.commit()
+
+    logged = db.session.execute(select(CacheInvalidation.table_name)).scalars().all()
+    assert logged == ["users"]
+
+
+def test_rolled_back_writes_are_not_logged(app):
+    db.session.add(User(email="gone@example.com", password_hash="pwd", name="Gone"))
+    db.session.flush()
+    db.session.rollback()
+
+    assert db.session.execute(select(CacheInvalidation.id)).first() is None
+
+
+def test_poll_coalesces_a_burst_from_other_workers(bus):
+    bus, received = bus
+    for _ in range(5):
+        other_worker_writes("users")
+    other_worker_writes("tasks")
+
+    bus.poll()
+    bus.poll()
+
+    assert received == [{"users", "tasks"}]
+    assert bus.stats()["coalesced"] == 4
+
+
+def test_late_commits_below_the_cursor_are_still_delivered(bus):
+    bus, received = bus
+    with db.engine.begin() as conn:
+        # Reserve an id the way a slow transaction would, then commit it after a newer one
+        early = conn.execute(insert(CacheInvalidation).returning(CacheInvalidation.id), [{"table_name": "projects"}]).scalar()
+        conn.execute(CacheInvalidation.__table__.delete().where(CacheInvalidation.id == early))
+    other_worker_writes("users")
+    bus.poll()
+    with db.engine.begin() as conn:
+        conn.execute(insert(CacheInvalidation), [{"id": early, "table_name": "projects"}])
+    bus.poll()
+
+    assert received == [{"users"}, {"projects"}]
+
+
+def test_own_commits_are_not_delivered_twice(bus):
+    bus, received = bus
+    invalidation_bus.poll()
+    invalidation_bus.subscribe(received.append)
+    try:
+        db.session.add(User(email="mine@example.com", password_hash="pwd", name="Mine"))
+        db.session.commit()
+        invalidation_bus.poll()
+    finally:
+        invalidation_bus._subscribers.remove(received.append)
+
+    assert received.count({"users"}) == 1
+
+
+def test_other_workers_writes_move_cache_versions(app):
+    invalidation_bus.poll()
+    before = response_cache.backend.versions(["users"])
+
+    other_worker_writes("users")
+    invalidation_bus.poll()
+
+    assert response_cache.backend.versions(["users"]) == (before[0] + 1,)
+
+
+def test_log_ids_autoincrement_on_sqlite():
+    engine = create_engine("sqlite://")
+    CacheInvalidation.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(CacheInvalidation), [{"table_name": "users"}, {"table_name": "tasks"}])
+        assert conn.execute(select(CacheInvalidation.id).order_by(CacheInvalidation.id)).scalars().all() == [1, 2]
+
+
+def test_failed_poll_is_logged_with_the_error(bus, monkeypatch, caplog):
+    bus, _ = bus
+
+    def broken():
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(bus, "_poll", broken)
+    with caplog.at_level(logging.ERROR, logger="app.services.invalidation_bus"):
+        bus.poll_if_due()
+
+    assert "connection refused" in caplog.text
+    assert bus.counters["errors"] == 1
@@ -135,6 +135,31 @@ def test_notifications_update_on_due_date_change(app, sample_user, sample_projec
     new_days = sorted([n.trigger_days_before for n in new_notifs])
     assert new_days == [1, 3]  # updated schedule reflects new due date
 
+def test_completing_a_task_keeps_its_update_notification(app, sample_user, sample_project, monkeypatch):
+    from app.services.task_services import update_task
+
+    other_user = User(email="completer@example.com", password_hash="pwd", name="Completer")
+    db.session.add(other_user)
+    db.session.commit()
+    monkeypatch.setattr("app.services.task_services.get_jwt_identity", lambda: str(other_user.id))
+    task = Task(
+        title="Almost Done",
+        duedate=date.today() + timedelta(days=7),
+        status=TaskStatus.ONGOING,
+        owner_id=sample_user.id,
+        project_id=sample_project.id,
+    )
+    db.session.add(task)
+    db.session.commit()
+    notification_service.create_notifications_for_task(task)
+
+    update_task(task.id, {"status": TaskStatus.COMPLETED.value}, None)
+
+    notifs = Notification.query.filter_by(task_id=task.id).all()
+    assert [n.type for n in notifs] == [NotificationType.TASK_UPDATED]
+    assert notifs[0].payload["updated_fields"][0]["new_value"] == "Completed"
+
+
 def test_notifications_removed_when_task_deleted(app, sample_user, sample_project):
     # Create a task due in 7 days → should have 3 notifications
     task = Task(
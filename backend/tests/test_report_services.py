@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, Task, Project, ProjectProgressSnapshot, TaskStatus
+from app.services.project_services import get_project_report_data
+from app.services.report_services import ProjectReport, get_progress_history, get_project_report
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def project(app):
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    helper = User(email="helper@example.com", password_hash="pwd", name="Helper")
+    stranger = User(email="stranger@example.com", password_hash="pwd", name="Stranger")
+    db.session.add_all([owner, helper, stranger])
+    db.session.commit()
+    project = Project(name="Report", owner_id=owner.id, collaborators=[helper])
+    db.session.add(project)
+    db.session.commit()
+
+    today = date.today()
+    monday = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time(), tzinfo=timezone.utc)
+    spec = [
+        # owner, status, days until due, priority, weeks ago created
+        (owner, TaskStatus.COMPLETED, -3, 1, 1),
+        (owner, TaskStatus.ONGOING, -1, 3, 1),
+        (owner, TaskStatus.ONGOING, 2, 3, 0),
+        (helper, TaskStatus.UNASSIGNED, 30, 2, 0),
+        (helper, TaskStatus.COMPLETED, 1, 1, 0),
+    ]
+    db.session.add_all([
+        Task(title=f"Task {i}", owner_id=user.id, status=status, duedate=today + timedelta(days=due),
+             priority=priority, project_id=project.id, created_at=monday - timedelta(weeks=weeks) + timedelta(hours=1))
+        for i, (user, status, due, priority, weeks) in enumerate(spec)
+    ])
+    db.session.commit()
+    return {"project": project, "owner": owner, "helper": helper, "stranger": stranger}
+
+
+def test_report_covers_every_metric(project):
+    report = get_project_report(project["project"].id, project["helper"].id)
+
+    assert isinstance(report, ProjectReport)
+    assert report.total == 5
+    assert report.status_counts["Completed"] == 2
+    assert report.status_counts["Ongoing"] == 2
+    assert report.overdue == 1
+    assert report.due_this_week == 1
+    assert report.completion_rate == 40.0
+    assert report.priority_mix == {"1": 2, "2": 1, "3": 2}
+    owner = report.members[0]
+    assert (owner.email, owner.total, owner.completed, owner.overdue) == ("owner@example.com", 3, 1, 1)
+    assert [(p.created, p.completed) for p in report.trend] == [(2, 1), (3, 1)]
+
+
+def test_report_runs_two_queries_and_is_cached(project):
+    project_id, owner_id = project["project"].id, project["owner"].id
+    db.session.expire_all()
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        if "cache_invalidations" not in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        first = get_project_report(project_id, owner_id)
+        queries = len(statements)
+        second = get_project_report(project_id, owner_id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    # Authorization plus the grouped query, then authorization alone
+    assert queries == 2
+    assert len(statements) == 3
+    assert first == second
+
+
+def test_report_authorization(project):
+    with pytest.raises(PermissionError):
+        get_project_report(project["project"].id, project["stranger"].id)
+    with pytest.raises(ValueError, match="not found"):
+        get_project_report(999, project["owner"].id)
+
+
+def test_status_count_endpoint_data_is_unchanged(project):
+    data = get_project_report_data(project["project"].id, project["owner"].id)
+    assert data == {status.value: count for status, count in [
+        (TaskStatus.UNASSIGNED, 1), (TaskStatus.ONGOING, 2), (TaskStatus.PENDING_REVIEW, 0), (TaskStatus.COMPLETED, 2),
+    ]}
+
+
+def test_progress_history_returns_the_requested_days(project):
+    project_id = project["project"].id
+    today = date.today()
+    db.session.add_all([
+        ProjectProgressSnapshot(project_id=project_id, day=today - timedelta(days=back), unassigned=0, ongoing=back,
+                                pending_review=0, completed=2, overdue=0)
+        for back in range(5)
+    ])
+    db.session.commit()
+
+    history = get_progress_history(project_id, project["helper"].id, today - timedelta(days=3), today - timedelta(days=1))
+
+    assert [point["date"] for point in history["series"]] == [
+        (today - timedelta(days=back)).isoformat() for back in (3, 2, 1)
+    ]
+    assert [point["remaining"] for point in history["series"]] == [3, 2, 1]
+    assert len(get_progress_history(project_id, project["owner"].id)["series"]) == 5
+
+
+def test_progress_history_checks_access_and_range(project):
+    project_id = project["project"].id
+    with pytest.raises(PermissionError):
+        get_progress_history(project_id, project["stranger"].id)
+    with pytest.raises(ValueError):
+        get_progress_history(project_id, project["owner"].id, date.today(), date.today() - timedelta(days=1))
+    with pytest.raises(ValueError):
+        get_progress_history(project_id, project["owner"].id, date.today() - timedelta(days=400), date.today())
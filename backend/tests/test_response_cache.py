@@ -0,0 +1,137 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app import create_app
+from app.models import db, User, Project, project_collaborators
+from app.services.response_cache import MemoryCacheBackend, cached_query, response_cache
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    users = [User(email=f"user{i}@example.com", password_hash="pwd", name=f"User {i}") for i in range(2)]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+@pytest.fixture
+def auth_headers(app, users):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(users[0].id))}"}
+
+
+def test_memory_backend_evicts_least_recently_used_by_bytes():
+    backend = MemoryCacheBackend(max_bytes=25, max_entries=10)
+    backend.set("a", b"x" * 9)
+    backend.set("b", b"x" * 9)
+    backend.get("a")
+    backend.set("c", b"x" * 9)
+
+    assert backend.get("b") is None
+    assert backend.get("a") and backend.get("c")
+    assert backend.stats()["bytes"] == 20
+    assert backend.set("big", b"x" * 40) is False
+    assert backend.stats()["too_large"] == 1
+
+
+def test_commits_bump_only_the_tables_they_wrote(users):
+    before = response_cache.backend.versions(["users", "projects"])
+
+    users[0].name = "Renamed"
+    db.session.commit()
+    assert response_cache.backend.versions(["users", "projects"]) == (before[0] + 1, before[1])
+
+    users[0].name = "Discarded"
+    db.session.flush()
+    db.session.rollback()
+    assert response_cache.backend.versions(["users"]) == (before[0] + 1,)
+
+
+def test_bulk_statements_bump_their_table(users):
+    project = Project(name="Apollo", owner_id=users[0].id)
+    db.session.add(project)
+    db.session.commit()
+    before = response_cache.backend.versions(["project_collaborators"])
+
+    db.session.execute(insert(project_collaborators), [{"project_id": project.id, "user_id": users[1].id}])
+    db.session.commit()
+
+    assert response_cache.backend.versions(["project_collaborators"]) == (before[0] + 1,)
+
+
+def test_cached_query_recomputes_after_a_change(users):
+    calls = []
+
+    @cached_query("users")
+    def names():
+        calls.append(1)
+        return sorted(u.name for u in User.query.all())
+
+    assert names() == ["User 0", "User 1"]
+    assert names() == ["User 0", "User 1"]
+    assert len(calls) == 1
+
+    db.session.add(User(email="new@example.com", password_hash="pwd", name="User 2"))
+    db.session.commit()
+    assert names() == ["User 0", "User 1", "User 2"]
+    assert len(calls) == 2
+
+
+def test_cached_query_returns_a_fresh_copy_on_a_miss_too(users):
+    @cached_query("users")
+    def directory():
+        return {"names": sorted(u.name for u in User.query.all())}
+
+    first = directory()
+    first["names"].append("Mutated")
+    assert directory() == {"names": ["User 0", "User 1"]}
+    assert directory() is not directory()
+
+
+def test_cached_routes_serve_hits_until_users_change(app, users, auth_headers):
+    client = app.test_client()
+    first = client.get("/api/team/members", headers=auth_headers)
+    hits = response_cache.stats()["hits"]
+    second = client.get("/api/team/members", headers=auth_headers)
+
+    assert second.status_code == 200
+    assert second.get_json() == first.get_json()
+    assert response_cache.stats()["hits"] == hits + 1
+
+    db.session.add(User(email="late@example.com", password_hash="pwd", name="Late"))
+    db.session.commit()
+    third = client.get("/api/team/members", headers=auth_headers)
+    assert len(third.get_json()["members"]) == 3
+
+
+def test_cached_member_list_still_checks_the_caller(app, users, auth_headers):
+    client = app.test_client()
+    assert client.get("/api/team/members", headers=auth_headers).status_code == 200
+
+    unknown = {"Authorization": f"Bearer {create_access_token(identity='999')}"}
+    assert client.get("/api/team/members", headers=unknown).status_code == 404
+
+
+def test_cache_can_be_disabled(app, users, auth_headers):
+    app.config["RESPONSE_CACHE_ENABLED"] = False
+    client = app.test_client()
+    client.get("/api/user/get-all-users")
+    client.get("/api/user/get-all-users")
+    assert response_cache.stats()["stores"] == 0
@@ -0,0 +1,108 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.models import db, User, Task, Project, Comment
+from app.services.search_services import search
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def workspace(app):
+    alice = User(email="alice@example.com", password_hash="pwd", name="Alice")
+    bob = User(email="bob@example.com", password_hash="pwd", name="Bob")
+    db.session.add_all([alice, bob])
+    db.session.commit()
+
+    project = Project(name="Invoice portal", description="Billing for customers", owner_id=alice.id)
+    db.session.add(project)
+    db.session.commit()
+    tasks = {
+        "title": Task(title="Fix invoice totals", duedate=date.today(), owner_id=alice.id),
+        "notes": Task(title="Quarterly review", notes="check the invoice archive", duedate=date.today(), owner_id=alice.id),
+        "project": Task(title="Portal styling", description="invoice page layout", duedate=date.today(), owner_id=bob.id, project_id=project.id),
+        "private": Task(title="Invoice for Bob only", duedate=date.today(), owner_id=bob.id),
+    }
+    db.session.add_all(tasks.values())
+    db.session.commit()
+    comment = Comment(task_id=tasks["title"].id, user_id=bob.id, content="The invoice rounding is off by a cent")
+    db.session.add(comment)
+    db.session.commit()
+    return {"alice": alice, "bob": bob, "project": project, "tasks": tasks, "comment": comment}
+
+
+def test_results_are_ranked_and_scoped_to_the_user(workspace):
+    page = search(workspace["alice"].id, "invoice")
+    hits = [(r["type"], r["id"]) for r in page["results"]]
+
+    tasks = workspace["tasks"]
+    # Title matches outrank body matches; Bob's private task is not visible
+    assert hits[:2] == sorted([("project", workspace["project"].id), ("task", tasks["title"].id)])
+    assert set(hits[2:]) == {
+        ("task", tasks["notes"].id),
+        ("task", tasks["project"].id),
+        ("comment", workspace["comment"].id),
+    }
+    assert ("task", tasks["private"].id) not in hits
+    comment = next(r for r in page["results"] if r["type"] == "comment")
+    assert comment["task_id"] == tasks["title"].id
+    assert comment["title"] == "Fix invoice totals"
+    assert page["next_cursor"] is None
+
+
+def test_cursor_pages_through_every_hit_once(workspace):
+    seen = []
+    cursor = None
+    while True:
+        page = search(workspace["alice"].id, "invoice", limit=2, cursor=cursor)
+        seen += [(r["type"], r["id"]) for r in page["results"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [(r["type"], r["id"]) for r in search(workspace["alice"].id, "invoice")["results"]]
+    assert len(seen) == 5
+
+
+def test_types_and_web_search_syntax(workspace):
+    alice = workspace["alice"].id
+    assert [r["type"] for r in search(alice, "invoice", kinds=["comment"])["results"]] == ["comment"]
+    assert search(alice, '"invoice totals"')["results"][0]["id"] == workspace["tasks"]["title"].id
+    assert {r["type"] for r in search(alice, "invoice -rounding -portal")["results"]} == {"task"}
+
+
+def test_invalid_input(workspace):
+    alice = workspace["alice"].id
+    with pytest.raises(ValueError, match="required"):
+        search(alice, "  ")
+    with pytest.raises(ValueError, match="Unknown search type"):
+        search(alice, "invoice", kinds=["user"])
+    with pytest.raises(ValueError, match="limit"):
+        search(alice, "invoice", limit="ten")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        search(alice, "invoice", cursor="not-a-cursor")
+
+
+def test_gin_indexes_are_created(workspace):
+    indexes = db.session.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE indexname LIKE 'ix_%_search'"
+    )).scalars().all()
+    assert sorted(indexes) == ["ix_comments_search", "ix_projects_search", "ix_tasks_search"]
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from app.services.single_flight import SingleFlight, single_flight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _run_concurrently(n, target):
+    results = [None] * n
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, target())) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_calls_share_one_computation():
+    group = SingleFlight("test", ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"answer": 42}
+
+    leader = threading.Thread(target=lambda: group.do("k", slow))
+    leader.start()
+    started.wait(5)
+    followers = []
+    threads = [threading.Thread(target=lambda: followers.append(group.do("k", slow))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while group.stats()["coalesced"] < 4:
+        pass
+    release.set()
+    leader.join(5)
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert followers == [{"answer": 42}] * 4
+    assert group.stats() == {"in_flight": 0, "calls": 5, "computed": 1, "coalesced": 4, "reused": 0, "errors": 0}
+
+
+def test_results_are_reused_until_the_ttl_expires():
+    clock = FakeClock()
+    group = SingleFlight("test", ttl=3, clock=clock)
+    calls = []
+
+    assert group.do("k", lambda: calls.append(1) or len(calls)) == 1
+    clock.now = 2.9
+    assert group.do("k", lambda: calls.append(1) or len(calls)) == 1
+    assert group.do("other", lambda: calls.append(1) or len(calls)) == 2
+    clock.now = 3.0
+    assert group.do("k", lambda: calls.append(1) or len(calls)) == 3
+    assert group.stats()["reused"] == 1
+
+
+def test_errors_are_not_reused():
+    group = SingleFlight("test", ttl=60)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database went away")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        group.do("k", flaky)
+    assert group.do("k", flaky) == "ok"
+    assert group.stats()["errors"] == 1
+
+
+def test_decorator_keys_on_arguments():
+    calls = []
+
+    @single_flight(ttl=60)
+    def lookup(user_id, verbose=False):
+        calls.append((user_id, verbose))
+        return user_id
+
+    assert _run_concurrently(3, lambda: lookup(1)) == [1, 1, 1]
+    assert lookup(2) == 2
+    assert lookup(1, verbose=True) == 1
+    assert calls == [(1, False), (2, False), (1, True)]
+    assert lookup.single_flight.stats()["computed"] == 3
@@ -0,0 +1,137 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from app import create_app
+from app.models import db, User, Task, Project, TaskStatus, TaskStatusTransition, UserRole
+from app.services.task_analytics_services import get_cycle_time_analytics
+from app.services.task_batch_services import apply_task_batch
+from app.services.task_services import update_task
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def people(app):
+    director = User(email="director@example.com", password_hash="pwd", name="Director", role=UserRole.DIRECTOR)
+    alice = User(email="alice@example.com", password_hash="pwd", name="Alice", role=UserRole.STAFF)
+    bob = User(email="bob@example.com", password_hash="pwd", name="Bob", role=UserRole.STAFF)
+    db.session.add_all([director, alice, bob])
+    db.session.commit()
+    project = Project(name="Delivery", owner_id=director.id)
+    db.session.add(project)
+    db.session.commit()
+    return {"director": director, "alice": alice, "bob": bob, "project": project}
+
+
+def moment(days_ago, hour=9):
+    return datetime.combine(date.today() - timedelta(days=days_ago), time(hour), tzinfo=timezone.utc)
+
+
+def task_with_history(owner, project, created_days_ago, history):
+    """`history` is a list of (days ago, hour, to_status); the first step's from_status is None."""
+    task = Task(title="Task", owner_id=owner.id, project_id=project.id if project else None,
+                duedate=date.today(), status=history[-1][2], created_at=moment(created_days_ago))
+    db.session.add(task)
+    db.session.flush()
+    previous = None
+    for days_ago, hour, status in history:
+        db.session.add(TaskStatusTransition(task_id=task.id, from_status=previous, to_status=status,
+                                            at=moment(days_ago, hour)))
+        previous = status
+    db.session.commit()
+    return task
+
+
+@pytest.fixture
+def history(people):
+    alice, bob, project = people["alice"], people["bob"], people["project"]
+    # 48h: started two days before completion, the review step does not reset it
+    task_with_history(alice, project, 10, [
+        (10, 9, TaskStatus.UNASSIGNED), (8, 9, TaskStatus.ONGOING),
+        (7, 9, TaskStatus.PENDING_REVIEW), (6, 9, TaskStatus.COMPLETED),
+    ])
+    # 36h: never marked Ongoing, so measured from creation
+    task_with_history(alice, project, 5, [(5, 9, TaskStatus.UNASSIGNED), (4, 21, TaskStatus.COMPLETED)])
+    # 24h, then reopened and done again in 12h
+    task_with_history(bob, project, 20, [
+        (20, 9, TaskStatus.ONGOING), (19, 9, TaskStatus.COMPLETED),
+        (3, 9, TaskStatus.ONGOING), (3, 21, TaskStatus.COMPLETED),
+    ])
+    # 24h: history starts at the completion, so measured from created_at; no project
+    task_with_history(bob, None, 2, [(1, 9, TaskStatus.COMPLETED)])
+    return people
+
+
+def test_cycle_time_percentiles_per_user(history):
+    analytics = get_cycle_time_analytics(history["director"].id, "user", date.today() - timedelta(days=10))
+
+    groups = {group["email"]: group for group in analytics["groups"]}
+    alice, bob = groups["alice@example.com"], groups["bob@example.com"]
+    assert (alice["completed"], alice["p50_hours"], alice["mean_hours"]) == (2, 42.0, 42.0)
+    # The reopened task counts once in this period, measured from its restart
+    assert (bob["completed"], bob["p50_hours"]) == (2, 18.0)
+    assert bob["p95_hours"] == pytest.approx(23.4)
+    assert sum(week["completed"] for week in analytics["throughput"]) == 4
+
+
+def test_cycle_time_per_project_and_period(history):
+    director_id = history["director"].id
+    [project] = get_cycle_time_analytics(director_id, "project", date.today() - timedelta(days=10))["groups"]
+    assert (project["name"], project["completed"], project["p50_hours"]) == ("Delivery", 3, 36.0)
+
+    wider = get_cycle_time_analytics(director_id, "user", date.today() - timedelta(days=25))
+    bob = next(group for group in wider["groups"] if group["name"] == "Bob")
+    assert bob["completed"] == 3
+    assert sum(week["completed"] for week in wider["throughput"]) == 5
+
+
+def test_cycle_time_is_limited_to_hr_and_directors(history):
+    with pytest.raises(PermissionError):
+        get_cycle_time_analytics(history["alice"].id)
+    with pytest.raises(ValueError):
+        get_cycle_time_analytics(history["director"].id, "team")
+
+
+def test_update_and_batch_record_status_transitions(people, monkeypatch):
+    monkeypatch.setattr("app.services.task_services.get_jwt_identity", lambda: str(people["alice"].id))
+    task = Task(title="Tracked", owner_id=people["alice"].id, duedate=date.today(), status=TaskStatus.UNASSIGNED)
+    db.session.add(task)
+    db.session.commit()
+
+    update_task(task.id, {"status": TaskStatus.ONGOING.value}, None)
+    update_task(task.id, {"title": "Renamed"}, None)
+    apply_task_batch([{"task_id": task.id, "patch": {"status": TaskStatus.COMPLETED.value}}], people["bob"].id)
+
+    transitions = TaskStatusTransition.query.filter_by(task_id=task.id).order_by(TaskStatusTransition.id).all()
+    assert [(t.from_status, t.to_status, t.changed_by) for t in transitions] == [
+        (TaskStatus.UNASSIGNED, TaskStatus.ONGOING, people["alice"].id),
+        (TaskStatus.ONGOING, TaskStatus.COMPLETED, people["bob"].id),
+    ]
+
+
+def test_transition_ids_autoincrement_on_sqlite():
+    engine = create_engine("sqlite://")
+    TaskStatusTransition.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(TaskStatusTransition), [
+            {"task_id": 1, "to_status": TaskStatus.ONGOING},
+            {"task_id": 1, "from_status": TaskStatus.ONGOING, "to_status": TaskStatus.COMPLETED},
+        ])
+        assert conn.execute(select(TaskStatusTransition.id)).scalars().all() == [1, 2]
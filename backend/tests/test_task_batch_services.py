@@ -0,0 +1,204 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, update
+
+from app import create_app
+from app.models import db, User, Task, Project, Notification, NotificationType, TaskStatus
+from app.services import task_batch_services
+from app.services.task_batch_services import apply_task_batch
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def board(app):
+    actor = User(email="actor@example.com", password_hash="pwd", name="Actor")
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    other = User(email="other@example.com", password_hash="pwd", name="Other")
+    db.session.add_all([actor, owner, other])
+    db.session.commit()
+    project = Project(name="Board", owner_id=actor.id)
+    db.session.add(project)
+    tasks = [
+        Task(title=f"Card {i}", duedate=date.today() + timedelta(days=10), status=TaskStatus.ONGOING, owner_id=owner.id)
+        for i in range(4)
+    ]
+    db.session.add_all(tasks)
+    db.session.commit()
+    return {"actor": actor, "owner": owner, "other": other, "project": project, "tasks": tasks}
+
+
+@pytest.fixture
+def updates(app):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE TASKS"):
+            seen.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def emails(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        "app.services.digest_services.send_task_update_digest_email",
+        lambda recipient, batch: sent.append((recipient, sorted(task.title for task, _, _ in batch))),
+    )
+    monkeypatch.setattr("app.services.event_handlers.notification_digest.window", 0)
+    return sent
+
+
+def test_identical_patches_share_one_update(board, updates, emails):
+    ids = [t.id for t in board["tasks"]]
+    results = apply_task_batch(
+        [{"task_id": task_id, "patch": {"status": "Completed"}} for task_id in ids],
+        board["actor"].id,
+    )
+
+    assert [r["status"] for r in results] == ["updated"] * 4
+    assert results[0]["changes"] == [{"field": "status", "old_value": "Ongoing", "new_value": "Completed"}]
+    assert len(updates) == 1
+    db.session.expire_all()
+    assert {t.status for t in Task.query.all()} == {TaskStatus.COMPLETED}
+    # One digest email for the owner covering all four tasks
+    assert emails == [("owner@example.com", ["Card 0", "Card 1", "Card 2", "Card 3"])]
+
+
+def test_mixed_batch_reports_each_item(board, updates, emails):
+    first, second, third, _ = board["tasks"]
+    results = apply_task_batch(
+        [
+            {"task_id": first.id, "patch": {"owner": "other@example.com", "project_id": board["project"].id}},
+            {"task_id": second.id, "patch": {"status": "Ongoing"}},
+            {"task_id": third.id, "patch": {"status": "Nope"}},
+            {"task_id": 999, "patch": {"status": "Completed"}},
+            {"task_id": first.id, "patch": {"status": "Completed"}},
+            {"patch": {}},
+        ],
+        board["actor"].id,
+    )
+
+    assert [r["status"] for r in results] == ["updated", "unchanged", "invalid", "not_found", "conflict", "invalid"]
+    assert len(updates) == 1
+    assert first.owner.email == "other@example.com"
+    assert first.project.name == "Board"
+    db.session.expire_all()
+    reloaded = db.session.get(Task, first.id)
+    assert (reloaded.owner_id, reloaded.project_id) == (board["other"].id, board["project"].id)
+
+
+def test_owner_change_notifies_the_new_owner(board, emails, monkeypatch):
+    assigned = []
+    monkeypatch.setattr(
+        "app.services.event_handlers.send_task_assignment_emails",
+        lambda task, actor, users, context=None: assigned.append((task.title, actor.email, [u.email for u in users])),
+    )
+    task = board["tasks"][0]
+
+    apply_task_batch([{"task_id": task.id, "patch": {"owner": "other@example.com"}}], board["actor"].id)
+
+    payloads = [n.payload for n in Notification.query.filter_by(task_id=task.id, user_id=board["other"].id)]
+    assignment = next(p for p in payloads if "previous_owner" in p)
+    assert (assignment["previous_owner"], assignment["assigned_by"]) == ("owner@example.com", "actor@example.com")
+    assert assigned == [("Card 0", "actor@example.com", ["other@example.com"])]
+
+
+def test_owner_and_due_date_change_keeps_the_assignment_notification(board, emails):
+    task = board["tasks"][0]
+    new_due = date.today() + timedelta(days=5)
+
+    apply_task_batch(
+        [{"task_id": task.id, "patch": {"owner": "other@example.com", "duedate": new_due.isoformat()}}],
+        board["actor"].id,
+    )
+
+    payloads = [n.payload for n in Notification.query.filter_by(task_id=task.id, type=NotificationType.TASK_UPDATED)]
+    assert any(p.get("previous_owner") == "owner@example.com" for p in payloads)
+    reminders = Notification.query.filter_by(task_id=task.id, type=NotificationType.DUE_DATE_REMINDER).count()
+    assert reminders > 0
+
+
+def test_expected_values_guard_against_stale_moves(board, emails):
+    task = board["tasks"][0]
+    results = apply_task_batch(
+        [{"task_id": task.id, "expected": {"status": "Pending Review"}, "patch": {"status": "Completed"}}],
+        board["actor"].id,
+    )
+
+    assert results[0]["status"] == "conflict"
+    assert results[0]["current"] == {"status": "Ongoing"}
+    assert task.status == TaskStatus.ONGOING
+
+
+def test_due_date_moves_rebuild_reminders_and_notify(board, emails):
+    task = board["tasks"][0]
+    new_due = date.today() + timedelta(days=5)
+
+    apply_task_batch([{"task_id": task.id, "patch": {"duedate": new_due.isoformat()}}], board["actor"].id)
+
+    reminders = Notification.query.filter_by(task_id=task.id, type=NotificationType.DUE_DATE_REMINDER).all()
+    assert sorted(n.trigger_days_before for n in reminders) == [1, 3]
+    updates = Notification.query.filter_by(task_id=task.id, type=NotificationType.TASK_UPDATED).all()
+    assert [n.user_id for n in updates] == [board["owner"].id]
+
+
+def test_batch_size_is_limited(board, monkeypatch):
+    monkeypatch.setattr(task_batch_services, "BATCH_MAX_OPERATIONS", 1)
+    with pytest.raises(ValueError, match="limited to 1"):
+        apply_task_batch([{"task_id": 1, "patch": {}}, {"task_id": 2, "patch": {}}], board["actor"].id)
+
+
+def test_updates_bump_the_row_version(board, emails):
+    task = board["tasks"][0]
+    apply_task_batch([{"task_id": task.id, "patch": {"status": "Completed"}}], board["actor"].id)
+
+    assert task.version == 2
+    db.session.expire_all()
+    assert db.session.get(Task, task.id).version == 2
+
+
+def test_stale_version_is_a_conflict(board, emails):
+    task = board["tasks"][0]
+    results = apply_task_batch(
+        [{"task_id": task.id, "version": 0, "patch": {"status": "Completed"}}],
+        board["actor"].id,
+    )
+
+    assert results[0]["status"] == "conflict"
+    assert results[0]["current"] == {"version": 1}
+
+
+def test_concurrent_save_is_not_overwritten(board, emails):
+    task = board["tasks"][0]
+    task.title  # loaded at version 1
+    # Another request saves the task behind this session's back
+    db.session.execute(
+        update(Task).where(Task.id == task.id).values(version=Task.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    results = apply_task_batch([{"task_id": task.id, "patch": {"status": "Completed"}}], board["actor"].id)
+
+    assert results[0]["status"] == "conflict"
+    db.session.expire_all()
+    assert db.session.get(Task, task.id).status == TaskStatus.ONGOING
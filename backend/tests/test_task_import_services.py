@@ -0,0 +1,149 @@
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.models import db, User, Task, Project, Notification, TaskStatus
+from app.services import task_import_services
+from app.services.task_import_services import (
+    TaskImportError,
+    import_tasks,
+    imported_tasks_by_recipient,
+    iter_csv_rows,
+    iter_json_rows,
+    validate_import_rows,
+)
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def team(app):
+    users = [User(email=f"user{i}@example.com", password_hash="pwd", name=f"User {i}") for i in range(3)]
+    db.session.add_all(users)
+    db.session.commit()
+    project = Project(name="Launch", owner_id=users[0].id)
+    db.session.add(project)
+    db.session.commit()
+    return users, project
+
+
+def row(**overrides):
+    values = {
+        "title": "Imported",
+        "duedate": (date.today() + timedelta(days=10)).isoformat(),
+        "owner": "user1@example.com",
+    }
+    values.update(overrides)
+    return values
+
+
+def test_iter_csv_rows_normalizes_headers():
+    body = "﻿Title, DueDate ,Owner,Collaborators\nA,2030-01-01,a@example.com,\"b@example.com;c@example.com\"\n"
+    rows = list(iter_csv_rows(io.BytesIO(body.encode())))
+    assert rows == [{
+        "title": "A",
+        "duedate": "2030-01-01",
+        "owner": "a@example.com",
+        "collaborators": "b@example.com;c@example.com",
+    }]
+
+
+def test_iter_json_rows_decodes_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(task_import_services, "READ_CHUNK", 7)
+    rows = [{"title": f"Task {i}", "notes": "x" * i} for i in range(20)]
+    parsed = list(iter_json_rows(io.BytesIO(json.dumps(rows, indent=2).encode())))
+    assert parsed == rows
+
+
+@pytest.mark.parametrize("body", [b'{"title": "x"}', b"[1, 2]", b'[{"title": "x"'])
+def test_iter_json_rows_rejects_bad_documents(body):
+    with pytest.raises(TaskImportError):
+        list(iter_json_rows(io.BytesIO(body)))
+
+
+def test_validation_reports_every_bad_row(team):
+    rows = [
+        row(),
+        row(title="", duedate="soon"),
+        row(owner="ghost@example.com", collaborators="user2@example.com;nobody@example.com"),
+        row(status="done", priority="high", project_id="999"),
+    ]
+
+    with pytest.raises(TaskImportError) as exc:
+        validate_import_rows(rows)
+
+    errors = {entry["row"]: entry["errors"] for entry in exc.value.errors}
+    assert sorted(errors) == [2, 3, 4]
+    assert errors[2] == ["title is required", "Invalid date format: soon"]
+    assert errors[3] == ["Owner with email ghost@example.com not found", "Unknown collaborators: nobody@example.com"]
+    assert errors[4] == ["Invalid status: done", "Invalid priority: high", "Project with ID 999 not found"]
+
+
+def test_validation_enforces_row_limit(team, monkeypatch):
+    monkeypatch.setattr(task_import_services, "IMPORT_MAX_ROWS", 2)
+    with pytest.raises(TaskImportError, match="limited to 2 rows"):
+        validate_import_rows([row(), row(), row()])
+
+
+def test_import_inserts_tasks_links_and_reminders(team, monkeypatch):
+    users, project = team
+    monkeypatch.setattr(task_import_services, "IMPORT_BATCH_SIZE", 2)
+    rows = [
+        row(title=f"Task {i}", collaborators=["user2@example.com", "user1@example.com"], status="completed" if i == 4 else "Ongoing")
+        for i in range(5)
+    ]
+
+    task_ids = import_tasks(rows, users[0].id, default_project_id=project.id)
+
+    tasks = Task.query.filter(Task.id.in_(task_ids)).order_by(Task.id).all()
+    assert [t.title for t in tasks] == [f"Task {i}" for i in range(5)]
+    assert all(t.project_id == project.id for t in tasks)
+    # The owner is not duplicated as a collaborator
+    assert all([c.email for c in t.collaborators] == ["user2@example.com"] for t in tasks)
+    # Due in 10 days: 7/3/1-day reminders for owner and collaborator, none for the completed task
+    assert Notification.query.count() == 4 * 2 * 3
+
+
+def test_import_sends_one_email_per_recipient(team, monkeypatch):
+    users, _ = team
+    sent = []
+    monkeypatch.setattr(
+        "app.services.event_handlers.send_task_import_email",
+        lambda recipient, actor, tasks: sent.append((recipient, [t["title"] for t in tasks])),
+    )
+
+    import_tasks([row(title="A", collaborators="user2@example.com"), row(title="B")], users[0].id)
+
+    assert sorted(sent) == [
+        ("user1@example.com", ["A", "B"]),
+        ("user2@example.com", ["A"]),
+    ]
+
+
+def test_imported_tasks_by_recipient_skips_the_actor(team):
+    users, _ = team
+    task_ids = import_tasks([row(owner="user0@example.com", collaborators="user1@example.com")], None)
+
+    grouped = imported_tasks_by_recipient(task_ids, exclude_user_id=users[0].id)
+
+    assert list(grouped) == ["user1@example.com"]
+    assert grouped["user1@example.com"][0]["role"] == "collaborator"
+    assert grouped["user1@example.com"][0]["status"] == TaskStatus.UNASSIGNED.value
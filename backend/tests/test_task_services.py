@@ -13,6 +13,7 @@ from app.services.task_services import (
     update_task
 )
 from app.models import Task, User, Project, Attachment, TaskStatus
+from app.services.collaborator_services import CollaboratorChanges
 
 
 @pytest.fixture
@@ -524,24 +525,23 @@ class TestUpdateTask:
         assert mock_task.owner == mock_user
 
     @patch('app.services.task_services.notification_service')
-    @patch('app.services.task_services.User')
+    @patch('app.services.task_services.sync_collaborators')
     @patch('app.services.task_services.Task')
-    def test_update_task_collaborators(self, mock_task_class, mock_user_class, mock_notif,
+    def test_update_task_collaborators(self, mock_task_class, mock_sync, mock_notif,
                                       mock_db_session, mock_task, mock_collaborator):
         """Test updating task collaborators"""
         mock_task_class.query.get.return_value = mock_task
-        collaborators_mock = Mock()
-        collaborators_mock.__iter__ = Mock(return_value=iter([]))
-        mock_task.collaborators = collaborators_mock
-        mock_user_class.query.filter_by.return_value.first.return_value = mock_collaborator
+        mock_sync.return_value = CollaboratorChanges(
+            [mock_collaborator], set(), [], ["collaborator@example.com"]
+        )
 
         data = {"collaborators": ["collaborator@example.com"]}
 
         result = update_task(1, data, None)
 
         assert result == mock_task
-        mock_task.collaborators.clear.assert_called_once()
-        mock_task.collaborators.append.assert_called()
+        mock_sync.assert_called_once_with(mock_task, ["collaborator@example.com"])
+        mock_notif.create_task_assignment_notification.assert_called()
 
     @patch('app.services.task_services.notification_service')
     @patch('app.services.task_services.Attachment')
@@ -0,0 +1,211 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text, update
+
+from app import create_app
+from app.models import db, User, Task, Project, ProjectProgressSnapshot, ProjectTaskStats, TaskStatus
+from app.services.task_services import link_task_to_project
+from app.services.task_stats_services import get_task_stats, reconcile_task_stats, take_progress_snapshots
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def projects(app):
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    db.session.add(owner)
+    db.session.commit()
+    first = Project(name="First", owner_id=owner.id)
+    second = Project(name="Second", owner_id=owner.id)
+    db.session.add_all([first, second])
+    db.session.commit()
+    return {"owner": owner, "first": first, "second": second}
+
+
+def add_task(owner, project, status=TaskStatus.UNASSIGNED, due_in=5):
+    task = Task(title="Task", owner_id=owner.id, status=status, duedate=date.today() + timedelta(days=due_in),
+                project_id=project.id if project else None)
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+def counters(project):
+    return get_task_stats([project.id])[project.id]
+
+
+def test_counters_follow_inserts_status_changes_and_deletes(projects):
+    owner, first = projects["owner"], projects["first"]
+    ongoing = add_task(owner, first, TaskStatus.ONGOING, due_in=-1)
+    add_task(owner, first, TaskStatus.COMPLETED, due_in=-3)
+    add_task(owner, first)
+
+    stats = counters(first)
+    assert stats["total"] == 3
+    assert stats["status_counts"] == {"Unassigned": 1, "Ongoing": 1, "Pending Review": 0, "Completed": 1}
+    assert stats["overdue"] == 1
+    assert stats["completion_rate"] == 33.3
+
+    ongoing.status = TaskStatus.COMPLETED
+    db.session.commit()
+    stats = counters(first)
+    assert stats["status_counts"]["Completed"] == 2
+    assert stats["overdue"] == 0
+
+    db.session.delete(ongoing)
+    db.session.commit()
+    stats = counters(first)
+    assert (stats["total"], stats["status_counts"]["Completed"]) == (2, 1)
+
+
+def test_linking_and_unlinking_moves_the_task_between_projects(projects):
+    owner, first, second = projects["owner"], projects["first"], projects["second"]
+    task = add_task(owner, None, TaskStatus.ONGOING, due_in=-2)
+
+    link_task_to_project(task.id, first.id)
+    assert counters(first)["overdue"] == 1
+
+    link_task_to_project(task.id, second.id)
+    assert counters(first)["total"] == 0
+    assert counters(second)["status_counts"]["Ongoing"] == 1
+
+    task.project_id = None
+    db.session.commit()
+    assert counters(second)["total"] == 0
+
+
+def test_bulk_updates_are_counted(projects):
+    owner, first = projects["owner"], projects["first"]
+    for _ in range(3):
+        add_task(owner, first)
+
+    db.session.execute(update(Task).where(Task.project_id == first.id).values(status=TaskStatus.PENDING_REVIEW))
+    db.session.commit()
+
+    assert counters(first)["status_counts"] == {"Unassigned": 0, "Ongoing": 0, "Pending Review": 3, "Completed": 0}
+
+
+def test_projects_without_tasks_read_as_empty(projects):
+    stats = get_task_stats([projects["first"].id, projects["second"].id])
+    assert stats[projects["first"].id]["total"] == 0
+    assert stats[projects["second"].id]["overdue_as_of"] is None
+
+
+def test_overdue_is_recounted_on_read_without_writing(projects):
+    owner, first = projects["owner"], projects["first"]
+    add_task(owner, first, TaskStatus.ONGOING, due_in=1)
+    assert counters(first)["overdue"] == 0
+
+    later = date.today() + timedelta(days=3)
+    stats = get_task_stats([first.id], today=later)[first.id]
+    assert stats["overdue"] == 1
+    assert stats["overdue_as_of"] == later.isoformat()
+
+    # The stored row is left for the nightly reconcile to roll forward
+    db.session.rollback()
+    row = db.session.get(ProjectTaskStats, first.id)
+    assert (row.overdue, row.overdue_as_of) == (0, date.today())
+    reconcile_task_stats(today=later)
+    db.session.refresh(row)
+    assert (row.overdue, row.overdue_as_of) == (1, later)
+
+
+def test_reconcile_reports_and_repairs_drift(projects):
+    owner, first, second = projects["owner"], projects["first"], projects["second"]
+    add_task(owner, first, TaskStatus.ONGOING)
+    add_task(owner, second)
+    db.session.execute(text("UPDATE project_task_stats SET ongoing = 5, total = 9 WHERE project_id = :id"), {"id": first.id})
+    db.session.execute(text("DELETE FROM project_task_stats WHERE project_id = :id"), {"id": second.id})
+    db.session.commit()
+
+    drift = reconcile_task_stats(fix=False)
+    assert {(d["project_id"], d["field"], d["stored"], d["actual"]) for d in drift} == {
+        (first.id, "ongoing", 5, 1),
+        (first.id, "total", 9, 1),
+        (second.id, "unassigned", 0, 1),
+        (second.id, "total", 0, 1),
+    }
+    assert db.session.get(ProjectTaskStats, second.id) is None
+
+    assert len(reconcile_task_stats()) == 4
+    assert reconcile_task_stats(fix=False) == []
+    assert counters(first)["status_counts"]["Ongoing"] == 1
+    assert counters(second)["total"] == 1
+
+
+def test_reconcile_command(app, projects):
+    add_task(projects["owner"], projects["first"])
+    db.session.execute(text("UPDATE project_task_stats SET total = 7"))
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["reconcile-task-stats", "--check"])
+    assert result.exit_code == 1
+    assert "total stored 7, actual 1" in result.output
+
+    assert runner.invoke(args=["reconcile-task-stats"]).exit_code == 0
+    assert runner.invoke(args=["reconcile-task-stats", "--check"]).exit_code == 0
+
+
+def test_install_command_adds_triggers_to_an_existing_database_and_backfills(app, projects):
+    owner, first = projects["owner"], projects["first"]
+    db.session.execute(text("DROP TRIGGER tasks_project_task_stats ON tasks"))
+    db.session.execute(text("DROP TABLE project_task_stats"))
+    db.session.commit()
+    add_task(owner, first, TaskStatus.ONGOING, due_in=-1)
+    add_task(owner, first)
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["install-task-stats"])
+    assert result.exit_code == 0
+    assert "installed" in result.output
+    assert (counters(first)["total"], counters(first)["overdue"]) == (2, 1)
+
+    # Re-running is harmless and the trigger now follows new writes
+    assert runner.invoke(args=["install-task-stats"]).exit_code == 0
+    add_task(owner, first)
+    assert counters(first)["total"] == 3
+
+
+def test_snapshots_cover_every_project_in_batches_and_can_rerun(projects):
+    owner, first, second = projects["owner"], projects["first"], projects["second"]
+    task = add_task(owner, first, TaskStatus.ONGOING, due_in=-1)
+    add_task(owner, first, TaskStatus.COMPLETED)
+
+    assert take_progress_snapshots(batch_size=1) == 2
+    task.status = TaskStatus.COMPLETED
+    db.session.commit()
+    assert take_progress_snapshots(batch_size=1) == 2
+
+    snapshots = {s.project_id: s for s in ProjectProgressSnapshot.query.all()}
+    assert len(snapshots) == 2
+    assert snapshots[first.id].to_dict() == {
+        "date": date.today().isoformat(),
+        "status_counts": {"Unassigned": 0, "Ongoing": 0, "Pending Review": 0, "Completed": 2},
+        "total": 2,
+        "remaining": 0,
+        "overdue": 0,
+    }
+    assert snapshots[second.id].to_dict()["total"] == 0
+
+
+def test_snapshot_command(app, projects):
+    result = app.test_cli_runner().invoke(args=["snapshot-project-progress", "--batch-size", "10"])
+    assert result.exit_code == 0
+    assert "2 project snapshot(s) written" in result.output
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, Task, Project, TaskStatus
+from app.services.task_tree_services import get_task_tree, get_project_task_trees
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def tree(app):
+    owner = User(email="owner@example.com", password_hash="pwd", name="Owner")
+    db.session.add(owner)
+    db.session.commit()
+    project = Project(name="Launch", owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+
+    today = date.today()
+
+    def task(title, parent=None, status=TaskStatus.ONGOING, due=10):
+        t = Task(title=title, duedate=today + timedelta(days=due), status=status, owner_id=owner.id,
+                 project_id=project.id, parent=parent)
+        db.session.add(t)
+        return t
+
+    root = task("Launch site")
+    design = task("Design", root, status=TaskStatus.COMPLETED, due=-5)
+    build = task("Build", root, due=20)
+    pages = task("Pages", build, due=-1)
+    api = task("API", build, status=TaskStatus.COMPLETED, due=3)
+    other = task("Write announcement", due=4)
+    db.session.commit()
+    return {"project": project, "root": root, "design": design, "build": build, "pages": pages, "api": api, "other": other}
+
+
+def _statements():
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    return seen, lambda: event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def test_whole_subtree_loads_in_one_query_with_rollups(tree):
+    root_id = tree["root"].id
+    db.session.expire_all()
+    seen, stop = _statements()
+    try:
+        result = get_task_tree(root_id)
+    finally:
+        stop()
+
+    assert len(seen) == 1
+    assert [child["title"] for child in result["subtasks"]] == ["Design", "Build"]
+    build = result["subtasks"][1]
+    assert [child["title"] for child in build["subtasks"]] == ["Pages", "API"]
+    assert build["rollup"] == {
+        "subtasks": 2, "completed": 1, "completion": 50.0,
+        "earliest_due": (date.today() - timedelta(days=1)).isoformat(), "overdue": 1,
+    }
+    # The completed, overdue Design task counts as done, not overdue
+    assert result["rollup"] == {
+        "subtasks": 4, "completed": 2, "completion": 50.0,
+        "earliest_due": (date.today() - timedelta(days=1)).isoformat(), "overdue": 1,
+    }
+    assert build["subtasks"][0]["rollup"]["completion"] is None
+
+
+def test_depth_limit_marks_cut_off_nodes(tree):
+    result = get_task_tree(tree["root"].id, max_depth=1)
+
+    design, build = result["subtasks"]
+    assert build["subtasks"] == []
+    assert build["has_more_subtasks"] is True
+    assert design["has_more_subtasks"] is False
+    assert result["rollup"]["subtasks"] == 2
+
+
+def test_project_trees_start_at_top_level_tasks(tree):
+    trees = get_project_task_trees(tree["project"].id)
+
+    assert [t["title"] for t in trees] == ["Launch site", "Write announcement"]
+    assert trees[0]["rollup"]["subtasks"] == 4
+    assert trees[1]["subtasks"] == []
+
+
+def test_missing_task_or_project(app):
+    with pytest.raises(ValueError, match="not found"):
+        get_task_tree(999)
+    with pytest.raises(ValueError, match="not found"):
+        get_project_task_trees(999)
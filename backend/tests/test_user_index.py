@@ -0,0 +1,112 @@
+import pytest
+
+from app import create_app
+from app.models import db, User
+from app.services.user_index import UserPrefixIndex, search_users, user_index
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _add_users(*people):
+    users = [User(name=name, email=email, password_hash="pwd") for name, email in people]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+def test_prefixes_match_email_name_and_later_name_words():
+    index = UserPrefixIndex()
+    index.build([
+        (1, "Ada Lovelace", "ada@example.com", "staff"),
+        (2, "Grace Brewster Hopper", "grace@example.com", "manager"),
+        (3, "Alan Turing", "turing@example.com", "staff"),
+    ])
+
+    assert [u["id"] for u in index.search("a")] == [1, 3]
+    assert [u["id"] for u in index.search("HOP")] == [2]
+    assert [u["id"] for u in index.search("brewster  hop")] == [2]
+    assert [u["id"] for u in index.search("tur")] == [3]
+    assert index.search("a", limit=1) == [{"id": 1, "name": "Ada Lovelace", "email": "ada@example.com", "role": "staff"}]
+    assert index.search("   ") == []
+    assert index.search("zz") == []
+
+
+def test_new_users_are_found_on_the_next_search(app):
+    _add_users(("Ada Lovelace", "ada@example.com"))
+    assert [u["email"] for u in search_users("ada")] == ["ada@example.com"]
+
+    _add_users(("Adam Smith", "adam@example.com"))
+    assert [u["email"] for u in search_users("ada")] == ["ada@example.com", "adam@example.com"]
+    assert user_index.stats()["rebuilds"] == 2
+
+
+def test_unchanged_users_table_is_not_reloaded(app):
+    _add_users(("Ada Lovelace", "ada@example.com"))
+    search_users("ada")
+    search_users("lovelace")
+    assert user_index.stats()["rebuilds"] == 1
+
+
+def test_renamed_users_are_found_by_their_new_name(app):
+    ada, alan = _add_users(("Ada Lovelace", "ada@example.com"), ("Alan Turing", "alan@example.com"))
+    search_users("a")
+    # Same row count and no new ids: only the table version shows the change
+    ada.name = "Ada King"
+    db.session.commit()
+
+    assert [u["name"] for u in search_users("king")] == ["Ada King"]
+    assert search_users("lovelace") == []
+
+
+def test_other_changes_trigger_a_full_rebuild(app):
+    ada, _ = _add_users(("Ada Lovelace", "ada@example.com"), ("Alan Turing", "alan@example.com"))
+    search_users("a")
+    db.session.delete(ada)
+    db.session.commit()
+
+    assert [u["email"] for u in search_users("a")] == ["alan@example.com"]
+    assert user_index.stats()["rebuilds"] == 2
+
+
+def test_snapshot_is_rebuilt_after_max_age(app, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(user_index, "clock", clock)
+    user = _add_users(("Ada Lovelace", "ada@example.com"))[0]
+    search_users("ada")
+    # An edit made outside the app's sessions never bumps the table version
+    with db.engine.begin() as conn:
+        conn.execute(User.__table__.update().where(User.id == user.id).values(name="Ada King"))
+    assert search_users("king") == []
+
+    clock.now = user_index.max_age
+    assert [u["name"] for u in search_users("king")] == ["Ada King"]
+
+
+def test_limit_is_validated_and_capped(app):
+    _add_users(*[(f"User {i}", f"user{i}@example.com") for i in range(60)])
+    assert len(search_users("user", limit=100)) == 50
+    with pytest.raises(ValueError):
+        search_users("user", limit=0)
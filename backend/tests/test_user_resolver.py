@@ -0,0 +1,81 @@
+import pytest
+from flask_jwt_extended import create_access_token, current_user, verify_jwt_in_request
+
+from app import create_app
+from app.models import db, User
+from app.services.user_resolver import get_resolver
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "JWT_SECRET_KEY": "test-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    users = [User(email=f"user{i}@example.com", password_hash="pwd", name=f"User {i}") for i in range(3)]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+def test_queued_ids_and_emails_load_in_one_query(users):
+    resolver = get_resolver().want(ids=[users[0].id, str(users[1].id)], emails=["user2@example.com"])
+
+    assert resolver.get(users[0].id) is users[0]
+    assert resolver.get(str(users[1].id)) is users[1]
+    assert resolver.by_email("user2@example.com") is users[2]
+    assert resolver.queries == 1
+
+
+def test_results_are_memoized_but_misses_are_not(users):
+    resolver = get_resolver()
+    assert resolver.by_emails(["user0@example.com", "late@example.com"]) == {"user0@example.com": users[0]}
+    assert resolver.get(users[0].id) is users[0]
+    assert resolver.queries == 1
+
+    late = User(email="late@example.com", password_hash="pwd", name="Late")
+    db.session.add(late)
+    db.session.commit()
+    assert resolver.by_email("late@example.com") is late
+
+
+def test_invalid_ids_resolve_to_none(users):
+    resolver = get_resolver()
+    assert resolver.get(None) is None
+    assert resolver.get("not-an-int") is None
+    assert resolver.queries == 0
+
+
+def test_resolver_is_rebound_when_the_session_is_replaced(users):
+    first = get_resolver()
+    assert get_resolver() is first
+    db.session.remove()
+    assert get_resolver() is not first
+
+
+def test_jwt_current_user_comes_from_the_resolver(app, users):
+    token = create_access_token(identity=str(users[1].id))
+    with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+        verify_jwt_in_request()
+        assert current_user.email == "user1@example.com"
+        assert get_resolver().current_user() is get_resolver().get(users[1].id)
+
+
+def test_jwt_current_user_is_falsy_for_unknown_user(app, users):
+    token = create_access_token(identity="999")
+    with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+        verify_jwt_in_request()
+        assert not current_user
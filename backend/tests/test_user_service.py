@@ -1,7 +1,15 @@
 import pytest
 from app import create_app
 from app.models import db, User, UserRole
-from app.services.user_services import create_user, get_user_by_email, validate_login
+from sqlalchemy import event
+
+from app.services.user_services import (
+    create_user,
+    get_user_by_email,
+    get_user_directory,
+    iter_user_directory,
+    validate_login,
+)
 
 @pytest.fixture
 def app():
@@ -49,4 +57,47 @@ def test_validate_login_failure(app):
     with app.app_context():
         create_user("Charlie", "charlie@example.com", "director", "topsecret")
         user = validate_login("charlie@example.com", "wrongpassword")
-        assert user is None
\ No newline at end of file
+        assert user is None
+
+def _seed_directory(count=5):
+    roles = [UserRole.STAFF, UserRole.MANAGER]
+    db.session.add_all([
+        User(name=f"User {i}", email=f"user{i}@example.com", password_hash="x" * 512, role=roles[i % 2])
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def test_user_directory_pages_by_id_and_filters_roles(app):
+    """Pages follow each other by id and can be limited to roles."""
+    with app.app_context():
+        _seed_directory()
+
+        first = get_user_directory(limit=2)
+        second = get_user_directory(after=first["next_after"], limit=2)
+        last = get_user_directory(after=second["next_after"], limit=2)
+        emails = [u["email"] for page in (first, second, last) for u in page["users"]]
+        assert emails == [f"user{i}@example.com" for i in range(5)]
+        assert last["next_after"] is None
+        assert set(first["users"][0]) == {"id", "role", "name", "email"}
+
+        managers = get_user_directory(roles="manager")
+        assert [u["email"] for u in managers["users"]] == ["user1@example.com", "user3@example.com"]
+        with pytest.raises(ValueError, match="Invalid role"):
+            get_user_directory(roles="intern")
+
+def test_user_directory_export_reads_in_batches_without_password_hashes(app):
+    """The export walks the table in keyset batches, selecting only public columns."""
+    with app.app_context():
+        _seed_directory()
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            entries = list(iter_user_directory(["STAFF"], batch_size=2))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        assert [u["email"] for u in entries] == ["user0@example.com", "user2@example.com", "user4@example.com"]
+        selects = [s for s in statements if "FROM users" in s]
+        assert len(selects) == 2
+        assert not any("password_hash" in s for s in selects)
@@ -0,0 +1,53 @@
+from datetime import date
+
+import numpy as np
+
+from app.services.workload_heatmap import WorkloadHeatmap
+
+START = date(2025, 1, 2)  # a Thursday
+LABELS = ["Unassigned", "Ongoing", "Pending Review"]
+
+
+def build(rows, n_days=10, capacity=2):
+    user_ids, days, priorities, statuses = (np.array(column, dtype=np.int64) for column in zip(*rows))
+    return WorkloadHeatmap(user_ids, days, priorities, statuses, START, n_days, len(LABELS), capacity=capacity)
+
+
+def test_daily_and_weekly_matrices():
+    heatmap = build([
+        # user, day, priority, status
+        (7, 0, 1, 0),
+        (7, 0, 3, 1),
+        (7, 4, 2, 1),   # Monday, second week
+        (3, 9, 1, 2),   # Saturday of the second week
+        (3, -1, 2, 1),  # overdue, lands on the first day
+    ])
+    data = heatmap.to_dict(LABELS)
+
+    assert data["users"] == [3, 7]
+    assert data["to"] == "2025-01-11"
+    assert data["week_starts"] == ["2024-12-30", "2025-01-06"]
+    assert data["daily"]["tasks"][1][:5] == [2, 0, 0, 0, 1]
+    assert data["daily"]["load"][1][0] == 4
+    assert data["weekly"]["tasks"] == [[1, 1], [2, 1]]
+    assert data["weekly"]["load"] == [[2, 1], [4, 2]]
+    assert data["overdue"] == [1, 0]
+    assert data["status_counts"] == {"Unassigned": [0, 1], "Ongoing": [1, 2], "Pending Review": [1, 0]}
+
+
+def test_overload_forecast_compares_cumulative_work_with_capacity():
+    heatmap = build([(1, 0, 1, 0)] * 2 + [(1, 1, 1, 0)] * 3 + [(2, 5, 1, 0)] * 3, capacity=2)
+    data = heatmap.to_dict(LABELS)
+
+    # User 1: 2 due by day 0 (fits), 5 by day 1 > 4
+    assert data["overloaded_from"] == ["2025-01-03", None]
+    # User 2 has 3 due on one day, but had the days before to work ahead
+    assert data["overloaded_days"] == [1, 1]
+
+
+def test_empty_range():
+    empty = np.array([], dtype=np.int64)
+    data = WorkloadHeatmap(empty, empty, empty, empty, START, 7, len(LABELS)).to_dict(LABELS)
+    assert data["users"] == []
+    assert data["daily"]["tasks"] == []
+    assert data["overloaded_from"] == []
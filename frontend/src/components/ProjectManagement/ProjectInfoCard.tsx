@@ -9,6 +9,14 @@ import {
 } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 
+// Task counts kept per project by the backend (see /get-all-projects)
+interface TaskStats {
+	status_counts: Record<string, number>;
+	total: number;
+	overdue: number;
+	completion_rate: number;
+}
+
 // Define the shape of the project data this card expects
 interface Project {
 	id: number;
@@ -16,6 +24,7 @@ interface Project {
 	deadline: string;
 	status: string;
 	owner_email: string;
+	task_stats?: TaskStats;
 }
 
 interface UserData {
@@ -62,6 +71,26 @@ export default function ProjectInfoCard({ project }: ProjectInfoCardProps) {
 						{new Date(project.deadline).toLocaleDateString()}
 					</p>
 				)}
+				{project.task_stats && project.task_stats.total > 0 && (
+					<div className="mt-3 space-y-1">
+						<div className="h-2 w-full rounded bg-gray-200">
+							<div
+								className="h-2 rounded bg-emerald-400"
+								style={{ width: `${project.task_stats.completion_rate}%` }}
+							/>
+						</div>
+						<p className="text-xs text-gray-500">
+							{project.task_stats.status_counts["Completed"] ?? 0} of{" "}
+							{project.task_stats.total} tasks done
+							{project.task_stats.overdue > 0 && (
+								<span className="text-red-600">
+									{" "}
+									· {project.task_stats.overdue} overdue
+								</span>
+							)}
+						</p>
+					</div>
+				)}
 			</CardContent>
 			<CardFooter>
 				<Badge className={`${badgeColor[project.status]} text-white`}>
@@ -14,8 +14,24 @@ import { Download } from "lucide-react";
 import jsPDF from "jspdf";
 import autoTable from "jspdf-autotable";
 
+interface MemberBreakdown {
+	user_id: number;
+	name: string;
+	email: string;
+	total: number;
+	completed: number;
+	overdue: number;
+}
+
 interface ReportData {
-	[key: string]: number; // e.g., "Ongoing": 1
+	total: number;
+	status_counts: { [status: string]: number }; // e.g., "Ongoing": 1
+	overdue: number;
+	due_this_week: number;
+	completion_rate: number;
+	priority_mix: { [priority: string]: number };
+	members: MemberBreakdown[];
+	trend: { week: string; created: number; completed: number }[];
 }
 
 interface ProjectReportDialogProps {
@@ -46,7 +62,7 @@ export default function ProjectReportDialog({
 				setGenerationTime(new Date().toLocaleString());
 				try {
 					const res = await fetch(
-						`/api/project/get-report-data/${projectId}`,
+						`/api/project/get-report/${projectId}`,
 						{
 							headers: { Authorization: `Bearer ${token}` },
 						}
@@ -80,12 +96,9 @@ export default function ProjectReportDialog({
 		doc.setFontSize(12);
 		doc.text(`Generated on: ${generationTime}`, 14, 28);
 
-		const totalTasks = Object.values(reportData).reduce((a, b) => a + b, 0);
-
-		const tableData = Object.entries(reportData).map(([status, count]) => [
-			status,
-			count,
-		]);
+		const tableData = Object.entries(reportData.status_counts).map(
+			([status, count]) => [status, count]
+		);
 
 		autoTable(doc, {
 			startY: 35,
@@ -93,7 +106,7 @@ export default function ProjectReportDialog({
 			body: tableData,
 			theme: "striped",
 			headStyles: { fillColor: [41, 128, 185] },
-			foot: [["Total Tasks", totalTasks]],
+			foot: [["Total Tasks", reportData.total]],
 			footStyles: {
 				fontStyle: "bold",
 				fillColor: [230, 230, 230],
@@ -101,6 +114,18 @@ export default function ProjectReportDialog({
 			},
 		});
 
+		autoTable(doc, {
+			head: [["Member", "Tasks", "Completed", "Overdue"]],
+			body: reportData.members.map((m) => [
+				m.email,
+				m.total,
+				m.completed,
+				m.overdue,
+			]),
+			theme: "striped",
+			headStyles: { fillColor: [41, 128, 185] },
+		});
+
 		doc.save(`project_report_${projectName.replace(/\s+/g, "_")}.pdf`);
 		toast.success("Report exported successfully!");
 	};
@@ -111,8 +136,8 @@ export default function ProjectReportDialog({
 				<DialogHeader>
 					<DialogTitle>Project Report: {projectName}</DialogTitle>
 					<DialogDescription>
-						A summary of all tasks in this project by their current
-						status.
+						A summary of all tasks in this project by status, due
+						date and member.
 					</DialogDescription>
 				</DialogHeader>
 				<div className="py-4">
@@ -128,7 +153,7 @@ export default function ProjectReportDialog({
 
 							{/* --- THIS IS THE LIST THAT ISN'T SHOWING --- */}
 							<ul className="space-y-2">
-								{Object.entries(reportData).map(
+								{Object.entries(reportData.status_counts).map(
 									([status, count]) => (
 										<li
 											key={status}
@@ -144,15 +169,47 @@ export default function ProjectReportDialog({
 
 							<hr className="my-4" />
 
-							{/* This line is working, which proves reportData is valid */}
+							<ul className="space-y-2">
+								<li className="flex justify-between">
+									<span>Overdue:</span>
+									<strong>{reportData.overdue}</strong>
+								</li>
+								<li className="flex justify-between">
+									<span>Due this week:</span>
+									<strong>{reportData.due_this_week}</strong>
+								</li>
+								<li className="flex justify-between">
+									<span>Completion:</span>
+									<strong>{reportData.completion_rate}%</strong>
+								</li>
+							</ul>
+
+							{reportData.members.length > 0 && (
+								<>
+									<hr className="my-4" />
+									<ul className="space-y-1 text-sm">
+										{reportData.members.map((m) => (
+											<li
+												key={m.user_id}
+												className="flex justify-between"
+											>
+												<span>{m.name}</span>
+												<span>
+													{m.completed}/{m.total} done
+													{m.overdue > 0 &&
+														`, ${m.overdue} overdue`}
+												</span>
+											</li>
+										))}
+									</ul>
+								</>
+							)}
+
+							<hr className="my-4" />
+
 							<div className="flex justify-between font-bold text-lg">
 								<span>Total Tasks:</span>
-								<span>
-									{Object.values(reportData).reduce(
-										(a, b) => a + b,
-										0
-									)}
-								</span>
+								<span>{reportData.total}</span>
 							</div>
 						</div>
 					)}
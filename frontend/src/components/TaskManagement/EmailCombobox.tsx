@@ -51,6 +51,7 @@ export default function EmailCombobox({
 		Array.isArray(value) ? value : value ? [value] : []
 	);
 	const [users, setUsers] = useState<UserOption[]>([]);
+	const [query, setQuery] = useState("");
 	const [error, setError] = useState("");
 
 	const token = localStorage.getItem("token");
@@ -71,25 +72,50 @@ export default function EmailCombobox({
 		}
 	}, [value]);
 
+	// Project users are few and filtered locally; everyone else is looked up
+	// by prefix on the server as the user types
+	const searchTerm = isProjectTask ? "" : query.trim();
+
 	useEffect(() => {
-		let endpoint = "/api/user/get-all-users";
-		if (isProjectTask) {
-			endpoint = `/api/project/get-project-users/${projectId}`;
+		let endpoint = `/api/project/get-project-users/${projectId}`;
+		if (!isProjectTask) {
+			if (!searchTerm) {
+				setUsers([]);
+				return;
+			}
+			endpoint = `/api/user/search?q=${encodeURIComponent(searchTerm)}&limit=20`;
 		}
 
-		fetch(endpoint, {
-			method: "GET",
-			headers: {
-				Authorization: `Bearer ${token}`,
+		const controller = new AbortController();
+		const timer = setTimeout(
+			() => {
+				fetch(endpoint, {
+					method: "GET",
+					headers: {
+						Authorization: `Bearer ${token}`,
+					},
+					signal: controller.signal,
+				})
+					.then((res) => {
+						if (!res.ok) throw new Error("Failed to fetch users.");
+						return res.json();
+					})
+					.then((data: UserOption[]) => {
+						setUsers(data);
+						setError("");
+					})
+					.catch((err) => {
+						if (err.name !== "AbortError") setError(err.message);
+					});
 			},
-		})
-			.then((res) => {
-				if (!res.ok) throw new Error("Failed to fetch users.");
-				return res.json();
-			})
-			.then((data: UserOption[]) => setUsers(data))
-			.catch((err) => setError(err.message));
-	}, [token, isProjectTask, projectId]);
+			isProjectTask ? 0 : 150
+		);
+
+		return () => {
+			clearTimeout(timer);
+			controller.abort();
+		};
+	}, [token, isProjectTask, projectId, searchTerm]);
 
 	const validUsers = users.filter((user) => {
 		if (user.email === currentUserData.email) {
@@ -185,11 +211,19 @@ export default function EmailCombobox({
 			<PopoverContent className="w-full">
 				{error && <div className="text-red-700">{error}</div>}
 
-				<Command>
-					<CommandInput placeholder="Search by email..." />
+				<Command shouldFilter={isProjectTask}>
+					<CommandInput
+						placeholder="Search by name or email..."
+						value={query}
+						onValueChange={setQuery}
+					/>
 
 					<CommandList>
-						<CommandEmpty>No results found.</CommandEmpty>
+						<CommandEmpty>
+							{isProjectTask || query.trim()
+								? "No results found."
+								: "Start typing to search users."}
+						</CommandEmpty>
 
 						{!multiple
 							? validUsers.map((user) => (